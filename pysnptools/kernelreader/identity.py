@@ -65,7 +65,7 @@ class Identity(KernelReader):
     def col(self):
         return self._row1
 
-    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok):
+    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None):
         if row_index_or_none is None and col_index_or_none is None and self._row0 is self._row1: #read all of a square ID
             return np.identity(self.row_count,dtype=dtype)
         else: #Non-square
@@ -112,6 +112,67 @@ class KernelData(KernelReader,PstData):
         return standardizer.standardize(self, return_trained=return_trained, force_python_only=force_python_only)
 
 
+    def add_snps(self, snpreader, standardizer, block_size=None, return_trained=False):
+        """Does an in-place update of the in-memory kernel data, adding in the kernel of the given SNPs. Because a kernel is a sum over SNPs,
+        the result is the same as rebuilding the kernel with the SNPs included, but only the new SNPs are read.
+        Although it works in place, for convenience it also returns the KernelData.
+
+        :param snpreader: The SNPs to add. They must cover every iid of the kernel (they will be put in the kernel's iid order).
+        :type snpreader: :class:`.SnpReader`
+        :param standardizer: How to standardize the SNPs. To stay consistent with the kernel, give the trained standardizer
+            (for example, :class:`.UnitTrained` or :class:`.BetaTrained`) that the kernel was built with. Untrained standardizers, such as :class:`.Unit`, are trained on the SNPs given.
+        :type standardizer: :class:`.Standardizer`
+        :param block_size: optional -- The number of SNPs to read at a time. None (the default) means to read all at once.
+        :type block_size: int or None
+        :param return_trained: If true, returns a second value containing the trained standardizer.
+        :type return_trained: bool
+
+        :rtype: :class:`.KernelData` (updates in place, but for convenience, returns 'self')
+
+        >>> from pysnptools.snpreader import Bed
+        >>> from pysnptools.standardizer import Unit
+        >>> import numpy as np
+        >>> snpreader = Bed('../examples/toydata',count_A1=False)
+        >>> kerneldata = snpreader[:,:5000].read_kernel(Unit()) # Build a kernel from the first 5000 SNPs
+        >>> _, trained = kerneldata.add_snps(snpreader[:,5000:], Unit(), return_trained=True) # Add in the other SNPs and remember their standardization
+        >>> print(np.allclose(kerneldata.val, snpreader.read_kernel(Unit()).val))
+        True
+        >>> _ = kerneldata.remove_snps(snpreader[:,9000:], trained) # Remove the last SNPs with the same standardization they were added with
+        >>> print(np.allclose(kerneldata.val, snpreader[:,:9000].read_kernel(Unit()).val))
+        True
+        """
+        return self._update_snps(snpreader, standardizer, block_size, 1.0, return_trained)
+
+    def remove_snps(self, snpreader, standardizer, block_size=None, return_trained=False):
+        """Does an in-place update of the in-memory kernel data, subtracting out the kernel of the given SNPs. It is the inverse of :meth:`add_snps`
+        and takes the same parameters. For the result to match a kernel built without the SNPs, they must be standardized
+        as they were when the kernel was built.
+
+        :rtype: :class:`.KernelData` (updates in place, but for convenience, returns 'self')
+        """
+        return self._update_snps(snpreader, standardizer, block_size, -1.0, return_trained)
+
+    def _update_snps(self, snpreader, standardizer, block_size, sign, return_trained):
+        assert self.iid0 is self.iid1 or np.array_equal(self.iid0,self.iid1), "Expect the kernel to be square with iid0 equal to iid1"
+        if not np.array_equal(snpreader.iid,self.iid):
+            snpreader = snpreader[snpreader.iid_to_index(self.iid),:]
+
+        if standardizer.is_constant: #Already trained, so even a blocked read need not merge trained standardizers
+            delta = snpreader._read_kernel(standardizer,block_size=block_size,dtype=self.val.dtype)
+            trained = standardizer
+        else:
+            delta, trained = snpreader._read_kernel(standardizer,block_size=block_size,dtype=self.val.dtype,return_trained=True)
+
+        if sign > 0:
+            self.val += delta
+        else:
+            self.val -= delta
+
+        if return_trained:
+            return self, trained
+        else:
+            return self
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
@@ -31,17 +31,33 @@ class KernelHdf5(PstHdf5,KernelReader):
         super(KernelHdf5, self).__init__(*args, **kwargs)
 
     @staticmethod
-    def write(filename, kerneldata, hdf5_dtype=None, sid_major=True):
-        """Writes a :class:`KernelData` to KernelHdf5 format.
+    def write(filename, kerneldata, hdf5_dtype=None, sid_major=True, tile_size=None):
+        """Writes a :class:`KernelData` (or any :class:`KernelReader`, for example, a :class:`.SnpKernel`) to KernelHdf5 format.
 
         :param filename: the name of the file to create
         :type filename: string
-        :param kerneldata: The in-memory data that should be written to disk.
-        :type kerneldata: :class:`KernelData`
-        :param hdf5_dtype: None (use the .val's dtype) or a Hdf5 dtype, e.g. 'f8','f4',etc.
+        :param kerneldata: The in-memory data (or a :class:`KernelReader`) that should be written to disk.
+        :type kerneldata: :class:`KernelData` or :class:`KernelReader`
+        :param hdf5_dtype: None (use the .val's dtype, or 'f8' for a :class:`KernelReader`) or a Hdf5 dtype, e.g. 'f8','f4',etc.
         :type hdf5_dtype: string
         :param col_major: Tells if vals should be stored on disk in sid_major (default) or iid_major format.
         :type col_major: bool
+        :param tile_size: optional -- The number of rows (and columns) in each tile of the file. When given, or when **kerneldata** is a :class:`KernelReader` rather than
+            a :class:`KernelData`, the kernel is created and written one stripe of **tile_size** rows at a time, so the whole kernel is never in memory. Defaults to 2000.
+            For a :class:`.SnpKernel`, each stripe re-reads and re-standardizes the SNP data of its own iids and those after it, so the SNP data is read
+            about iid_count/(2*tile_size) times (plus once to train the standardizer). A larger **tile_size** means fewer reads but more memory.
+            With a :class:`.SnpKernel`, each stripe is accumulated over blocks of the SnpKernel's block_size SNPs and only the tiles on or above the diagonal are computed.
+        :type tile_size: int
+
+        >>> from pysnptools.snpreader import Bed
+        >>> from pysnptools.kernelreader import SnpKernel
+        >>> from pysnptools.standardizer import Unit
+        >>> import pysnptools.util as pstutil
+        >>> kernel_on_disk = SnpKernel(Bed('../examples/toydata',count_A1=False),Unit(),block_size=1000)
+        >>> pstutil.create_directory_if_necessary("tempdir/toydata.kernel.hdf5")
+        >>> KernelHdf5.write("tempdir/toydata.kernel.hdf5",kernel_on_disk,tile_size=200)   # Create the kernel 200 rows at a time
+        >>> print(KernelHdf5("tempdir/toydata.kernel.hdf5")[::2,:10].read().val.shape)
+        (250, 10)
         """
         # >>> from pysnptools.snpreader import Bed
         # >>> from pysnptools.standardizer import Unit
@@ -49,8 +65,34 @@ class KernelHdf5(PstHdf5,KernelReader):
         # >>> kerneldata = Bed('pysnptools/examples/toydata.bed',count_A1=False).read_kernel(Unit())     # Create a kernel from the data in the Bed file
         # >>> pstutil.create_directory_if_necessary(b"tempdir/toydata.kernel.hdf5")
         # >>> KernelHdf5.write("tempdir/toydata.kernel.hdf5",kerneldata)          # Write data in KernelHdf5 format
-        PstHdf5.write(filename,kerneldata,hdf5_dtype=hdf5_dtype,col_major=sid_major)
+        from pysnptools.kernelreader import KernelData
+        if isinstance(kerneldata,KernelData) and tile_size is None:
+            PstHdf5.write(filename,kerneldata,hdf5_dtype=hdf5_dtype,col_major=sid_major)
+            return
+        KernelHdf5._write_tiles(filename,kerneldata,hdf5_dtype=hdf5_dtype,sid_major=sid_major,tile_size=tile_size or KernelHdf5._default_tile_size)
+
+    _default_tile_size = 2000
+
+    @staticmethod
+    def _write_tiles(filename, kernelreader, hdf5_dtype, sid_major, tile_size):
+        import h5py
+        assert hdf5_dtype is None or (isinstance(hdf5_dtype, str) and len(hdf5_dtype) == 2 and  hdf5_dtype[0] == 'f'), "Expect hdf5_dtype to be None or to start with 'f', e.g. 'f4' for single, 'f8' for double"
+        assert tile_size > 0, "Expect tile_size to be positive"
+        dtype = sp.float32 if hdf5_dtype == 'f4' else sp.float64
+
+        with h5py.File(filename, "w") as h5:
+            val_in_file = PstHdf5._create_val(h5, kernelreader, sid_major, hdf5_dtype, chunks=(tile_size,tile_size))
+
+            def put(row_start, col_start, val):
+                if sid_major:
+                    val_in_file[col_start:col_start+val.shape[1],row_start:row_start+val.shape[0]] = val.T
+                else:
+                    val_in_file[row_start:row_start+val.shape[0],col_start:col_start+val.shape[1]] = val
 
+            for row_start, col_start, val, mirror in kernelreader._stripe_sequence(tile_size, dtype=dtype):
+                put(row_start, col_start, val)
+                if mirror:
+                    put(col_start, row_start, val.T)
 
 if __name__ == "__main__":
 
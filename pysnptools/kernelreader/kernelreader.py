@@ -188,7 +188,7 @@ class KernelReader(PstReader):
 
 
     #!!check that views always return contiguous memory by default
-    def read(self, order='F', dtype=np.float64, force_python_only=False, view_ok=False):
+    def read(self, order='F', dtype=np.float64, force_python_only=False, view_ok=False, num_threads=None):
         """Reads the kernel values and returns a :class:`.KernelData` (with :attr:`.KernelData.val` property containing a new ndarray of the kernel values).
 
         :param order: {'F' (default), 'C', 'A'}, optional -- Specify the order of the ndarray. If order is 'F' (default),
@@ -215,6 +215,10 @@ class KernelReader(PstReader):
             share memory and so it may ignore your suggestion and allocate a new ndarray anyway.
         :type view_ok: bool
 
+        :param num_threads: optional -- The number of threads with which to read the values. If None (default),
+            uses the 'PST_NUM_THREADS' environment variable, if set, and otherwise all the processors. Readers that can't work in parallel ignore it.
+        :type num_threads: int or None
+
         :rtype: :class:`.KernelData`
 
         Calling the method again causes the kernel values to be re-read and creates a new in-memory :class:`.KernelData` with a new ndarray of kernel values.
@@ -226,7 +230,7 @@ class KernelReader(PstReader):
         >>> from pysnptools.kernelreader import KernelNpz
         >>> kernel_on_disk = KernelNpz('pysnptools/examples/toydata.kernel.npz')
         """
-        val = self._read(None, None, order, dtype, force_python_only, view_ok)
+        val = self._read(None, None, order, dtype, force_python_only, view_ok, num_threads)
         from .kerneldata import KernelData
         ret = KernelData(iid0=self.iid0, iid1=self.iid1, val=val, name=str(self))
         return ret
@@ -270,6 +274,16 @@ class KernelReader(PstReader):
 
         return _KernelSubset(self, iid0_indexer, iid1_indexer)
 
+    def _stripe_sequence(self, stripe_size, dtype=np.float64, num_threads=None):
+        '''
+        Yields (row_start, col_start, val, mirror) for each stripe of 'stripe_size' rows of the kernel, where 'val' holds the values for
+        rows row_start onward and columns col_start onward. If 'mirror' is True, the kernel is symmetric and 'val.T' also
+        gives the values for columns row_start onward and rows col_start onward.
+        '''
+        for row_start in range(0, self.iid0_count, stripe_size):
+            val = self[row_start:row_start+stripe_size,:].read(order='C',dtype=dtype,num_threads=num_threads).val
+            yield row_start, 0, val, False
+
     def _assert_iid0_iid1(self):
         assert np.issubdtype(self._row.dtype, str) and len(self._row.shape)==2 and self._row.shape[1]==2, "iid0 should be dtype str, have two dimensions, and the second dimension should be size 2"
         assert np.issubdtype(self._col.dtype, str) and len(self._col.shape)==2 and self._col.shape[1]==2, "iid1 should be dtype str, have two dimensions, and the second dimension should be size 2"
@@ -6,6 +6,7 @@ import logging
 from pysnptools.standardizer import Unit, Standardizer, UnitTrained, BetaTrained
 from pysnptools.standardizer import Identity as SS_Identity
 from .kernelreader import KernelReader
+from pysnptools.pstreader import PstReader
 from .kerneldata import KernelData
 from pysnptools.kernelstandardizer import DiagKtoN
 
@@ -21,6 +22,8 @@ class SnpKernel(KernelReader):
         :Parameters: * **snpreader** (:class:`SnpReader`) -- The SNP data
                      * **standardizer** (:class:`Standardizer`) -- How the SNP data should be standardized
                      * **block_size** (optional, int) -- The number of SNPs to read at a time.
+                     * **num_workers** (optional, int) -- When reading in blocks, the number of threads that multiply blocks, each into its own partial kernel. Defaults to 1.
+                       See :meth:`.SnpReader.read_kernel`.
 
         If **block_size** is not given, then all SNP data will be read at once.
 
@@ -38,7 +41,7 @@ class SnpKernel(KernelReader):
         >>> print(kerneldata.val[0,0])
         0.992306992842
     '''
-    def __init__(self, snpreader, standardizer=None, block_size=None):
+    def __init__(self, snpreader, standardizer=None, block_size=None, num_workers=1):
         super(SnpKernel, self).__init__()
 
         assert standardizer is not None, "'standardizer' must be provided"
@@ -46,6 +49,7 @@ class SnpKernel(KernelReader):
         self.snpreader = snpreader
         self.standardizer = standardizer
         self.block_size = block_size
+        self.num_workers = num_workers
 
     @property
     def row(self):
@@ -65,6 +69,8 @@ class SnpKernel(KernelReader):
         s = "SnpKernel({0},standardizer={1}".format(self.snpreader,standardizer)
         if self.block_size is not None:
             s += ",block_size={0}".format(self.block_size)
+        if self.num_workers != 1:
+            s += ",num_workers={0}".format(self.num_workers)
         s += ")"
         return s
 
@@ -73,16 +79,46 @@ class SnpKernel(KernelReader):
         copier.input(self.snpreader)
         copier.input(self.standardizer)
 
-    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok):
+    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None):
         #Special case: If square and constant, can push the subsetting into the SnpReader
         if (self.standardizer.is_constant and row_index_or_none is not None and col_index_or_none is not None and np.array_equal(row_index_or_none,col_index_or_none)):
-            return self.snpreader[row_index_or_none,:]._read_kernel(self.standardizer,self.block_size,order, dtype, force_python_only, view_ok)
-        else:
-            #LATER: If it was often that case that we wanted to standardize on all the data, but then only return a slice of the result,
-            #       that could be done with less memory by working in blocks but not tabulating for all the iids.
-            whole = self.snpreader._read_kernel(self.standardizer,self.block_size,order, dtype, force_python_only, view_ok)
+            return self.snpreader[row_index_or_none,:]._read_kernel(self.standardizer,self.block_size,order, dtype, force_python_only, view_ok, num_threads=num_threads, num_workers=self.num_workers)
+        elif PstReader._is_all_slice(row_index_or_none) and PstReader._is_all_slice(col_index_or_none):
+            whole = self.snpreader._read_kernel(self.standardizer,self.block_size,order, dtype, force_python_only, view_ok, num_threads=num_threads, num_workers=self.num_workers)
             val, shares_memory = self._apply_sparray_or_slice_to_val(whole, row_index_or_none, col_index_or_none, order, dtype, force_python_only)
             return val
+        else:
+            return self._read_rectangle(row_index_or_none, col_index_or_none, order, dtype, force_python_only, num_threads)
+
+    def _read_rectangle(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, num_threads):
+        '''
+        Creates just the requested rows and columns of the kernel, one block of SNPs at a time, without ever creating the whole iid_count x iid_count kernel.
+
+        Each SNP block is read (and standardized) once for both iid sets. Standardizers that need training are trained on all the iids of the block, so the result
+        matches subsetting the whole kernel. Constant standardizers only need the union of the row and column iids, so only those are read.
+        '''
+        from pysnptools.snpreader import SnpReader
+        row_index = PstReader._make_sparray_from_sparray_or_slice(self.row_count, PstReader._make_sparray_or_slice(row_index_or_none))
+        col_index = PstReader._make_sparray_from_sparray_or_slice(self.col_count, PstReader._make_sparray_or_slice(col_index_or_none))
+
+        if self.standardizer.is_constant:
+            iid_index = np.union1d(row_index, col_index)
+            snpreader = self.snpreader[iid_index,:]
+            row_index = np.searchsorted(iid_index, row_index)
+            col_index = np.searchsorted(iid_index, col_index)
+        else:
+            snpreader = self.snpreader
+
+        if order=='A':
+            order = 'C'
+        val = np.zeros([len(row_index),len(col_index)],dtype=dtype,order=order)
+        block_size = self.block_size
+        if block_size is None or snpreader.sid_count <= block_size or snpreader.sid_count <= self.row_count: #Like _read_kernel, do all-at-once when that needs no more memory than a kernel
+            block_size = max(1,snpreader.sid_count)
+        for start in range(0, snpreader.sid_count, block_size):
+            snpdata, _ = SnpReader._as_snpdata(snpreader[:,start:start+block_size],standardizer=self.standardizer,dtype=dtype,force_python_only=force_python_only,num_threads=num_threads)
+            val += snpdata.val[row_index,:].dot(snpdata.val[col_index,:].T)
+        return val
 
     def __getitem__(self, iid_indexer_and_snp_indexer):
         if isinstance(iid_indexer_and_snp_indexer,tuple):
@@ -93,7 +129,7 @@ class SnpKernel(KernelReader):
 
         #Special case: If square and constant, can push the subsetting into the SnpReader
         if (self.standardizer.is_constant and row_index_or_none is not None and col_index_or_none is not None and np.array_equal(row_index_or_none,col_index_or_none)):
-            return SnpKernel(self.snpreader[row_index_or_none,:], self.standardizer, block_size=self.block_size)
+            return SnpKernel(self.snpreader[row_index_or_none,:], self.standardizer, block_size=self.block_size, num_workers=self.num_workers)
         else:
             return KernelReader.__getitem__(self,iid_indexer_and_snp_indexer)
 
@@ -109,7 +145,7 @@ class SnpKernel(KernelReader):
 
         '''
         if to_kerneldata:
-            val, snp_trained = self.snpreader._read_kernel(self.standardizer,block_size=self.block_size,return_trained=True)
+            val, snp_trained = self.snpreader._read_kernel(self.standardizer,block_size=self.block_size,return_trained=True,num_workers=self.num_workers)
             kernel = KernelData(iid=self.snpreader.iid, val=val, name=str(self))
             kernel, kernel_trained = kernel.standardize(kernel_standardizer,return_trained=True)
         else:
@@ -122,6 +158,34 @@ class SnpKernel(KernelReader):
         else:
             return kernel
 
+    def _stripe_sequence(self, stripe_size, dtype=np.float64, num_threads=None):
+        '''
+        Creates the kernel a stripe of 'stripe_size' rows at a time, so that the whole kernel is never in memory.
+
+        Each stripe holds only the columns on or above the diagonal (the rest are the transposes of earlier stripes) and is
+        accumulated over blocks of 'block_size' SNPs. Before the first stripe, the standardizer is trained on all iids, one SNP block at a time.
+        Each stripe then reads and standardizes every SNP again, for its own iids and those after it. So the SNP data is read about
+        iid_count/(2*stripe_size) times in all, the price of never holding more than one stripe (computing every stripe in one pass over the SNPs would hold them all).
+        '''
+        from pysnptools.snpreader import SnpReader
+        if self.row is not self.col and not np.array_equal(self.row,self.col):
+            for stripe in KernelReader._stripe_sequence(self, stripe_size, dtype=dtype, num_threads=num_threads):
+                yield stripe
+            return
+
+        iid_count = self.iid_count
+        block_size = self.block_size or max(1,self.snpreader.sid_count)
+        block_start_list = range(0, self.snpreader.sid_count, block_size)
+        trained_list = [self.standardizer.train(self.snpreader[:,start:start+block_size],num_threads=num_threads) for start in block_start_list]
+        for row_start in range(0, iid_count, stripe_size):
+            row_count = min(stripe_size, iid_count-row_start)
+            stripe = np.zeros([row_count,iid_count-row_start],dtype=dtype,order='C')
+            for start, trained in zip(block_start_list, trained_list):
+                snpdata, _ = SnpReader._as_snpdata(self.snpreader[row_start:,start:start+block_size],standardizer=trained,dtype=dtype,force_python_only=False,num_threads=num_threads)
+                stripe += snpdata.val[:row_count,:].dot(snpdata.val.T)
+            logging.info("created kernel rows {0} to {1} of {2}".format(row_start,row_start+row_count,iid_count))
+            yield row_start, row_start, stripe, True
+
     @property
     def sid(self):
         '''The :attr:`.SnpReader.sid` property of the SNP data.
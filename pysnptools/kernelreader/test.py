@@ -199,6 +199,55 @@ class TestLoader(unittest.TestCase):
         np.testing.assert_array_almost_equal(kerneldata1.val, kerneldata2.val, decimal=10)
         logging.info("done with test")
 
+    def test_hdf5_tiles(self):
+        import h5py
+        logging.info("in test_hdf5_tiles")
+        snpreader = Bed(self.currentFolder + "/../examples/toydata",count_A1=False)[:,:2000]
+        snpkernel = SnpKernel(snpreader,stdizer.Unit(),block_size=300)
+        expected = snpreader.read_kernel(stdizer.Unit())
+        output = "tempdir/kernelreader/toydata.tiles.kernel.hdf5"
+        create_directory_if_necessary(output)
+        for sid_major in [True,False]:
+            KernelHdf5.write(output,snpkernel,sid_major=sid_major,tile_size=130) #tiles don't evenly divide the 500 iids
+            with h5py.File(output,"r") as h5:
+                assert h5['val'].chunks == (130,130) and h5['val'].shuffle #the default shuffle filter, as for other writes
+            kernelreader2 = KernelHdf5(output)
+            np.testing.assert_array_almost_equal(expected.val, kernelreader2.read().val, decimal=10)
+            np.testing.assert_array_almost_equal(expected.val[::2,10:20], kernelreader2[::2,10:20].read().val, decimal=10)
+            del kernelreader2 #close the file
+
+        #The standardizer is trained once per SNP block, before the first stripe, rather than once per stripe
+        class CountingUnit(stdizer.Unit):
+            train_count = 0
+            def train(self, *args, **kwargs):
+                CountingUnit.train_count += 1
+                return stdizer.Unit.train(self, *args, **kwargs)
+        stripe_list = list(SnpKernel(snpreader,CountingUnit(),block_size=300)._stripe_sequence(130))
+        assert CountingUnit.train_count == 7 and len(stripe_list) == 4
+        for row_start, col_start, val, mirror in stripe_list:
+            np.testing.assert_array_almost_equal(expected.val[row_start:row_start+val.shape[0],col_start:], val, decimal=10)
+
+        #Non-square kernels (and in-memory kernels) are written in stripes of rows
+        KernelHdf5.write(output,expected[::3,::2],tile_size=50)
+        kernelreader2 = KernelHdf5(output)
+        np.testing.assert_array_equal(expected.iid[::3], kernelreader2.iid0)
+        np.testing.assert_array_almost_equal(expected.val[::3,::2], kernelreader2.read().val, decimal=10)
+        logging.info("done with test")
+
+    def test_add_remove_snps(self):
+        logging.info("in test_add_remove_snps")
+        snpreader = Bed(self.currentFolder + "/../examples/toydata",count_A1=False)[:,:3000]
+        for standardizer in [stdizer.Unit(),stdizer.Beta(1,25)]:
+            expected, trained = snpreader.read().standardize(standardizer,return_trained=True)
+            expected = expected.val.dot(expected.val.T)
+            kerneldata = snpreader[:,:1000].read_kernel(trained)
+            kerneldata.add_snps(snpreader[::-1,1000:],trained,block_size=700) #iids in a different order and a blocked read of a trained standardizer
+            np.testing.assert_allclose(expected, kerneldata.val, rtol=1e-6, atol=1e-6)
+            _, trained2 = kerneldata.remove_snps(snpreader[:,2500:],standardizer,return_trained=True) #untrained is trained on the given SNPs
+            assert np.array_equal(trained2.sid, snpreader.sid[2500:])
+            np.testing.assert_allclose(snpreader[:,:2500].read_kernel(standardizer).val, kerneldata.val, rtol=1e-6, atol=1e-6)
+        logging.info("done with test")
+
     def test_subset(self):
         logging.info("in test_subset")
         snpreader = Bed(self.currentFolder + "/../examples/toydata",count_A1=False)
@@ -213,6 +262,20 @@ class TestLoader(unittest.TestCase):
         np.testing.assert_array_almost_equal(kerneldata2.val, expected.val, decimal=10)
         logging.info("done with test")
 
+    def test_rectangle(self):
+        logging.info("in test_rectangle")
+        snpreader = Bed(self.currentFolder + "/../examples/toydata",count_A1=False)
+        _, trained = snpreader.read().standardize(stdizer.Unit(),return_trained=True)
+        for standardizer in [stdizer.Unit(),trained]: #trained is constant, so only the needed iids are read
+            whole = snpreader.read_kernel(standardizer).val
+            snpkernel = SnpKernel(snpreader,standardizer,block_size=700)
+            for row_indexer, col_indexer in [(slice(None,None,2),slice(10,50)),([3,1,400],slice(None)),(slice(None),[7])]:
+                for order in ['F','C','A']:
+                    kerneldata = snpkernel[row_indexer,col_indexer].read(order=order)
+                    np.testing.assert_array_almost_equal(whole[row_indexer,:][:,col_indexer], kerneldata.val, decimal=10)
+                    assert PstReader._array_properties_are_ok(kerneldata.val,order,np.float64)
+        logging.info("done with test")
+
     def test_identity(self):
         logging.info("in test_identity")
         snpreader = Bed(self.currentFolder + "/../examples/toydata",count_A1=False)
@@ -13,7 +13,7 @@ class KernelStandardizer(object):
 
     Details of Methods & Properties:
     '''
-    def standardize(self, kerneldata, return_trained=False, force_python_only=False):
+    def standardize(self, kerneldata, return_trained=False, force_python_only=False, num_threads=None):
         '''
         Applies standardization, in place, to :class:`.KernelData`. For convenience also returns the :class:`KernelData`.
 
@@ -45,7 +45,7 @@ class Identity(KernelStandardizer):
     def __init__(self):
         super(Identity, self).__init__()
 
-    def standardize(self, kerneldata, return_trained=False, force_python_only=False):
+    def standardize(self, kerneldata, return_trained=False, force_python_only=False, num_threads=None):
         if return_trained:
             return kerneldata, self
         else:
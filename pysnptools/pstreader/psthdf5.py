@@ -7,6 +7,7 @@ import logging
 import scipy as np
 from .pstreader import PstReader
 from .pstdata import PstData
+from pysnptools.util import IntRangeSet
 import warnings
 
 class PstHdf5(PstReader):
@@ -133,15 +134,68 @@ class PstHdf5(PstReader):
             assert val_order == "C", "real assert"
             self.val_in_file.read_direct(val,selection)
 
-    def _create_block(self, block_size, order, dtype):
+    _max_hyperslab_count = 64 # HDF5 slows down sharply when a selection is the union of many more hyperslabs than this, so larger unions are read in batches
+
+    @staticmethod
+    def _ranges(index_list):
+        '''
+        The (start,stop) ranges of contiguous indexes in a sorted list of indexes without repeats.
+        '''
+        return list(IntRangeSet(index_list).ranges())
+
+    def _read_ranges(self, val, val_order, row_ranges, col_ranges):
+        '''
+        Reads the union of the hyperslabs row_ranges x col_ranges into val, which must be in the order of the file.
+        Rather than one big union, it does several reads, each of at most _max_hyperslab_count hyperslabs.
+        '''
+        if self.is_col_major:
+            major_ranges, minor_ranges = col_ranges, row_ranges
+        else:
+            major_ranges, minor_ranges = row_ranges, col_ranges
+        val_in_file_order = val.T if val_order == "F" else val #C contiguous, with the file's shape
+        assert val_in_file_order.flags["C_CONTIGUOUS"], "real assert"
+
+        minor_batch_count = min(len(minor_ranges), self._max_hyperslab_count)
+        major_batch_count = max(1, self._max_hyperslab_count // minor_batch_count)
+        memory_space = h5py.h5s.create_simple(val_in_file_order.shape)
+        major_start = 0
+        for major_batch_start in range(0, len(major_ranges), major_batch_count):
+            major_batch = major_ranges[major_batch_start:major_batch_start+major_batch_count]
+            major_length = sum(stop-start for start, stop in major_batch)
+            minor_start = 0
+            for minor_batch_start in range(0, len(minor_ranges), minor_batch_count):
+                minor_batch = minor_ranges[minor_batch_start:minor_batch_start+minor_batch_count]
+                minor_length = sum(stop-start for start, stop in minor_batch)
+                file_space = self.val_in_file.id.get_space()
+                file_space.select_none()
+                for major_range_start, major_range_stop in major_batch:
+                    for minor_range_start, minor_range_stop in minor_batch:
+                        file_space.select_hyperslab((major_range_start,minor_range_start),(major_range_stop-major_range_start,minor_range_stop-minor_range_start),op=h5py.h5s.SELECT_OR)
+                memory_space.select_hyperslab((major_start,minor_start),(major_length,minor_length))
+                self.val_in_file.id.read(memory_space, file_space, val_in_file_order)
+                minor_start += minor_length
+            major_start += major_length
+
+    def _create_block(self, block_size, order, dtype, row_count=None):
+        row_count = len(self._row) if row_count is None else row_count
         matches_order = self.is_col_major == (order =="F")
         opposite_order = "C" if order == "F" else "F"
         if matches_order:
-            return np.empty([len(self._row),block_size], dtype=dtype, order=order), order
+            return np.empty([row_count,block_size], dtype=dtype, order=order), order
         else:
-            return np.empty([len(self._row),block_size], dtype=dtype, order=opposite_order), opposite_order
-
-    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok):
+            return np.empty([row_count,block_size], dtype=dtype, order=opposite_order), opposite_order
+
+    def _col_window_size(self):
+        '''
+        The number of the file's cols to read at a time when reading blocks: about self._block_size, but a whole number of chunks if the file is chunked.
+        '''
+        chunks = self.val_in_file.chunks
+        if chunks is None:
+            return self._block_size
+        col_chunk = chunks[0] if self.is_col_major else chunks[1]
+        return max(1, self._block_size // col_chunk) * col_chunk
+
+    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None):
         self._run_once()
 
         assert order in ['F','C','A'], "Expect order to be 'F', 'C' or 'A'"
@@ -189,17 +243,14 @@ class PstHdf5(PstReader):
 
         # case 2 - some cols and all rows
         elif is_simple and row_index_count == self.row_count:
-            self._read_direct(val, order, np.s_[:,col_index_list])
+            self._read_ranges(val, order, [(0,self.row_count)], PstHdf5._ranges(col_index_list))
 
         # case 3 all cols and some row
         elif is_simple and col_index_count == self.col_count:
-            self._read_direct(val, order, np.s_[row_index_list,:])
+            self._read_ranges(val, order, PstHdf5._ranges(row_index_list), [(0,self.col_count)])
 
         # case 4 some cols and some rows -- use blocks
         else:
-            block_size = min(self._block_size, col_index_count)
-            block, block_order = self._create_block(block_size, order, dtype)
-
             if not col_are_sorted:
                 col_index_index_list = np.argsort(col_index_list).tolist()
                 col_index_list_sorted = list(np.array(col_index_list)[col_index_index_list])
@@ -207,15 +258,32 @@ class PstHdf5(PstReader):
                 col_index_index_list = np.arange(col_index_count)
                 col_index_list_sorted = col_index_list
 
-            for start in range(0, col_index_count, block_size):
-                #print start
-                stop = min(start+block_size,col_index_count)
-                if stop-start < block_size:  #On the last loop, the buffer might be too big, so make it smaller
-                    block, block_order = self._create_block(stop-start, order, dtype)
+            #If the rows are sorted and form few contiguous ranges, select just them from the file. Otherwise, read all rows and subset in memory.
+            row_ranges = PstHdf5._ranges(row_index_list) if row_is_sorted else None
+            rows_in_selection = row_ranges is not None and len(row_ranges) <= self._max_hyperslab_count
+            if not rows_in_selection:
+                row_ranges = [(0,self.row_count)]
+
+            #Each block holds the wanted cols from one window of the file's cols. When the file is chunked, the windows line up with the chunks,
+            #so each (possibly compressed) chunk is read only once.
+            window_size = self._col_window_size()
+            start = 0
+            while start < col_index_count:
+                window_stop = (col_index_list_sorted[start] // window_size + 1) * window_size
+                stop = start + 1
+                while stop < col_index_count and col_index_list_sorted[stop] < window_stop:
+                    stop += 1
                 col_index_list_forblock = col_index_list_sorted[start:stop]
                 col_index_index_list_forblock = col_index_index_list[start:stop]
-                self._read_direct(block, block_order, np.s_[:,col_index_list_forblock])
-                val[:,col_index_index_list_forblock] = block[row_index_list,:]
+                col_unique_forblock = np.unique(col_index_list_forblock) #Repeated cols are read once
+                block, block_order = self._create_block(len(col_unique_forblock), order, dtype, row_index_count if rows_in_selection else None)
+                self._read_ranges(block, block_order, row_ranges, PstHdf5._ranges(col_unique_forblock.tolist()))
+                if not rows_in_selection:
+                    block = block[row_index_list,:]
+                if len(col_unique_forblock) < stop-start:
+                    block = block[:,np.searchsorted(col_unique_forblock,col_index_list_forblock)]
+                val[:,col_index_index_list_forblock] = block
+                start = stop
 
         #!!LATER does this test work when the size is 1 x 1 and order if F? iid_index_or_none=[0], sid_index_or_none=[1000] (based on test_blocking_hdf5)
         has_right_order = (order=="C" and val.flags["C_CONTIGUOUS"]) or (order=="F" and val.flags["F_CONTIGUOUS"])
@@ -226,7 +294,7 @@ class PstHdf5(PstReader):
 
 
     @staticmethod
-    def write(filename, pstdata, hdf5_dtype=None, col_major=True):
+    def write(filename, pstdata, hdf5_dtype=None, col_major=True, chunks=None, compression=None, shuffle=True):
         """Writes a :class:`PstData` to PstHdf5 format.
 
         :param filename: the name of the file to create
@@ -237,6 +305,24 @@ class PstHdf5(PstReader):
         :type hdf5_dtype: string
         :param col_major: Tells if vals should be stored on disk in col_major (default) or row_major format.
         :type col_major: bool
+        :param chunks: optional -- How to divide the vals into chunks on disk. None (the default) lets h5py pick. A (row_count, col_count) tuple gives the
+            size of each chunk. 'col_block' gives chunks of about one megabyte, each holding all the rows of a block of cols. This suits reading blocks of cols
+            (for example, blocks of SNPs), which then read whole chunks.
+        :type chunks: None, tuple of two ints, or 'col_block'
+        :param compression: optional -- None (the default), 'gzip', or 'lzf'. Compressed files take less disk space, but take more time to read and write.
+        :type compression: string
+        :param shuffle: optional -- If True (the default), the vals go through HDF5's byte-shuffle filter, which helps compression. Like any HDF5 filter, it needs chunked
+            storage, so the vals are chunked even when **chunks** is None. With shuffle False and neither chunks nor compression, the vals are stored contiguously,
+            which makes reading scattered rows and cols faster.
+        :type shuffle: bool
+
+        >>> from pysnptools.pstreader import PstHdf5, PstData
+        >>> import pysnptools.util as pstutil
+        >>> pstdata = PstData(row=[['a','1'],['b','2'],['c','3']],col=['x','y'],val=[[1.0,2],[3,4],[np.nan,6]])
+        >>> pstutil.create_directory_if_necessary("tempdir/tiny.pst.hdf5")
+        >>> PstHdf5.write("tempdir/tiny.pst.hdf5",pstdata,chunks='col_block',compression='gzip')
+        >>> print(PstHdf5("tempdir/tiny.pst.hdf5")[:,1].read().val[:,0])
+        [2. 4. 6.]
         """
 
         if isinstance(filename,PstData) and isinstance(pstdata,str): #For backwards compatibility, reverse inputs if necessary
@@ -245,15 +331,46 @@ class PstHdf5(PstReader):
 
         assert hdf5_dtype is None or (isinstance(hdf5_dtype, str) and len(hdf5_dtype) == 2 and  hdf5_dtype[0] == 'f'), "Expect hdf5_dtype to be None or to start with 'f', e.g. 'f4' for single, 'f8' for double"
 
-        val = (pstdata.val.T) if col_major else pstdata.val
+        assert compression in [None,'gzip','lzf'], "Expect compression to be None, 'gzip', or 'lzf'"
+
+        if chunks == 'col_block':
+            itemsize = np.dtype(hdf5_dtype or pstdata.val.dtype).itemsize
+            chunks = (max(1, min(pstdata.col_count, PstHdf5._col_block_bytes // (itemsize*max(1,pstdata.row_count)))), pstdata.row_count)
+            if not col_major:
+                chunks = tuple(reversed(chunks))
+        elif chunks is not None:
+            assert len(chunks) == 2, "Expect chunks to be None, 'col_block', or a (row_count, col_count) tuple"
+            chunks = tuple(reversed(chunks)) if col_major else tuple(chunks)
 
         with h5py.File(filename, "w") as h5:
-            h5.create_dataset('row', data=pstdata.row)
-            h5.create_dataset('col', data=pstdata.col)
-            h5.create_dataset('row_property', data=pstdata.row_property)
-            h5.create_dataset('col_property', data=pstdata.col_property)
-            h5.create_dataset('val', data=val,dtype=hdf5_dtype,shuffle=True)#compression="gzip", doesn't seem to work with Anaconda
-            h5['val'].attrs["col-major"] = col_major
+            PstHdf5._create_val(h5, pstdata, col_major, hdf5_dtype, chunks, compression, shuffle, val=pstdata.val)
+
+    @staticmethod
+    def _create_val(h5, pstreader, col_major, hdf5_dtype, chunks=None, compression=None, shuffle=True, val=None):
+        '''
+        Writes the row, col, row_property, and col_property of 'pstreader' to the open h5py.File and creates its 'val' dataset, which it returns.
+        If 'val' is given, it is written to the dataset. 'chunks' is in the on-disk orientation (that is, (col,row) when col_major) and is clipped to the data's shape.
+        '''
+        h5.create_dataset('row', data=pstreader.row)
+        h5.create_dataset('col', data=pstreader.col)
+        h5.create_dataset('row_property', data=pstreader.row_property)
+        h5.create_dataset('col_property', data=pstreader.col_property)
+
+        shape = (pstreader.col_count, pstreader.row_count) if col_major else (pstreader.row_count, pstreader.col_count)
+        if min(shape) == 0: #HDF5 can't chunk an empty dataset
+            chunks = None
+            compression = None
+            shuffle = False
+        elif chunks is not None:
+            chunks = tuple(min(chunk,count) for chunk,count in zip(chunks,shape))
+        if val is not None and col_major:
+            val = val.T
+        dtype = hdf5_dtype or (val.dtype if val is not None else 'f8')
+        val_in_file = h5.create_dataset('val', shape=shape, data=val, dtype=dtype, shuffle=shuffle, chunks=chunks, compression=compression)
+        val_in_file.attrs["col-major"] = col_major
+        return val_in_file
+
+    _col_block_bytes = 1024*1024 # With chunks='col_block', each chunk is about this size, which matches h5py's default chunk cache
 
 
 if __name__ == "__main__":
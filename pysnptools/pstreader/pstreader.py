@@ -361,13 +361,13 @@ class PstReader(object):
         raise NotImplementedError
 
 
-    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok):
+    def _read(self, row_index_or_none, col_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None):
         raise NotImplementedError
 
 
 
     #!!check that views always return contiguous memory by default
-    def read(self, order='F', dtype=np.float64, force_python_only=False, view_ok=False):
+    def read(self, order='F', dtype=np.float64, force_python_only=False, view_ok=False, num_threads=None):
         """Reads the matrix values and returns a :class:`.PstData` (with :attr:`.PstData.val` property containing a new ndarray of the matrix values).
 
         :param order: {'F' (default), 'C', 'A'}, optional -- Specify the order of the ndarray. If order is 'F' (default),
@@ -394,6 +394,10 @@ class PstReader(object):
             share memory and so it may ignore your suggestion and allocate a new ndarray anyway.
         :type view_ok: bool
 
+        :param num_threads: optional -- The number of threads with which to read the values. If None (default),
+            uses the 'PST_NUM_THREADS' environment variable, if set, and otherwise all the processors. Readers that can't work in parallel ignore it.
+        :type num_threads: int or None
+
         :rtype: :class:`.PstData`
 
         Calling the method again causes the matrix values to be re-read and creates a new in-memory :class:`.PstData` with a new ndarray of matrix values.
@@ -412,7 +416,7 @@ class PstReader(object):
         >>> import numpy as np
         >>> # print np.may_share_memory(subset_snpdata.val, subsub_snpdata.val) # Do the two ndarray's share memory? They could. Currently they won't.
         """
-        val = self._read(None, None, order, dtype, force_python_only, view_ok)
+        val = self._read(None, None, order, dtype, force_python_only, view_ok, num_threads)
         from .pstdata import PstData
         ret = PstData(self.row, self.col, val, row_property=self.row_property, col_property=self.col_property, name=str(self))
         return ret
@@ -571,7 +575,7 @@ class PstReader(object):
                 order = "K"
             if dtype is None:
                 dtype = sub_val.dtype
-            sub_val = sub_val.astype(dtype, order, copy=True)
+            sub_val = pstutil._astype(sub_val, dtype, order)
 
         shares_memory =  np.may_share_memory(val, sub_val)
         assert(PstReader._array_properties_are_ok(sub_val, order, dtype))
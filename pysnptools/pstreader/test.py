@@ -91,6 +91,56 @@ class TestLoader(unittest.TestCase):
                                 pass
         logging.info("done with 'test_writes'")
 
+    def test_hdf5_chunks(self):
+        import h5py
+        np.random.seed(0)
+        val = np.random.randint(0,3,size=(300,1000)).astype(np.float64)
+        val[np.random.random(val.shape) < .05] = np.nan
+        pstdata = PstData(row=[[str(i),"x"] for i in range(300)],col=[str(i) for i in range(1000)],val=val)
+        output_template = "tempdir/pstreader/chunks.{0}.hdf5"
+        create_directory_if_necessary(output_template)
+        i = 0
+        for col_major in [True,False]:
+            for chunks, compression, shuffle in [(None,None,True),(None,None,False),((50,70),'gzip',True),('col_block','lzf',True),('col_block',None,False),((1000,1000),None,True)]:
+                output = output_template.format(i) # readers keep their files open, so each write gets a new file
+                i += 1
+                PstHdf5.write(output,pstdata,hdf5_dtype='f4',col_major=col_major,chunks=chunks,compression=compression,shuffle=shuffle)
+                with h5py.File(output,"r") as h5:
+                    assert h5['val'].compression == compression and h5['val'].shuffle == shuffle
+                    if chunks == 'col_block':
+                        assert h5['val'].chunks == ((873,300) if col_major else (300,873)) # about 1MB of f4's, all the rows of a block of cols
+                    elif chunks is None:
+                        assert (h5['val'].chunks is None) == (not shuffle) # the shuffle filter needs chunks, otherwise the vals are stored contiguously
+                    else:
+                        expected = (min(chunks[0],300),min(chunks[1],1000)) # chunks are clipped to the data's shape
+                        assert h5['val'].chunks == (tuple(reversed(expected)) if col_major else expected)
+                reader = PstHdf5(output)
+                reader._block_size = 100 # read many blocks
+                np.testing.assert_array_equal(val.astype(np.float32), reader.read().val)
+                for row_index, col_index in [([5,3,299],[999,0,500,501,7]), (slice(None,None,2),slice(3,None,3)), ([4,4,2],slice(None))]:
+                    for order in ['F','C']:
+                        np.testing.assert_array_equal(val.astype(np.float32)[row_index,:][:,col_index], reader[row_index,col_index].read(order=order).val)
+
+    def test_hdf5_ranges(self):
+        np.random.seed(0)
+        val = np.random.normal(size=(200,500))
+        pstdata = PstData(row=[str(i) for i in range(200)],col=[str(i) for i in range(500)],val=val)
+        output_template = "tempdir/pstreader/ranges.{0}.hdf5"
+        create_directory_if_necessary(output_template)
+        scattered_rows = sorted(set(np.random.randint(0,200,size=100)))
+        scattered_cols = sorted(set(np.random.randint(0,500,size=300)))
+        for i, (col_major, shuffle) in enumerate([(True,True),(False,True),(True,False),(False,False)]): # with shuffle, the vals are chunked; without, contiguous
+            output = output_template.format(i)
+            PstHdf5.write(output,pstdata,col_major=col_major,shuffle=shuffle)
+            reader = PstHdf5(output)
+            for max_hyperslab_count in [64, 3]: # 3 forces many batches
+                reader._max_hyperslab_count = max_hyperslab_count
+                for row_index, col_index in [(slice(None),scattered_cols),(scattered_rows,slice(None)),(scattered_rows,scattered_cols),
+                                             (list(reversed(scattered_rows)),scattered_cols),(scattered_rows[:5]+scattered_rows[50:60],[7,3,3,400,9]),
+                                             ([199,0,5,5],[499,0,250])]:
+                    for order in ['F','C','A']:
+                        np.testing.assert_array_equal(val[row_index,:][:,col_index], reader[row_index,col_index].read(order=order).val)
+
     def test_repr_test(self):
         np.random.seed(0)
         row_property=np.array([[1.0,2,2.5],[3,4,4.5],[5,6,6.5]])
@@ -22,3 +22,18 @@
 #define SUFFIX(NAME) NAME ## floatFAAA
 #include "CPlinkBedFileT.cpp"
 
+#define REAL_IS_INT8
+
+#define REAL signed char
+#define ORDERC
+#undef ORDERF
+#define SUFFIX(NAME) NAME ## int8CAAA
+#include "CPlinkBedFileT.cpp"
+
+#define REAL signed char
+#define ORDERF
+#undef ORDERC
+#define SUFFIX(NAME) NAME ## int8FAAA
+#include "CPlinkBedFileT.cpp"
+
+#undef REAL_IS_INT8
@@ -22,3 +22,18 @@
 #define SUFFIX(NAME) NAME ## floatFAAA
 #include "CPlinkBedFileT.h"
 
+#define REAL_IS_INT8
+
+#define REAL signed char
+#define ORDERC
+#undef ORDERF
+#define SUFFIX(NAME) NAME ## int8CAAA
+#include "CPlinkBedFileT.h"
+
+#define REAL signed char
+#define ORDERF
+#undef ORDERC
+#define SUFFIX(NAME) NAME ## int8FAAA
+#include "CPlinkBedFileT.h"
+
+#undef REAL_IS_INT8
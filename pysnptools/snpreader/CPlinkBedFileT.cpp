@@ -38,6 +38,10 @@
 #include <stdio.h>
 #include <math.h> 
 #include <stdlib.h>
+#include <algorithm>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 
 #ifdef _WIN32
 #define isinf(x) (!_finite(x))
@@ -46,7 +50,11 @@
 #endif
 
 
+#ifdef REAL_IS_INT8
+REAL SUFFIX(unknownOrMissing) = -127;  // int8 has no NaN, so missing values are given this sentinel value
+#else
 REAL SUFFIX(unknownOrMissing) = std::numeric_limits<REAL>::quiet_NaN();  // now used by SnpInfo
+#endif
 REAL SUFFIX(homozygousPrimaryAllele) = 0;                // Major Allele
 REAL SUFFIX(heterozygousAllele) = 1;                     
 REAL SUFFIX(homozygousSecondaryAllele) = 2;              // Minor Allele ()
@@ -73,6 +81,7 @@ SUFFIX(CBedFile)::SUFFIX(CBedFile)()
 	cIndividuals = 0;
 	cSnps        = 0;
 	cbStride     = 0;
+	pFile        = NULL;
 
 }
 
@@ -133,7 +142,6 @@ void SUFFIX(CBedFile)::Open( const string& filename_, size_t cIndividuals_, size
 
 	// allocate the read buffer for a SNP
 	rgBytes.resize( cbStride );
-	rgBedGenotypes.resize( cIndividuals, bedMissingGenotype );
 }
 
 LayoutMode  SUFFIX(CBedFile)::GetLayoutMode()
@@ -170,6 +178,11 @@ size_t SUFFIX(CBedFile)::Read( BYTE *pb, size_t cbToRead )
 }
 
 size_t SUFFIX(CBedFile)::ReadLine(BYTE *pb, size_t idx)
+{
+	return(ReadLines(pb, idx, 1));
+}
+
+size_t SUFFIX(CBedFile)::ReadLines(BYTE *pb, size_t idx, size_t cSnpsToRead)
 {
 	long long fpos = cbHeader + (idx*cbStride);
 #ifdef _WIN32
@@ -190,7 +203,7 @@ size_t SUFFIX(CBedFile)::ReadLine(BYTE *pb, size_t idx)
 #endif
 	}
 
-	size_t cbRead = Read(pb, cbStride);
+	size_t cbRead = Read(pb, cbStride*cSnpsToRead);
 	return(cbRead);
 }
 
@@ -202,38 +215,31 @@ void SUFFIX(CBedFile)::ReadGenotypes(size_t iSnp, bool count_A1, const vector< s
 {
 	//fprintf(stdout,"reading iSnp=%d w/ cIndividuals=%d and startpos=%d\n",iSnp,cIndividuals,startpos);
 	ReadLine( &rgBytes[0], iSnp );
-	// 'decompress' the genotype information
-	size_t iIndividual = 0;
-	for ( size_t ib = 0; ib < cbStride; ++ib )
-	{
-		BYTE genotypeByte = rgBytes[ ib ];
+	SUFFIX(DecodeGenotypes)( &rgBytes[0], count_A1, idxIndividualList, pvOut, startpos, outputNumSNPs );
+}
 
-		// manually unrolled loop to decompress this byte
-		if ( iIndividual < cIndividuals ) rgBedGenotypes[ iIndividual++ ] = (BedGenotype)( genotypeByte       & 0x03);
-		if ( iIndividual < cIndividuals ) rgBedGenotypes[ iIndividual++ ] = (BedGenotype)((genotypeByte >> 2) & 0x03);
-		if ( iIndividual < cIndividuals ) rgBedGenotypes[ iIndividual++ ] = (BedGenotype)((genotypeByte >> 4) & 0x03);
-		if ( iIndividual < cIndividuals ) rgBedGenotypes[ iIndividual++ ] = (BedGenotype)((genotypeByte >> 6) & 0x03);
-	}
+/*
+* 'Decompress' the genotypes of the individuals in idxIndividualList from one SNP's line of .bed bytes (pb)
+*   and store the results in pvOut
+*/
+void SUFFIX(DecodeGenotypes)(const BYTE* pb, bool count_A1, const vector< size_t >& idxIndividualList, REAL* pvOut, uint64_t_ startpos, uint64_t_  outputNumSNPs)
+{
+	const REAL* mapBedGenotypeToReal = count_A1 ? SUFFIX(mapBedGenotypeToRealAlleleCountA1) : SUFFIX(mapBedGenotypeToRealAlleleNoCountA1);
 	for ( size_t i=0; i<idxIndividualList.size(); ++i )
 	{
 		size_t idx = idxIndividualList[ i ];
-		//fprintf(stdout,"iSnp=%d, iIID=%d\n",iSnp,idx);
+		BedGenotype genotype = (BedGenotype)((pb[ idx >> 2 ] >> ((idx & 0x03) << 1)) & 0x03);
 #ifdef ORDERF
 		uint64_t_ out_idx = startpos + i;
 #else
 		uint64_t_ out_idx = startpos + i * outputNumSNPs;
 #endif
-		if (count_A1)
-		{
-			pvOut[out_idx] = SUFFIX(mapBedGenotypeToRealAlleleCountA1)[rgBedGenotypes[idx]];
-		}
-		else {
-			pvOut[out_idx] = SUFFIX(mapBedGenotypeToRealAlleleNoCountA1)[rgBedGenotypes[idx]];
-		}
-
+		pvOut[out_idx] = mapBedGenotypeToReal[genotype];
 	}
 }
 
+#ifndef REAL_IS_INT8 // standardization is only defined for floating point values
+
 const REAL SUFFIX(_PI) = 2.0*acos(0.0);
 const REAL SUFFIX(_halflog2pi)=(REAL)0.5*log((REAL)2.0*SUFFIX(_PI));
 const REAL SUFFIX(coeffsForLogGamma)[] = { 12.0, -360.0, 1260.0, -1680.0, 1188.0 };
@@ -319,141 +325,174 @@ REAL SUFFIX(BetaPdf)(REAL x, REAL a, REAL b){
 
 
 /*
-* Parameters: 
-* SNPs [nIndividuals by nSNPs]:
-*                       Matrix stored in column-major order. 
-*                       This will hold the result.
-*                       NaNs will be set to 0.0 in the result.
+* Standardizes one SNP in place (if apply_in_place).
+* snp:                  The SNP's first value. Its values are indStride elements apart.
+* mean_s, std:          If use_stats, the given mean and standard deviation. Otherwise, they are measured and returned.
+*                       A standard deviation of infinity marks a SNP with no variation, whose values become 0.0.
+* iSnp, seenSNC:        Used to report (only) the first illegal SNP.
 */
-void SUFFIX(ImputeAndZeroMeanSNPs)( 
-	REAL *SNPs, 
-	const size_t nIndividuals, 
-	const size_t nSNPs, 
+void SUFFIX(StandardizeSNP)(
+	REAL *snp,
+	const size_t nIndividuals,
+	const long long indStride,
 	const bool betaNotUnitVariance,
 	const REAL betaA,
 	const REAL betaB,
 	const bool apply_in_place,
 	const bool use_stats,
-	REAL *stats
+	REAL& mean_s,
+	REAL& std,
+	const size_t iSnp,
+	bool& seenSNC
 	)
 {
-	bool seenSNC = false; //Keep track of this so that only one warning message is reported
-#ifdef ORDERF
+	bool isSNC;
 
-	for ( size_t iSnp = 0; iSnp < nSNPs; ++iSnp )
+	if (use_stats)
 	{
-		REAL mean_s;
-		REAL std;
-		REAL freq = 0;
-		size_t end = nIndividuals;
-		size_t delta = 1;
-		bool isSNC;
-
-		if (use_stats)
+		isSNC = isinf(std);
+	}
+	else
+	{
+		isSNC = false;
+		REAL n_observed = 0.0;
+		REAL sum_s = 0.0;      //the sum of a SNP over all observed individuals
+		REAL sum2_s = 0.0;      //the sum of the squares of the SNP over all observed individuals
+
+		for (long long ind = 0; ind < (long long)nIndividuals; ++ind)
 		{
-			mean_s = stats[iSnp];
-			std = stats[iSnp + nSNPs];
-			isSNC = isinf(std);
+			REAL value = snp[ind * indStride];
+			if (value == value)
+			{
+				//check for not NaN
+				sum_s += value;
+				sum2_s += value * value;
+				++n_observed;
+			}
 		}
-		else
+
+		if (n_observed < 1.0)
 		{
-			isSNC = false;
-			REAL n_observed = 0.0;
-			REAL sum_s = 0.0;      //the sum of a SNP over all observed individuals
-			REAL sum2_s = 0.0;      //the sum of the squares of the SNP over all observed individuals
+			printf("No individual observed for the SNP.\n");
+			//LATER make it work (in some form) for n of 0
+		}
 
-			for (size_t ind = 0; ind < end; ind += delta)
-			{
-				if (SNPs[ind] == SNPs[ind])
-				{
-					//check for not NaN
-					sum_s += SNPs[ind];
-					sum2_s += SNPs[ind] * SNPs[ind];
-					++n_observed;
-				}
-			}
+		mean_s = sum_s / n_observed;    //compute the mean over observed individuals for the current SNP
+		REAL mean2_s = sum2_s / n_observed;    //compute the mean of the squared SNP
 
-			if (n_observed < 1.0)
+		if ((mean_s != mean_s) || betaNotUnitVariance && ((mean_s > (REAL)2.0) || (mean_s < (REAL)0.0)))
+		{
+#pragma omp critical(seenSNC)
+			if (!seenSNC)
 			{
-				printf("No individual observed for the SNP.\n");
-				//LATER make it work (in some form) for n of 0
+				seenSNC = true;
+				fprintf(stderr, "Illegal SNP mean: %.2f for SNPs[:][%i]\n", mean_s, iSnp);
 			}
+		}
+
 
-			mean_s = sum_s / n_observed;    //compute the mean over observed individuals for the current SNP
-			REAL mean2_s = sum2_s / n_observed;    //compute the mean of the squared SNP
+		REAL variance = mean2_s - mean_s * mean_s;        //By the Cauchy Shwartz inequality this should always be positive
+		std = sqrt(variance);
 
-			if ((mean_s != mean_s) || betaNotUnitVariance && ((mean_s > (REAL)2.0) || (mean_s < (REAL)0.0)))
+		if ((std != std) || (std <= (REAL)0.0))
+		{
+			// a std == 0.0 means all SNPs have the same value (no variation or Single Nucleotide Constant (SNC))
+			//   however ALL SNCs should have been removed in previous filtering steps
+			//   This test now prevents a divide by zero error below
+			isSNC = true;
+#pragma omp critical(seenSNC)
+			if (!seenSNC)
 			{
-				if (!seenSNC)
-				{
-					seenSNC = true;
-					fprintf(stderr, "Illegal SNP mean: %.2f for SNPs[:][%i]\n", mean_s, iSnp);
-				}
+				seenSNC = true;
+				fprintf(stderr, "std=.%2f has illegal value for SNPs[:][%i]\n", std, iSnp);
 			}
+			std = std::numeric_limits<REAL>::infinity();
 
+		}
+	}
 
-			REAL variance = mean2_s - mean_s * mean_s;        //By the Cauchy Shwartz inequality this should always be positive
-			std = sqrt(variance);
 
-			if ((std != std) || (std <= (REAL)0.0))
+	if (apply_in_place)
+	{
+		REAL factor; //each value is centered and then multiplied by this (which is faster than dividing each by std)
+		if (isSNC)
+		{
+			factor = 0.0;
+		}
+		else if (betaNotUnitVariance) //compute snp-freq as in the Visscher Height paper (Nat Gen, Yang et al 2010).
+		{
+			REAL freq = mean_s / 2.0;
+			if (freq > .5)
 			{
-				// a std == 0.0 means all SNPs have the same value (no variation or Single Nucleotide Constant (SNC))
-				//   however ALL SNCs should have been removed in previous filtering steps
-				//   This test now prevents a divide by zero error below
-				isSNC = true;
-				if (!seenSNC)
-				{
-					seenSNC = true;
-					fprintf(stderr, "std=.%2f has illegal value for SNPs[:][%i]\n", std, iSnp);
-				}
-				std = std::numeric_limits<REAL>::infinity();
-
+				freq = 1.0 - freq;
 			}
-
-			stats[iSnp] = mean_s;
-			stats[iSnp + nSNPs] = std;
+			factor = SUFFIX(BetaPdf)(freq, betaA, betaB);
+			//fprintf(stderr, "BetaPdf(%f,%f,%f)=%f\n",  freq, betaA, betaB, factor);
+		}
+		else
+		{
+			factor = (REAL)1.0 / std;  //unit variance as well
 		}
 
-
-		if (apply_in_place)
+		for (long long ind = 0; ind < (long long)nIndividuals; ++ind)
 		{
-			for (size_t ind = 0; ind < end; ind += delta)
+			REAL& value = snp[ind * indStride];
+			//check for NaN
+			if ((value != value) || isSNC)
 			{
-				//check for NaN
-				if ((SNPs[ind] != SNPs[ind]) || isSNC)
-				{
-					SNPs[ind] = 0.0;
-				}
-				else
-				{
-					SNPs[ind] -= mean_s;     //subtract the mean from the data
-					if (betaNotUnitVariance) //compute snp-freq as in the Visscher Height paper (Nat Gen, Yang et al 2010).
-					{
-						REAL freq = mean_s / 2.0;
-						if (freq > .5)
-						{
-							freq = 1.0 - freq;
-						}
-						REAL rT = SUFFIX(BetaPdf)(freq, betaA, betaB);
-						//fprintf(stderr, "BetaPdf(%f,%f,%f)=%f\n",  freq, betaA, betaB, rT);
-						SNPs[ind] *= rT;
-					}
-					else
-					{
-						SNPs[ind] /= std;        //unit variance as well
-					}
-				}
+				value = 0.0;
+			}
+			else
+			{
+				value = (value - mean_s) * factor;     //subtract the mean from the data and scale it
 			}
 		}
+	}
+}
+
 
-		SNPs += nIndividuals;
+/*
+* Parameters: 
+* SNPs [nIndividuals by nSNPs]:
+*                       Matrix stored in column-major order (ORDERF) or row-major order (ORDERC), possibly as a strided view.
+*                       This will hold the result.
+*                       NaNs will be set to 0.0 in the result.
+* indStride, snpStride: The distance, in elements (not bytes), between consecutive individuals and between consecutive SNPs.
+*                       For a contiguous column-major matrix, these are 1 and nIndividuals. They may be negative.
+* num_threads:          SNPs are independent, so they are split across this many OpenMP threads.
+*/
+void SUFFIX(ImputeAndZeroMeanSNPs)( 
+	REAL *SNPs, 
+	const size_t nIndividuals, 
+	const size_t nSNPs, 
+	const long long indStride,
+	const long long snpStride,
+	const bool betaNotUnitVariance,
+	const REAL betaA,
+	const REAL betaB,
+	const bool apply_in_place,
+	const bool use_stats,
+	REAL *stats,
+	int num_threads
+	)
+{
+	bool seenSNC = false; //Keep track of this so that only one warning message is reported
+	if (num_threads > (long long)nSNPs) num_threads = (int)nSNPs;
+	if (num_threads < 1) num_threads = 1;
+#ifdef ORDERF
+
+#pragma omp parallel for num_threads(num_threads) schedule(static) if(num_threads > 1)
+	for (long long iSnpSigned = 0; iSnpSigned < (long long)nSNPs; ++iSnpSigned) //OpenMP 2.0 (for MSVC) needs a signed loop variable
+	{
+		size_t iSnp = (size_t)iSnpSigned;
+		SUFFIX(StandardizeSNP)(SNPs + iSnpSigned * snpStride, nIndividuals, indStride, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, stats[iSnp], stats[iSnp + nSNPs], iSnp, seenSNC);
 	}
 
 #else //Order C
 
 	std::vector<REAL> mean_s(nSNPs);  //compute the mean over observed individuals for the current SNP
 	std::vector<REAL> std(nSNPs); //the standard deviation
-	std::vector<bool> isSNC(nSNPs); // Is this a SNC (C++ inits to false)
+	std::vector<char> isSNC(nSNPs); // Is this a SNC (C++ inits to false). (Not vector<bool>, whose elements share bytes.)
 	if (use_stats)
 	{
 		for (size_t iSnp = 0; iSnp < nSNPs; ++iSnp)
@@ -465,22 +504,29 @@ void SUFFIX(ImputeAndZeroMeanSNPs)(
 	}
 	else
 	{
-		// Make one pass through the data (by individual, because that is how it is laid out), collecting statistics
+		// Make one pass through the data (by individual, because that is how it is laid out), collecting statistics.
+		// Each thread collects the statistics of its own contiguous range of SNPs.
 		std::vector<REAL> n_observed(nSNPs); //                                                C++ inits to 0's
 		std::vector<REAL> sum_s(nSNPs);      //the sum of a SNP over all observed individuals. C++ inits to 0's
 		std::vector<REAL> sum2_s(nSNPs);     //the sum of the squares of the SNP over all observed individuals.     C++ inits to 0's
 
-		for( size_t ind = 0; ind < nIndividuals; ++ind)
+#pragma omp parallel for num_threads(num_threads) schedule(static,1) if(num_threads > 1)
+		for (int iThread = 0; iThread < num_threads; iThread++)
 		{
-			size_t rowStart = ind * nSNPs;
-			for ( size_t iSnp = 0; iSnp < nSNPs; ++iSnp )
+			size_t iStart = (size_t)(((long long)nSNPs * iThread) / num_threads);
+			size_t iStop = (size_t)(((long long)nSNPs * (iThread + 1)) / num_threads);
+			for( long long ind = 0; ind < (long long)nIndividuals; ++ind)
 			{
-				REAL value = SNPs[rowStart+iSnp];
-				if ( value == value )
+				const REAL* row = SNPs + ind * indStride;
+				for ( size_t iSnp = iStart; iSnp < iStop; ++iSnp )
 				{
-					sum_s[iSnp] += value;
-					sum2_s[iSnp] += value * value;
-					++n_observed[iSnp];
+					REAL value = row[(long long)iSnp * snpStride];
+					if ( value == value )
+					{
+						sum_s[iSnp] += value;
+						sum2_s[iSnp] += value * value;
+						++n_observed[iSnp];
+					}
 				}
 			}
 		}
@@ -531,12 +577,30 @@ void SUFFIX(ImputeAndZeroMeanSNPs)(
 
 	if (apply_in_place)
 	{
-		for (size_t ind = 0; ind < nIndividuals; ++ind)
+		//compute snp-freq as in the Visscher Height paper (Nat Gen, Yang et al 2010), once per SNP.
+		std::vector<REAL> rT(nSNPs);
+		if (betaNotUnitVariance)
 		{
-			size_t rowStart = ind * nSNPs;
 			for (size_t iSnp = 0; iSnp < nSNPs; ++iSnp)
 			{
-				REAL value = SNPs[rowStart + iSnp];
+				if (isSNC[iSnp]) continue;
+				REAL freq = mean_s[iSnp] / 2.0;
+				if (freq > .5)
+				{
+					freq = 1.0 - freq;
+				}
+				rT[iSnp] = SUFFIX(BetaPdf)(freq, betaA, betaB);
+				//fprintf(stderr, "BetaPdf(%f,%f,%f)=%f\n",  freq, betaA, betaB, rT);
+			}
+		}
+
+#pragma omp parallel for num_threads(num_threads) schedule(static) if(num_threads > 1)
+		for (long long indSigned = 0; indSigned < (long long)nIndividuals; ++indSigned)
+		{
+			REAL* row = SNPs + indSigned * indStride;
+			for (size_t iSnp = 0; iSnp < nSNPs; ++iSnp)
+			{
+				REAL value = row[(long long)iSnp * snpStride];
 				//check for NaN
 				if ((value != value) || isSNC[iSnp])
 				{
@@ -547,39 +611,109 @@ void SUFFIX(ImputeAndZeroMeanSNPs)(
 					value -= mean_s[iSnp];     //subtract the mean from the data
 					if (betaNotUnitVariance)
 					{
-						//compute snp-freq as in the Visscher Height paper (Nat Gen, Yang et al 2010).
-						REAL freq = mean_s[iSnp] / 2.0;
-						if (freq > .5)
-						{
-							freq = 1.0 - freq;
-						}
-
-						REAL rT = SUFFIX(BetaPdf)(freq, betaA, betaB);
-						//fprintf(stderr, "BetaPdf(%f,%f,%f)=%f\n",  freq, betaA, betaB, rT);
-						value *= rT;
+						value *= rT[iSnp];
 					}
 					else
 					{
 						value /= std[iSnp];        //unit variance as well
 					}
 				}
-				SNPs[rowStart + iSnp] = value;
+				row[(long long)iSnp * snpStride] = value;
 			}
 		}
 	}
 #endif
 }
 
+/*
+* Standardizes (Unit or Beta) the just-decoded SNP at position startpos of 'out', measuring its mean and standard deviation.
+* The stats layout is the same as ImputeAndZeroMeanSNPs's.
+*/
+void SUFFIX(StandardizeDecodedSNP)(REAL* out, uint64_t_ startpos, int iSnp, size_t nIndividuals, int outputNumSNPs, bool betaNotUnitVariance, REAL betaA, REAL betaB, REAL* stats, bool& seenSNC)
+{
+#ifdef ORDERF
+	SUFFIX(StandardizeSNP)(out + startpos, nIndividuals, 1, betaNotUnitVariance, betaA, betaB, true, false, stats[iSnp], stats[iSnp + outputNumSNPs], iSnp, seenSNC);
+#else
+	SUFFIX(StandardizeSNP)(out + startpos, nIndividuals, outputNumSNPs, betaNotUnitVariance, betaA, betaB, true, false, stats[iSnp * 2], stats[iSnp * 2 + 1], iSnp, seenSNC);
+#endif
+}
+
+#endif // REAL_IS_INT8
+
+const size_t SUFFIX(cbMaxRunRead) = 8 * 1024 * 1024;  // the most bytes read at once for a run of consecutive SNPs
+
 // wrapper to be used from cython
-void SUFFIX(readPlinkBedFile)(std::string bed_fn, int inputNumIndividuals, int inputNumSNPs, bool count_A1, std::vector<size_t> individuals_idx, std::vector<int> snpIdxList, REAL* out)
+// The requested SNPs are split into contiguous chunks, one chunk per thread. Each thread has its own file handle (and read buffer),
+// so threads never share a file position and each reads its chunk of the .bed file front to back.
+// Within a chunk, each run of consecutive SNP indexes (for example, from a slice) is read with one large read rather than one read per SNP.
+void SUFFIX(readPlinkBedFile)(std::string bed_fn, int inputNumIndividuals, int inputNumSNPs, bool count_A1, std::vector<size_t> individuals_idx, std::vector<int> snpIdxList, REAL* out, int num_threads, bool betaNotUnitVariance, REAL betaA, REAL betaB, REAL* stats)
 {
-	uint64_t_ N = inputNumIndividuals;
-	uint64_t_ outputNumSNPs = snpIdxList.size();
+#ifndef REAL_IS_INT8
+	bool seenSNC = false; //Keep track of this so that only one warning message is reported (int8 values are never standardized)
+#endif
+	int outputNumSNPs = (int)snpIdxList.size();
+	if (outputNumSNPs == 0 || inputNumIndividuals == 0) return;  // nothing to read
+	if (num_threads > outputNumSNPs) num_threads = outputNumSNPs;
+	if (num_threads < 1) num_threads = 1;
+
+#pragma omp parallel for num_threads(num_threads) schedule(static,1) if(num_threads > 1)
+	for (int iThread = 0; iThread < num_threads; iThread++)
+	{
+		int iStart = (int)(((long long)outputNumSNPs * iThread) / num_threads);
+		int iStop = (int)(((long long)outputNumSNPs * (iThread + 1)) / num_threads);
+
+		SUFFIX(CBedFile) bedFile;
+		bedFile.Open(bed_fn, inputNumIndividuals, inputNumSNPs);
+		size_t cbStride = bedFile.CbStride();
+		int maxRunLength = (int)std::max((size_t)1, SUFFIX(cbMaxRunRead) / std::max(cbStride, (size_t)1));
+		vector< BYTE > runBytes;
+
+		int i = iStart;
+		while (i < iStop)
+		{
+			int runLength = 1;
+			while (i + runLength < iStop && runLength < maxRunLength && snpIdxList[i + runLength] == snpIdxList[i] + runLength)
+			{
+				runLength++;
+			}
+
+			runBytes.resize(cbStride * runLength);
+			bedFile.ReadLines(&runBytes[0], snpIdxList[i], runLength);
+			for (int iRun = 0; iRun < runLength; iRun++)
+			{
+#ifdef ORDERF
+				uint64_t_ startpos = ((uint64_t_)(i + iRun)) * individuals_idx.size();
+#else
+				uint64_t_ startpos = ((uint64_t_)(i + iRun));
+#endif
+				SUFFIX(DecodeGenotypes)(&runBytes[cbStride * iRun], count_A1, individuals_idx, out, startpos, outputNumSNPs);
+#ifndef REAL_IS_INT8
+				if (stats != NULL) //standardize the SNP while its values are still in cache
+				{
+					SUFFIX(StandardizeDecodedSNP)(out, startpos, i + iRun, individuals_idx.size(), outputNumSNPs, betaNotUnitVariance, betaA, betaB, stats, seenSNC);
+				}
+#endif
+			}
+			i += runLength;
+		}
+	}
+}
 
-	SUFFIX(CBedFile) bedFile = SUFFIX(CBedFile)();
-	bedFile.Open(bed_fn, inputNumIndividuals, inputNumSNPs);
 
-	for (size_t i = 0; i != snpIdxList.size(); i++){
+// wrapper to be used from cython. 'bed_bytes' is an in-memory (for example, memory-mapped) copy of the SNP-major
+// lines that follow the three-byte .bed header, so no file reads are needed.
+void SUFFIX(readPlinkBedBytes)(const BYTE* bed_bytes, int inputNumIndividuals, int inputNumSNPs, bool count_A1, std::vector<size_t> individuals_idx, std::vector<int> snpIdxList, REAL* out, int num_threads, bool betaNotUnitVariance, REAL betaA, REAL betaB, REAL* stats)
+{
+#ifndef REAL_IS_INT8
+	bool seenSNC = false; //Keep track of this so that only one warning message is reported (int8 values are never standardized)
+#endif
+	uint64_t_ cbStride = ((uint64_t_)inputNumIndividuals + 3) / 4;  // 4 genotypes per byte so round up
+	int outputNumSNPs = (int)snpIdxList.size();
+	if (num_threads > outputNumSNPs) num_threads = outputNumSNPs;
+	if (num_threads < 1) num_threads = 1;
+
+#pragma omp parallel for num_threads(num_threads) schedule(static) if(num_threads > 1)
+	for (int i = 0; i < outputNumSNPs; i++){
 		int idx = snpIdxList[i];
 
 #ifdef ORDERF
@@ -587,7 +721,13 @@ void SUFFIX(readPlinkBedFile)(std::string bed_fn, int inputNumIndividuals, int i
 #else
 		uint64_t_ startpos = ((uint64_t_)i);
 #endif
-		bedFile.ReadGenotypes(idx, count_A1, individuals_idx, out, startpos, outputNumSNPs);
+		SUFFIX(DecodeGenotypes)(bed_bytes + cbStride * (uint64_t_)idx, count_A1, individuals_idx, out, startpos, outputNumSNPs);
+#ifndef REAL_IS_INT8
+		if (stats != NULL) //standardize the SNP while its values are still in cache
+		{
+			SUFFIX(StandardizeDecodedSNP)(out, startpos, i, individuals_idx.size(), outputNumSNPs, betaNotUnitVariance, betaA, betaB, stats, seenSNC);
+		}
+#endif
 	}
 }
 
@@ -649,7 +789,7 @@ void SUFFIX(writePlinkBedFile)(std::string bed_fn, int iid_count, int sid_count,
 					code = 2; //0b10 backwards on purpose
 				else if (val == 2)
 					code = twoCode;
-				else if (val != val) //So NaN
+				else if (val != val || val == SUFFIX(unknownOrMissing)) //So NaN (or, for int8, the missing value)
 					code = 1; //0b01 #backwards on purpose
 				else
 				{
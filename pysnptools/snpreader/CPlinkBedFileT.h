@@ -102,6 +102,9 @@ public:
    // read the data for one SNP (idxSnp) into the BYTE buffer pb
    size_t   ReadLine( BYTE *pb, size_t idxSnp );
 
+   // read the data for cSnpsToRead consecutive SNPs (starting at idxSnp) into the BYTE buffer pb with one read
+   size_t   ReadLines( BYTE *pb, size_t idxSnp, size_t cSnpsToRead );
+
    // read the genotype for all the individuals in 'list' at the SNP specified by iSNP
    void     ReadGenotypes(size_t iSnp, bool count_A1, const vector< size_t >& iIndividualList, REAL* pvOutSNP, uint64_t_ startpos, uint64_t_  outputNumSNPs);
 
@@ -113,7 +116,6 @@ private:
    string   filename;
    FILE     *pFile;
    vector< BYTE > rgBytes;
-   vector< BedGenotype > rgBedGenotypes;
    
    LayoutMode  layout;        // 0=RowMajor(all snps per individual together);
                               // 1=ColumnMajor(all individuals per SNP together in memory)
@@ -124,20 +126,30 @@ private:
    };
 
 
+// decode the genotype for all the individuals in 'list' from one SNP's line of .bed bytes
+void SUFFIX(DecodeGenotypes)(const BYTE* pb, bool count_A1, const vector< size_t >& idxIndividualList, REAL* pvOut, uint64_t_ startpos, uint64_t_  outputNumSNPs);
+
+#ifndef REAL_IS_INT8
 void SUFFIX(ImputeAndZeroMeanSNPs)( 
 	REAL *SNPs, 
 	const size_t nIndividuals, 
 	const size_t nSNPs, 
+	const long long indStride,
+	const long long snpStride,
 	const bool betaNotUnitVariance,
 	const REAL betaA,
 	const REAL betaB,
 	const bool apply_in_place,
 	const bool use_stats,
-	REAL *stats
+	REAL *stats,
+	int num_threads
    );
+#endif
 
 // to be used by cython wrapper
-void SUFFIX(readPlinkBedFile)(std::string bed_fn, int inputNumIndividuals, int inputNumSNPs, bool count_A1, std::vector<size_t> individuals_idx, std::vector<int> snpIdxList, REAL* out);
+// If 'stats' is given (float and double only), each SNP is also Unit (or Beta) standardized as soon as it is decoded and its mean and stddev are put in 'stats'.
+void SUFFIX(readPlinkBedFile)(std::string bed_fn, int inputNumIndividuals, int inputNumSNPs, bool count_A1, std::vector<size_t> individuals_idx, std::vector<int> snpIdxList, REAL* out, int num_threads, bool betaNotUnitVariance = false, REAL betaA = 1, REAL betaB = 1, REAL* stats = NULL);
+void SUFFIX(readPlinkBedBytes)(const BYTE* bed_bytes, int inputNumIndividuals, int inputNumSNPs, bool count_A1, std::vector<size_t> individuals_idx, std::vector<int> snpIdxList, REAL* out, int num_threads, bool betaNotUnitVariance = false, REAL betaA = 1, REAL betaB = 1, REAL* stats = NULL);
 void SUFFIX(writePlinkBedFile)(std::string bed_fn, int iid_count, int sid_count, bool count_A1, REAL* in);
 
 /*#endif      // CPlinkBedFile_h
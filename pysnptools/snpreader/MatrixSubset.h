@@ -163,6 +163,247 @@
 #define SUFFIX(NAME) NAME ## SingleCToSingleCAAA
 #include "MatrixSubsetT.h"
 
+// int8 (with -127 as the missing value) in or out
 
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT signed char
+#define ORDERFIN
+#define ORDERFOUT
+#define INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## Int8FToInt8FAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT signed char
+#define ORDERFIN
+#undef ORDERFOUT
+#define INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## Int8FToInt8CAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT float
+#define ORDERFIN
+#define ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8FToSingleFAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT float
+#define ORDERFIN
+#undef ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8FToSingleCAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT double
+#define ORDERFIN
+#define ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8FToDoubleFAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT double
+#define ORDERFIN
+#undef ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8FToDoubleCAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT signed char
+#undef ORDERFIN
+#define ORDERFOUT
+#define INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## Int8CToInt8FAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT signed char
+#undef ORDERFIN
+#undef ORDERFOUT
+#define INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## Int8CToInt8CAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT float
+#undef ORDERFIN
+#define ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8CToSingleFAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT float
+#undef ORDERFIN
+#undef ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8CToSingleCAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT double
+#undef ORDERFIN
+#define ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8CToDoubleFAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN signed char
+#define REALOUT double
+#undef ORDERFIN
+#undef ORDERFOUT
+#define INT8IN
+#undef INT8OUT
+#define SUFFIX(NAME) NAME ## Int8CToDoubleCAAA
+#include "MatrixSubsetT.h"
 
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN double
+#define REALOUT signed char
+#define ORDERFIN
+#define ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## DoubleFToInt8FAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN double
+#define REALOUT signed char
+#define ORDERFIN
+#undef ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## DoubleFToInt8CAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN double
+#define REALOUT signed char
+#undef ORDERFIN
+#define ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## DoubleCToInt8FAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN double
+#define REALOUT signed char
+#undef ORDERFIN
+#undef ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## DoubleCToInt8CAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN float
+#define REALOUT signed char
+#define ORDERFIN
+#define ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## SingleFToInt8FAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN float
+#define REALOUT signed char
+#define ORDERFIN
+#undef ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## SingleFToInt8CAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN float
+#define REALOUT signed char
+#undef ORDERFIN
+#define ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## SingleCToInt8FAAA
+#include "MatrixSubsetT.h"
+
+#undef REALIN
+#undef REALOUT
+#undef SUFFIX
+#define REALIN float
+#define REALOUT signed char
+#undef ORDERFIN
+#undef ORDERFOUT
+#undef INT8IN
+#define INT8OUT
+#define SUFFIX(NAME) NAME ## SingleCToInt8CAAA
+#include "MatrixSubsetT.h"
 
+#undef INT8IN
+#undef INT8OUT
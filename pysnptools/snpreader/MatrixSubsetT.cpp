@@ -3,9 +3,22 @@
 #include <stdio.h>
 #include <math.h> 
 #include <stdlib.h>
+#include <limits>
 
 using namespace std;
 
+// Converts one value from the input type to the output type. int8 has no NaN, so it represents missing values with -127.
+inline REALOUT SUFFIX(convertValue)(REALIN value)
+{
+#if defined(INT8IN) && !defined(INT8OUT)
+	return (value == -127) ? std::numeric_limits<REALOUT>::quiet_NaN() : (REALOUT)value;
+#elif !defined(INT8IN) && defined(INT8OUT)
+	return (value != value) ? (REALOUT)-127 : (REALOUT)value;
+#else
+	return (REALOUT)value;
+#endif
+}
+
 void SUFFIX(matrixSubset)(REALIN* in_, int in_iid_count, int in_sid_count, std::vector<size_t> iid_index, std::vector<int> sid_index, REALOUT* out)
 {
 	uint64_t_ out_iid_count = iid_index.size();
@@ -28,9 +41,9 @@ void SUFFIX(matrixSubset)(REALIN* in_, int in_iid_count, int in_sid_count, std::
 			size_t iid_index_in = iid_index[iid_index_out];
 
 #ifdef ORDERFOUT //fin,fout
-			out2[iid_index_out] = (REALOUT)in2[iid_index_in];
+			out2[iid_index_out] = SUFFIX(convertValue)(in2[iid_index_in]);
 #else            //fin,cout
-			out2[out_sid_count * (uint64_t_)iid_index_out] = (REALOUT)in2[iid_index_in];
+			out2[out_sid_count * (uint64_t_)iid_index_out] = SUFFIX(convertValue)(in2[iid_index_in]);
 #endif
 
 		}
@@ -53,9 +66,9 @@ void SUFFIX(matrixSubset)(REALIN* in_, int in_iid_count, int in_sid_count, std::
 			int sid_index_in = sid_index[sid_index_out];
 
 #ifdef ORDERFOUT //cin,fout
-			out2[out_iid_count * (uint64_t_)sid_index_out] = (REALOUT)in2[sid_index_in];
+			out2[out_iid_count * (uint64_t_)sid_index_out] = SUFFIX(convertValue)(in2[sid_index_in]);
 #else            //cin,cout
-			out2[sid_index_out] = (REALOUT)in2[sid_index_in];
+			out2[sid_index_out] = SUFFIX(convertValue)(in2[sid_index_in]);
 #endif
 		}
 	}
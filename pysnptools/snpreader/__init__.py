@@ -4,6 +4,7 @@
 from pysnptools.snpreader.bed import Bed
 from pysnptools.snpreader.snpreader import SnpReader
 from pysnptools.snpreader.snpdata import SnpData
+from pysnptools.snpreader.packedsnpdata import PackedSnpData
 from pysnptools.snpreader.ped import Ped
 from pysnptools.snpreader.dat import Dat
 from pysnptools.snpreader.snphdf5 import SnpHdf5
@@ -1,6 +1,52 @@
+import numpy as np
 from .snpreader import SnpReader
 from pysnptools.pstreader._subset import _PstSubset
 
 class _SnpSubset(_PstSubset,SnpReader):
     def __init__(self, *args, **kwargs):
         super(_SnpSubset, self).__init__(*args, **kwargs)
+
+class _SnpFilter(_SnpSubset):
+    '''
+    The sids of a SnpReader that pass minor allele frequency and missing-value filters. The first time that the sids (or values) are needed,
+    the statistics of all the SNPs are found in one pass, a block of SNPs at a time. The passing sids are then remembered.
+    '''
+    def __init__(self, internal, maf_min, missing_max, block_size, num_threads, index_file=None):
+        super(_SnpFilter, self).__init__(internal, slice(None), slice(None))
+        self._maf_min = maf_min
+        self._missing_max = missing_max
+        self._block_size = block_size
+        self._num_threads = num_threads
+        self._index_file = index_file
+
+    def __repr__(self):
+        return "{0}.filter(maf_min={1},missing_max={2})".format(self._internal,self._maf_min,self._missing_max)
+
+    @property
+    def row(self): #All iids are kept, so they are known without finding any statistics
+        return self._internal.row
+
+    @property
+    def row_property(self):
+        return self._internal.row_property
+
+    def run_once(self):
+        if self._ran_once:
+            return
+        self._col_indexer = self._passing_sid_index()
+        super(_SnpFilter, self).run_once()
+
+    def _passing_sid_index(self):
+        from pysnptools.standardizer.standardizer import Standardizer
+        iid_count = self._internal.iid_count
+        block_size = self._block_size or max(1, 8*1024*1024 // max(1,iid_count)) # by default, read about 8 million values at a time
+        keep = np.ones(self._internal.sid_count,dtype=bool)
+        for start, accumulator in Standardizer._stats_blocks([self._internal], block_size, None, self._num_threads, self._index_file):
+            stop = start+len(accumulator.count)
+            if self._maf_min is not None:
+                freq = accumulator.mean / 2.0
+                maf = np.minimum(freq, 1.0-freq)
+                keep[start:stop] &= (accumulator.count > 0) & (maf >= self._maf_min)
+            if self._missing_max is not None:
+                keep[start:stop] &= (iid_count - accumulator.count) <= self._missing_max * iid_count
+        return np.flatnonzero(keep)
@@ -8,6 +8,8 @@ from .snpdata import SnpData
 import math
 import warnings
 from pysnptools.pstreader import PstData
+from pysnptools.pstreader import PstReader
+from pysnptools.util import _get_num_threads, _int8_missing, create_directory_if_necessary
 
 PY3 = sys.version_info[0] == 3
 
@@ -27,6 +29,11 @@ class Bed(SnpReader):
     **Constructor:**
         :Parameters: * **filename** (*string*) -- The \*.bed file to read. The '.bed' suffix is optional. The related \*.bim and \*.fam files will also be read.
                      * **count_A1** (*bool*) -- Tells if it should count the number of A1 alleles (the PLINK standard) or the number of A2 alleles. False is the current default, but in the future the default will change to True.
+                     * **engine** (*string*) -- 'file' (default) or 'mmap'. With 'file', each read seeks and reads the '.bed' file one SNP at a time.
+                       With 'mmap', the '.bed' file is memory-mapped once per reader and genotypes are decoded straight from the mapped pages, so
+                       random SNP subsets need no per-SNP system calls and the operating system's page cache is shared across processes.
+                     * **metadata_cache** (*bool*) -- If True, the parsed '.fam' and '.bim' information is saved in binary files next to them ('.fam.npz' and '.bim.npz')
+                       and later readers load it from there, instead of re-parsing the text files. A cache file is used only if the size and modification time of its text file are unchanged. Defaults to False.
 
                      *The following options are never needed, but can be used to avoid reading large '.fam' and '.bim' files when their information is already known.*
 
@@ -38,11 +45,16 @@ class Bed(SnpReader):
     **Methods beyond** :class:`.SnpReader`
     '''
 
-    def __init__(self, filename, count_A1=None, iid=None, sid=None, pos=None, skip_format_check=False): #!!!document these new optionals. they are here
+    def __init__(self, filename, count_A1=None, iid=None, sid=None, pos=None, skip_format_check=False, engine='file', metadata_cache=False):
         super(Bed, self).__init__()
 
         self._ran_once = False
         self._file_pointer = None
+        self._mmap = None
+
+        assert engine in ['file','mmap'], "Expect engine to be 'file' or 'mmap'"
+        self.engine = engine
+        self.metadata_cache = metadata_cache
 
         self.filename = filename
         if count_A1 is None:
@@ -58,32 +70,78 @@ class Bed(SnpReader):
             self._col_property = PstData._fixup_input(pos,count=len(self._col),empty_creator=lambda count:np.array([[np.nan, np.nan, np.nan]]*count))
 
     def __repr__(self):
-        return "{0}('{1}',count_A1={2})".format(self.__class__.__name__,self.filename,self.count_A1)
+        s = "{0}('{1}',count_A1={2}".format(self.__class__.__name__,self.filename,self.count_A1)
+        if self.engine != 'file':
+            s += ",engine='{0}'".format(self.engine)
+        if self.metadata_cache:
+            s += ",metadata_cache=True"
+        s += ")"
+        return s
 
     @property
     def row(self):
         """*same as* :attr:`iid`
         """
         if not hasattr(self,"_row"):
-            self._row = SnpReader._read_fam(self.filename,remove_suffix="bed")
+            self._row = SnpReader._read_fam(self.filename,remove_suffix="bed",cache=self.metadata_cache)
+            self._assert_iid_sid_pos()
         return self._row
 
+    @property
+    def row_count(self):
+        """*same as* :attr:`iid_count`
+        """
+        if hasattr(self,"_row"):
+            return len(self._row)
+        if not hasattr(self,"_row_count"): #Count the lines of the .fam file rather than parse it
+            self._row_count = SnpReader._count_lines(SnpReader._name_of_other_file(self.filename,remove_suffix="bed", add_suffix="fam"))
+        return self._row_count
+
     @property
     def col(self):
         """*same as* :attr:`sid`
         """
         if not hasattr(self,"_col"):
-            self._col, self._col_property = SnpReader._read_map_or_bim(self.filename,remove_suffix="bed", add_suffix="bim")
+            self._read_bim()
         return self._col
 
+    @property
+    def col_count(self):
+        """*same as* :attr:`sid_count`
+        """
+        if hasattr(self,"_col"):
+            return len(self._col)
+        if not hasattr(self,"_col_count"): #Count the lines of the .bim file rather than parse it
+            self._col_count = SnpReader._count_lines(SnpReader._name_of_other_file(self.filename,remove_suffix="bed", add_suffix="bim"))
+        return self._col_count
+
     @property
     def col_property(self):
         """*same as* :attr:`pos`
         """
         if not hasattr(self,"_col_property"):
-            self._col, self._col_property = SnpReader._read_map_or_bim(self.filename,remove_suffix="bed", add_suffix="bim")
+            self._read_bim()
         return self._col_property
 
+    def _read_bim(self, want_sid=True, want_pos=True):
+        #Parse the .bim columns not yet loaded in one pass. By default, both sid and pos are parsed, because most uses need both.
+        #A caller that will only ever need one of them can say so and save parsing the other.
+        want_sid = want_sid and not hasattr(self,"_col")
+        want_pos = want_pos and not hasattr(self,"_col_property")
+        if not (want_sid or want_pos):
+            return
+        sid, pos = SnpReader._read_map_or_bim(self.filename,remove_suffix="bed", add_suffix="bim",cache=self.metadata_cache,want_sid=want_sid,want_pos=want_pos)
+        if pos is not None and not hasattr(self,"_col_property"):
+            self._col_property = pos
+        if sid is not None and not hasattr(self,"_col"):
+            self._col = sid
+            self._assert_iid_sid_pos()
+
+    def _assert_iid_sid_pos(self):
+        #The .fam and .bim files are loaded separately, so check them once both are loaded
+        if hasattr(self,"_row") and hasattr(self,"_col"):
+            super(Bed, self)._assert_iid_sid_pos()
+
     def _open_bed(self):
         bedfile = SnpReader._name_of_other_file(self.filename,"bed","bed")
         self._filepointer = open(bedfile, "rb")
@@ -96,18 +154,32 @@ class Bed(SnpReader):
         self.__del__()
         self.file_pointer = None
 
+    def _map_bed(self):
+        '''
+        Memory-maps the .bed file (once per reader) and returns a 1-D uint8 view of the SNP-major bytes that follow the header.
+        '''
+        if self._mmap is None:
+            bedfile = SnpReader._name_of_other_file(self.filename,"bed","bed")
+            mmap = np.memmap(bedfile, dtype=np.uint8, mode='r')
+            if len(mmap) < 3 or mmap[0] != 0b01101100 or mmap[1] != 0b00011011: raise Exception('No valid binary BED file')
+            if mmap[2] != 0b00000001: raise Exception('only SNP-major is implemented')
+            expected_size = 3 + int(np.ceil(0.25*self.iid_count))*self.sid_count
+            if len(mmap) != expected_size: raise Exception("Expect bed file '{0}' to be {1} bytes long, but it is {2}".format(bedfile,expected_size,len(mmap)))
+            logging.info("bed file is memory-mapped {0}".format(bedfile))
+            self._mmap = mmap[3:]
+        return self._mmap
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_mmap'] = None #A memory map is never pickled. It will be re-created if needed.
+        return state
+
     def _run_once(self):
         if self._ran_once:
             return
         self._ran_once = True
 
-        if not hasattr(self,"_row"):
-            self._row = SnpReader._read_fam(self.filename,remove_suffix="bed")
-
-        if not hasattr(self,"_col") or not hasattr(self,"_col_property"):
-            self._col, self._col_property = SnpReader._read_map_or_bim(self.filename,remove_suffix="bed", add_suffix="bim")
-        self._assert_iid_sid_pos()
-
+        #The .fam and .bim files are only read when their information is needed. Reading values needs just iid_count and sid_count.
         if not self.skip_format_check:
             self._open_bed()
             self._close_bed()
@@ -125,21 +197,30 @@ class Bed(SnpReader):
 
 
     @staticmethod
-    def write(filename, snpdata, count_A1=False, force_python_only=False):
-        """Writes a :class:`SnpData` to Bed format.
+    def write(filename, snpdata, count_A1=False, force_python_only=False, block_size=None):
+        """Writes a :class:`SnpData` (or any other :class:`.SnpReader`) to Bed format.
 
         :param filename: the name of the file to create
         :type filename: string
-        :param snpdata: The in-memory data that should be written to disk.
-        :type snpdata: :class:`SnpData`
+        :param snpdata: The data that should be written to disk. A :class:`.PackedSnpData` is written with a byte copy, without decoding.
+            Any other :class:`.SnpReader`, for example, a :class:`.SnpHdf5`, is read, encoded, and written a block of SNPs at a time.
+        :type snpdata: :class:`SnpData` or any :class:`.SnpReader`
         :param count_A1: Tells if it should count the number of A1 alleles (the PLINK standard) or the number of A2 alleles. False is the current default, but in the future the default will change to True.
         :type count_A1: bool
+        :param block_size: optional -- The number of SNPs to read and write at a time. Defaults to None, meaning that a :class:`SnpData` is written all at once
+            and any other :class:`.SnpReader` is written in blocks of about eight million values.
+        :type block_size: int or None
 
-        >>> from pysnptools.snpreader import Pheno, Bed
+        >>> from pysnptools.snpreader import Dense, Bed
         >>> import pysnptools.util as pstutil
+        >>> snpreader = Dense('../examples/toydata100.dense.txt')
+        >>> pstutil.create_directory_if_necessary("tempdir/toydata100.bed")
+        >>> Bed.write("tempdir/toydata100.bed",snpreader,count_A1=False,block_size=10) # reads and writes 10 SNPs at a time
+        >>> print(Bed("tempdir/toydata100.bed",count_A1=False).sid_count)
+        100
         """
 
-        if isinstance(filename,SnpData) and isinstance(snpdata,str): #For backwards compatibility, reverse inputs if necessary
+        if isinstance(filename,SnpReader) and isinstance(snpdata,str): #For backwards compatibility, reverse inputs if necessary
             warnings.warn("write statement should have filename before data to write", DeprecationWarning)
             filename, snpdata = snpdata, filename
 
@@ -152,8 +233,29 @@ class Bed(SnpReader):
 
         bedfile = SnpReader._name_of_other_file(filename,remove_suffix="bed", add_suffix="bed")
 
-        if not force_python_only:
+        from pysnptools.snpreader.packedsnpdata import PackedSnpData
+        if isinstance(snpdata, PackedSnpData): # The values are already in .bed format, so just copy the bytes
+            with open(bedfile,"wb") as bed_filepointer:
+                bed_filepointer.write(bytearray([0b01101100,0b00011011,0b00000001])) #magic numbers and snp major
+                bed_filepointer.write(snpdata._packed_for(count_A1).tobytes())
+
+        elif not isinstance(snpdata, SnpData) or block_size is not None or force_python_only: # Read (if needed), encode, and write a block of SNPs at a time
+            if block_size is None:
+                block_size = max(1, Bed._python_block_values // max(1, snpdata.iid_count))
+            with open(bedfile,"wb") as bed_filepointer:
+                #see http://pngu.mgh.harvard.edu/~purcell/plink/binary.shtml
+                bed_filepointer.write(bytearray([0b01101100,0b00011011,0b00000001])) #magic numbers and snp major
+                for start in range(0, snpdata.sid_count, block_size):
+                    logging.info("Writing snps # {0} to {1} to file '{2}'".format(start, min(start+block_size,snpdata.sid_count), filename))
+                    if isinstance(snpdata, SnpData):
+                        val = snpdata.val[:,start:start+block_size]
+                    else:
+                        val = snpdata[:,start:start+block_size].read(order='F',view_ok=True).val
+                    bed_filepointer.write(Bed._encode(val, count_A1).tobytes())
+
+        else:
             from pysnptools.snpreader import wrap_plink_parser
+            bed_fn = _encode(bedfile)
 
             if snpdata.val.flags["C_CONTIGUOUS"]:
                 order = "C"
@@ -164,57 +266,374 @@ class Bed(SnpReader):
 
             if snpdata.val.dtype == np.float64:
                 if order=="F":
-                    wrap_plink_parser.writePlinkBedFile2doubleFAAA(bedfile, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
+                    wrap_plink_parser.writePlinkBedFile2doubleFAAA(bed_fn, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
                 else:
-                    wrap_plink_parser.writePlinkBedFile2doubleCAAA(bedfile, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
+                    wrap_plink_parser.writePlinkBedFile2doubleCAAA(bed_fn, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
             elif snpdata.val.dtype == np.float32:
                 if order=="F":
-                    wrap_plink_parser.writePlinkBedFile2floatFAAA(bedfile, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
+                    wrap_plink_parser.writePlinkBedFile2floatFAAA(bed_fn, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
                 else:
-                    wrap_plink_parser.writePlinkBedFile2floatCAAA(bedfile, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
+                    wrap_plink_parser.writePlinkBedFile2floatCAAA(bed_fn, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
+            elif snpdata.val.dtype == np.int8:
+                if order=="F":
+                    wrap_plink_parser.writePlinkBedFile2int8FAAA(bed_fn, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
+                else:
+                    wrap_plink_parser.writePlinkBedFile2int8CAAA(bed_fn, snpdata.iid_count, snpdata.sid_count, count_A1, snpdata.val)
             else:
-                raise Exception("dtype '{0}' not known, only float64 and float32".format(snpdata.val.dtype))
+                raise Exception("dtype '{0}' not known, only float64, float32, and int8".format(snpdata.val.dtype))
 
+        logging.info("Done writing " + filename)
+
+    def read_packed(self):
+        """Reads all the SNP values into memory, keeping them in the 2-bit '.bed' encoding, and returns a :class:`.PackedSnpData`.
+        This uses one quarter of the memory of reading with dtype int8. The values are decoded later, when :meth:`.SnpReader.read` is called on the result.
+
+        :rtype: :class:`.PackedSnpData`
+
+        >>> from pysnptools.snpreader import Bed
+        >>> packedsnpdata = Bed('../examples/toydata',count_A1=False).read_packed()
+        >>> print(packedsnpdata.packed.shape)
+        (10000, 125)
+        >>> print(packedsnpdata[:,[100]].read().val[4,0])
+        1.0
+        """
+        from pysnptools.snpreader.packedsnpdata import PackedSnpData
+        self._run_once()
+        nbyte = int(np.ceil(0.25*self.iid_count))
+        if self.engine == 'mmap':
+            packed = np.array(self._map_bed().reshape(self.sid_count, nbyte))
         else:
-            if not count_A1:
-                zero_code = 0b00
-                two_code = 0b11
-            else:
-                zero_code = 0b11
-                two_code = 0b00
+            self._open_bed()
+            packed = np.frombuffer(self._filepointer.read(nbyte*self.sid_count),dtype=np.uint8).reshape(self.sid_count, nbyte).copy()
+            self._close_bed()
+        return PackedSnpData(iid=self.iid, sid=self.sid, packed=packed, count_A1=self.count_A1, pos=self.pos, name=str(self))
+
+    def genotype_counts(self, iid_index=None, block_size=None, index_file=None):
+        """Counts, for each SNP, how many iids have each genotype. The counts come straight from the 2-bit '.bed' codes,
+        a byte (four genotypes) at a time, so no SNP values are decoded. Allele frequencies, missing rates, and the mean and stddev of each SNP
+        all follow from the counts.
+
+        :param iid_index: optional, the iids to count (default: all). Anything that can be given to brackets, for example, a list of indexes or a slice.
+        :type iid_index: list of int, slice, or None
+
+        :param block_size: optional, how many SNPs to count at a time. The default (None) picks a size from the number of iids.
+        :type block_size: int or None
+
+        :param index_file: optional, the name of a sidecar file in which to keep the counts of all iids. If the file was made from the
+            current '.bed' file (same size and modification time), the counts are read from it. Otherwise (or if it can't be read), they are counted and then saved to it.
+            The file is written under a temporary name and then renamed over any old file in one atomic step, so other processes see either the old file or
+            the complete new one (Python 2 on Windows can't rename over a file, so there the old file is removed first). :meth:`.Unit.train`, :meth:`.Beta.train`, and
+            :meth:`.SnpReader.filter` can also use the file.
+        :type index_file: string or None
+
+        :rtype: ndarray of int64, sid_count x 4. The columns are the number of iids with value 0, value 1, value 2 (following :attr:`count_A1`), and a missing value.
+
+        >>> from pysnptools.snpreader import Bed
+        >>> counts = Bed('../examples/toydata',count_A1=False).genotype_counts()
+        >>> print(counts[:2])
+        [[ 79 236 185   0]
+         [ 17 142 341   0]]
+        >>> maf = (counts[:,1] + 2*counts[:,2]) / (2.0 * counts[:,:3].sum(axis=1))
+        >>> maf = np.minimum(maf, 1-maf)
+        >>> print(round(maf[0],3))
+        0.394
+        """
+        self._run_once()
+        iid_indexer = PstReader._make_sparray_or_slice(iid_index)
+        iid_index_or_none = None if PstReader._is_all_slice(iid_indexer) else np.arange(self.iid_count)[iid_indexer]
+
+        def count_codes():
+            code_counts = np.empty([self.sid_count,4],dtype=np.int64)
+            nbyte = int(np.ceil(0.25*self.iid_count))
+            step = block_size or max(1, Bed._python_block_values // max(1, nbyte*4))
+            for start in range(0, self.sid_count, step):
+                sid_block = np.arange(start, min(start+step,self.sid_count))
+                code_counts[start:start+len(sid_block),:] = Bed._code_counts(self._packed_rows(sid_block), iid_index_or_none, self.iid_count)
+            return (code_counts,)
+
+        if index_file is None:
+            code_counts, = count_codes()
+        else:
+            assert iid_index_or_none is None, "An index_file holds the counts of all iids, so it can't be used with iid_index"
+            create_directory_if_necessary(index_file)
+            bed_filename = SnpReader._name_of_other_file(self.filename,"bed","bed")
+            code_counts, = SnpReader._read_with_cache(bed_filename, count_codes, ["code_counts"], cachefile=index_file, key=(self.iid_count,self.sid_count))
+        return Bed._value_counts(code_counts, self.count_A1)
 
-            with open(bedfile,"wb") as bed_filepointer:
-                #see http://pngu.mgh.harvard.edu/~purcell/plink/binary.shtml
-                bed_filepointer.write(chr(0b01101100)) #magic numbers
-                bed_filepointer.write(chr(0b00011011)) #magic numbers
-                bed_filepointer.write(chr(0b00000001)) #snp major
-
-                for sid_index in range(snpdata.sid_count):
-                    if sid_index % 1 == 0:
-                        logging.info("Writing snp # {0} to file '{1}'".format(sid_index, filename))
-
-                    col = snpdata.val[:, sid_index]
-                    for iid_by_four in range(0,snpdata.iid_count,4):
-                        vals_for_this_byte = col[iid_by_four:iid_by_four+4]
-                        byte = 0b00000000
-                        for val_index in range(len(vals_for_this_byte)):
-                            val = vals_for_this_byte[val_index]
-                            if val == 0:
-                                code = zero_code
-                            elif val == 1:
-                                code = 0b10 #backwards on purpose
-                            elif val == 2:
-                                code = two_code
-                            elif np.isnan(val):
-                                code = 0b01 #backwards on purpose
-                            else:
-                                raise Exception("Can't convert value '{0}' to BED format (only 0,1,2,NAN allowed)".format(val))
-                            byte |= (code << (val_index*2))
-                        bed_filepointer.write(chr(byte))
+    @staticmethod
+    def write_subset(filename, snpreader, count_A1=None):
+        """Writes a :class:`.Bed`, a :class:`.PackedSnpData`, or a subset of either, to Bed format without decoding any SNP values.
+        When the iids are unchanged, each SNP's bytes are copied as is. Otherwise, the 2-bit codes of the wanted iids are repacked.
+        The SNPs are streamed in blocks, so memory use does not grow with the size of the data.
+
+        :param filename: the name of the file to create
+        :type filename: string
+        :param snpreader: The data to write, for example, bed[iid_index,sid_index].
+        :type snpreader: :class:`.Bed`, :class:`.PackedSnpData`, or a subset of either
+        :param count_A1: Tells if the new file should count the number of A1 alleles (the PLINK standard) or the number of A2 alleles. Defaults to the count_A1 of the input, which makes the copy byte-for-byte.
+        :type count_A1: bool
+
+        >>> from pysnptools.snpreader import Bed
+        >>> import pysnptools.util as pstutil
+        >>> bed = Bed('../examples/toydata',count_A1=False)
+        >>> pstutil.create_directory_if_necessary("tempdir/toydata.subset.bed")
+        >>> Bed.write_subset("tempdir/toydata.subset.bed",bed[::2,-100:])
+        >>> print(Bed("tempdir/toydata.subset.bed",count_A1=False).read().val.shape)
+        (250, 100)
+        """
+        packed_source = Bed._packed_source(snpreader)
+        if packed_source is None:
+            raise Exception("Expect snpreader to be a Bed, a PackedSnpData, or a subset of one. Use 'Bed.write(filename,snpreader.read())' instead.")
+        source, iid_index_or_none, sid_index_or_none = packed_source
+        if count_A1 is None:
+            count_A1 = source.count_A1
+        if iid_index_or_none is not None and np.array_equal(iid_index_or_none, np.arange(source.iid_count)):
+            iid_index_or_none = None
+        sid_index = np.arange(source.sid_count) if sid_index_or_none is None else np.asarray(sid_index_or_none,dtype=np.intp)
+
+        SnpReader._write_fam(snpreader, filename, remove_suffix="bed")
+        SnpReader._write_map_or_bim(snpreader, filename, remove_suffix="bed", add_suffix="bim")
+
+        bedfile = SnpReader._name_of_other_file(filename,remove_suffix="bed", add_suffix="bed")
+        block_size = max(1, Bed._python_block_values // max(1, int(np.ceil(0.25*source.iid_count)))) # copy about this many SNPs at a time
+        with open(bedfile,"wb") as bed_filepointer:
+            bed_filepointer.write(bytearray([0b01101100,0b00011011,0b00000001])) #magic numbers and snp major
+            for start in range(0, len(sid_index), block_size):
+                packed = source._packed_rows(sid_index[start:start+block_size])
+                if iid_index_or_none is not None:
+                    packed = Bed._repack(packed, iid_index_or_none)
+                if count_A1 != source.count_A1:
+                    packed = Bed._swap_homozygous_codes(packed)
+                bed_filepointer.write(np.ascontiguousarray(packed).tobytes())
         logging.info("Done writing " + filename)
 
-    def _read(self, iid_index_or_none, sid_index_or_none, order, dtype, force_python_only, view_ok):
+    @staticmethod
+    def _encode(val, count_A1):
+        '''
+        Encodes a block of SNP values (iid x SNP, 0, 1, 2, or missing) into .bed bytes, one row of bytes per SNP.
+        '''
+        if not count_A1:
+            zero_code = 0b00
+            two_code = 0b11
+        else:
+            zero_code = 0b11
+            two_code = 0b00
+
+        iid_count, sid_count = val.shape
+        nbyte = int(np.ceil(0.25*iid_count))
+        codes = np.zeros((sid_count, nbyte*4), dtype=np.uint8) # the padding at the end of each SNP's bytes is 0b00
+        codes[:,:iid_count] = 0b01 #backwards on purpose. Missing is the default.
+        val = val.T
+        is_missing = (val == _int8_missing) if val.dtype == np.int8 else (val != val)
+        is_ok = is_missing.copy()
+        for value, code in [(0,zero_code),(1,0b10),(2,two_code)]: #1 is backwards on purpose
+            is_value = (val == value)
+            codes[:,:iid_count][is_value] = code
+            is_ok |= is_value
+        if not is_ok.all():
+            bad_value = val[~is_ok][0]
+            raise Exception("Can't convert value '{0}' to BED format (only 0,1,2,NAN allowed (-127 for int8))".format(bad_value))
+        codes = codes.reshape(sid_count, nbyte, 4)
+        return codes[:,:,0] | (codes[:,:,1] << 2) | (codes[:,:,2] << 4) | (codes[:,:,3] << 6)
+
+    @staticmethod
+    def _repack(packed, iid_index):
+        '''
+        Given .bed bytes (one row of bytes per SNP), returns new .bed bytes for just the iids in iid_index (in that order), without decoding.
+        '''
+        iid_index = np.asarray(iid_index,dtype=np.intp)
+        nbyte_out = int(np.ceil(0.25*len(iid_index)))
+        byte_index = iid_index >> 2
+        shift = ((iid_index & 3) * 2).astype(np.uint8)
+        repacked = np.zeros((packed.shape[0], nbyte_out), dtype=np.uint8)
+        block_size = max(1, Bed._python_block_values // max(1, nbyte_out*4)) # repack this many SNPs at a time
+        for start in range(0, packed.shape[0], block_size):
+            codes = np.zeros((min(block_size, packed.shape[0]-start), nbyte_out*4), dtype=np.uint8)
+            codes[:,:len(iid_index)] = (packed[start:start+block_size,byte_index] >> shift) & 3
+            codes = codes.reshape(codes.shape[0], nbyte_out, 4)
+            repacked[start:start+block_size,:] = codes[:,:,0] | (codes[:,:,1] << 2) | (codes[:,:,2] << 4) | (codes[:,:,3] << 6)
+        return repacked
+
+    _swap_lut = None
+
+    @staticmethod
+    def _swap_homozygous_codes(packed):
+        '''
+        Returns .bed bytes with the two homozygous codes (0b00 and 0b11) swapped, which changes count_A1. The missing and heterozygous codes are unchanged.
+        '''
+        if Bed._swap_lut is None:
+            codes = (np.arange(256)[:,np.newaxis] >> (2*np.arange(4))) & 3
+            codes = np.where((codes == 0b00) | (codes == 0b11), 3 - codes, codes)
+            Bed._swap_lut = (codes << (2*np.arange(4))).sum(axis=1).astype(np.uint8)
+        return Bed._swap_lut[packed]
+
+    _python_block_values = 8*1024*1024 # The pure python reader decodes blocks of SNPs of up to about this many values.
+    _byte_to_genotypes_cache = {}
+
+    @staticmethod
+    def _byte_to_genotypes(count_A1, dtype):
+        '''
+        Returns a 256 x 4 lookup table that maps each possible .bed byte to the values of its four genotypes (lowest bits first).
+        '''
+        key = (count_A1, np.dtype(dtype))
+        lut = Bed._byte_to_genotypes_cache.get(key)
+        if lut is None:
+            missing = _int8_missing if np.dtype(dtype) == np.int8 else np.nan
+            if count_A1:
+                code_to_value = np.array([2, missing, 1, 0], dtype=dtype)
+            else:
+                code_to_value = np.array([0, missing, 1, 2], dtype=dtype)
+            codes = (np.arange(256)[:,np.newaxis] >> (2*np.arange(4))) & 3
+            lut = code_to_value[codes]
+            Bed._byte_to_genotypes_cache[key] = lut
+        return lut
+
+    @staticmethod
+    def _consecutive_runs(sid_index):
+        '''
+        Returns a list of (start,stop) pairs, one for each run of consecutive values in sid_index. For example, [5,6,7,2,3,9] gives [(0,3),(3,5),(5,6)].
+        '''
+        sid_index = np.asarray(sid_index)
+        if len(sid_index) == 0:
+            return []
+        breaks = list(np.flatnonzero(np.diff(sid_index) != 1) + 1)
+        return list(zip([0]+breaks, breaks+[len(sid_index)]))
+
+    @staticmethod
+    def _decode_bytes(byte_block, count_A1, iid_index, out):
+        '''
+        Decodes a block of .bed bytes (one row of bytes per SNP) into 'out' (iid x SNP), keeping only the iids in 'iid_index'.
+        '''
+        lut = Bed._byte_to_genotypes(count_A1, out.dtype)
+        decoded = lut[byte_block].reshape(byte_block.shape[0], byte_block.shape[1]*4) # SNP x iid, including any padding iids at the end
+        out[:,:] = decoded[:,iid_index].T
+
+    @staticmethod
+    def _packed_source(snpreader):
+        '''
+        If snpreader is a Bed, a PackedSnpData, or a (possibly nested) subset of one, returns (source, iid_index_or_none, sid_index_or_none),
+        where 'source' has a '_packed_rows' method and the indexes are into 'source'. Otherwise, returns None.
+        '''
+        from pysnptools.snpreader._subset import _SnpSubset
+        iid_index_or_none, sid_index_or_none = None, None
+        while isinstance(snpreader, _SnpSubset):
+            snpreader.run_once()
+            internal = snpreader._internal
+            iid_index_or_none = _SnpSubset.compose_indexer_with_index_or_none(internal.iid_count, snpreader._row_indexer, snpreader.iid_count, iid_index_or_none)
+            sid_index_or_none = _SnpSubset.compose_indexer_with_index_or_none(internal.sid_count, snpreader._col_indexer, snpreader.sid_count, sid_index_or_none)
+            snpreader = internal
+        if not hasattr(snpreader, '_packed_rows'):
+            return None
+        return snpreader, iid_index_or_none, sid_index_or_none
+
+    _codes_lut = (np.arange(256,dtype=np.uint8)[:,np.newaxis] >> (2*np.arange(4,dtype=np.uint8))) & 3 # byte to its four 2-bit codes
+    _code_counts_lut = (_codes_lut[:,:,np.newaxis] == np.arange(4)).sum(axis=1) # byte to the number of times each code appears in it
+
+    @staticmethod
+    def _code_counts(packed, iid_index_or_none, iid_count_in):
+        '''
+        Given one row of .bed bytes per SNP, returns (SNP x 4) the number of times that each 2-bit code appears among the wanted iids.
+        With all iids, this works on whole bytes (via a histogram of byte values), never on individual codes.
+        '''
+        row = np.arange(packed.shape[0],dtype=np.intp)[:,np.newaxis]
+        if iid_index_or_none is None:
+            byte_hist = np.bincount((packed + 256*row).ravel(), minlength=256*packed.shape[0]).reshape(packed.shape[0],256)
+            counts = byte_hist.dot(Bed._code_counts_lut)
+            counts[:,0] -= int(np.ceil(0.25*iid_count_in))*4 - iid_count_in # the unused codes (always 0b00) at the end of each SNP's bytes
+        else:
+            codes = Bed._codes_lut[packed].reshape(packed.shape[0],-1)[:,iid_index_or_none]
+            counts = np.bincount((codes + 4*row).ravel(), minlength=4*packed.shape[0]).reshape(packed.shape[0],4)
+        return counts.astype(np.int64)
+
+    @staticmethod
+    def _value_counts(code_counts, count_A1):
+        '''
+        Reorders the columns of code counts to be the counts of value 0, 1, 2, and missing.
+        '''
+        return code_counts[:,[3,2,0,1] if count_A1 else [0,2,3,1]]
+
+    @staticmethod
+    def _read_standardized(snpreader, standardizer, dtype, num_threads=None):
+        '''
+        If snpreader is a Bed, a PackedSnpData, or a subset of one, reads it with Unit or Beta standardization done by the C++ reader.
+        Each SNP is standardized as soon as it is decoded (while its values are still in cache), so the values are not passed over a second time.
+        Returns (snpdata, trained_standardizer) or, if snpreader is not of that kind, None.
+        '''
+        import pysnptools.standardizer as stdizer
+        from pysnptools.snpreader import SnpData
+        assert type(standardizer) in (stdizer.Unit, stdizer.Beta) and dtype in (np.float64, np.float32), "Expect Unit or Beta standardization of float values"
+        packed_source = Bed._packed_source(snpreader)
+        if packed_source is None:
+            return None
+        source, iid_index_or_none, sid_index_or_none = packed_source
+
+        order = 'F' # Each SNP's values are together, so the decoder and standardizer both work on contiguous memory
+        is_beta = isinstance(standardizer,stdizer.Beta)
+        stats = np.empty([snpreader.sid_count,2],dtype=dtype,order=order) # The layout that the C++ standardizer expects
+        standardize = {'stats':stats, 'betaNotUnitVariance':is_beta, 'betaA':standardizer.a if is_beta else 1, 'betaB':standardizer.b if is_beta else 1}
+        val = source._read(iid_index_or_none, sid_index_or_none, order, dtype, False, False, num_threads, standardize=standardize)
+
+        snpdata = SnpData(iid=snpreader.iid,sid=snpreader.sid,val=val,pos=snpreader.pos,name=str(snpreader))
+        if is_beta:
+            return snpdata, stdizer.BetaTrained(standardizer.a,standardizer.b,snpdata.sid,stats)
+        else:
+            return snpdata, stdizer.UnitTrained(snpdata.sid,stats)
+
+    @staticmethod
+    def _read_bed_bytes(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, order, dtype, num_threads=None, **standardize):
+        '''
+        Decodes the wanted iids and SNPs from in-memory, SNP-major .bed bytes (without the 3-byte header) with the C++ reader.
+        Any 'standardize' keyword arguments (float and double only) are passed to the C++ reader, so that it also standardizes each SNP as it is decoded.
+        '''
+        from pysnptools.snpreader import wrap_plink_parser
+        val = np.zeros((len(iid_index_out), len(sid_index_out)), order=order, dtype=dtype)
+        num_threads = _get_num_threads(num_threads)
+
+        if dtype == np.float64:
+            if order=="F":
+                wrap_plink_parser.readPlinkBedBytes2doubleFAAA(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
+            elif order=="C":
+                wrap_plink_parser.readPlinkBedBytes2doubleCAAA(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
+            else:
+                raise Exception("order '{0}' not known, only 'F' and 'C'".format(order));
+        elif dtype == np.float32:
+            if order=="F":
+                wrap_plink_parser.readPlinkBedBytes2floatFAAA(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
+            elif order=="C":
+                wrap_plink_parser.readPlinkBedBytes2floatCAAA(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
+            else:
+                raise Exception("order '{0}' not known, only 'F' and 'C'".format(order));
+        elif dtype == np.int8:
+            if order=="F":
+                wrap_plink_parser.readPlinkBedBytes2int8FAAA(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, val, num_threads)
+            elif order=="C":
+                wrap_plink_parser.readPlinkBedBytes2int8CAAA(bed_bytes, iid_count_in, sid_count_in, count_A1, iid_index_out, sid_index_out, val, num_threads)
+            else:
+                raise Exception("order '{0}' not known, only 'F' and 'C'".format(order));
+        else:
+            raise Exception("dtype '{0}' not known, only float64, float32, and int8".format(dtype))
+        return val
+
+    def _packed_rows(self, sid_index):
+        '''
+        Returns the .bed bytes of the given SNPs (one row of bytes per SNP, for all iids). Runs of consecutive SNPs are read from the file with one read.
+        '''
+        nbyte = int(np.ceil(0.25*self.iid_count))
+        if self.engine == 'mmap':
+            return self._map_bed().reshape(self.sid_count, nbyte)[sid_index,:]
+        packed = np.empty((len(sid_index), nbyte), dtype=np.uint8)
+        self._open_bed()
+        for run_start, run_stop in Bed._consecutive_runs(sid_index):
+            self._filepointer.seek(nbyte*sid_index[run_start]+3)
+            packed[run_start:run_stop,:] = np.frombuffer(self._filepointer.read(nbyte*(run_stop-run_start)),dtype=np.uint8).reshape(run_stop-run_start,nbyte)
+        self._close_bed()
+        return packed
+
+    def _read(self, iid_index_or_none, sid_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None, standardize=None):
+        #If given, 'standardize' holds the keyword arguments (stats, betaNotUnitVariance, betaA, betaB) that tell the C++ reader to also standardize each SNP as it is decoded.
         self._run_once()
+        assert standardize is None or (not force_python_only and dtype in (np.float64, np.float32)), "Only the C++ reader can standardize float values as they are decoded"
+        standardize = standardize or {}
 
         if order=='A':
             order='F'
@@ -238,73 +657,49 @@ class Bed(SnpReader):
             sid_count_out = sid_count_in
             sid_index_out = list(range(sid_count_in))
 
-        if not force_python_only:
+        if not force_python_only and self.engine == 'mmap':
+            val = Bed._read_bed_bytes(self._map_bed(), iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, order, dtype, num_threads, **standardize)
+
+        elif not force_python_only:
             from pysnptools.snpreader import wrap_plink_parser
             val = np.zeros((iid_count_out, sid_count_out), order=order, dtype=dtype)
             bed_fn = _encode(SnpReader._name_of_other_file(self.filename,"bed","bed"))
+            num_threads = _get_num_threads(num_threads)
 
             if dtype == np.float64:
                 if order=="F":
-                    wrap_plink_parser.readPlinkBedFile2doubleFAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val)
+                    wrap_plink_parser.readPlinkBedFile2doubleFAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
                 elif order=="C":
-                    wrap_plink_parser.readPlinkBedFile2doubleCAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val)
+                    wrap_plink_parser.readPlinkBedFile2doubleCAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
                 else:
                     raise Exception("order '{0}' not known, only 'F' and 'C'".format(order));
             elif dtype == np.float32:
                 if order=="F":
-                    wrap_plink_parser.readPlinkBedFile2floatFAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val)
+                    wrap_plink_parser.readPlinkBedFile2floatFAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
+                elif order=="C":
+                    wrap_plink_parser.readPlinkBedFile2floatCAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val, num_threads, **standardize)
+                else:
+                    raise Exception("order '{0}' not known, only 'F' and 'C'".format(order));
+            elif dtype == np.int8:
+                if order=="F":
+                    wrap_plink_parser.readPlinkBedFile2int8FAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val, num_threads)
                 elif order=="C":
-                    wrap_plink_parser.readPlinkBedFile2floatCAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val)
+                    wrap_plink_parser.readPlinkBedFile2int8CAAA(bed_fn, iid_count_in, sid_count_in, self.count_A1, iid_index_out, sid_index_out, val, num_threads)
                 else:
                     raise Exception("order '{0}' not known, only 'F' and 'C'".format(order));
             else:
-                raise Exception("dtype '{0}' not known, only float64 and float32".format(dtype))
+                raise Exception("dtype '{0}' not known, only float64, float32, and int8".format(dtype))
 
         else:
-            if not self.count_A1:
-                byteZero = 0
-                byteThree = 2
-            else:
-                byteZero = 2
-                byteThree = 0
-            # An earlier version of this code had a way to read consecutive SNPs of code in one read. May want
-            # to add that ability back to the code.
-            # Also, note that reading with python will often result in non-contiguous memory, so the python standardizers will automatically be used, too.
-            self._open_bed()
+            # Note that reading with python will often result in non-contiguous memory, so the python standardizers will automatically be used, too.
             logging.warn("using pure python plink parser (might be much slower!!)")
-            val = np.zeros(((int(np.ceil(0.25*iid_count_in))*4),sid_count_out),order=order, dtype=dtype) #allocate it a little big
-            for SNPsIndex, bimIndex in enumerate(sid_index_out):
-
-                startbit = int(np.ceil(0.25*iid_count_in)*bimIndex+3)
-                self._filepointer.seek(startbit)
-                nbyte = int(np.ceil(0.25*iid_count_in))
-                bytes = np.array(bytearray(self._filepointer.read(nbyte))).reshape((int(np.ceil(0.25*iid_count_in)),1),order='F')
-
-                val[3::4,SNPsIndex:SNPsIndex+1]=byteZero
-                val[3::4,SNPsIndex:SNPsIndex+1][bytes>=64]=np.nan
-                val[3::4,SNPsIndex:SNPsIndex+1][bytes>=128]=1
-                val[3::4,SNPsIndex:SNPsIndex+1][bytes>=192]=byteThree
-                bytes=np.mod(bytes,64)
-                val[2::4,SNPsIndex:SNPsIndex+1]=byteZero
-                val[2::4,SNPsIndex:SNPsIndex+1][bytes>=16]=np.nan
-                val[2::4,SNPsIndex:SNPsIndex+1][bytes>=32]=1
-                val[2::4,SNPsIndex:SNPsIndex+1][bytes>=48]=byteThree
-                bytes=np.mod(bytes,16)
-                val[1::4,SNPsIndex:SNPsIndex+1]=byteZero
-                val[1::4,SNPsIndex:SNPsIndex+1][bytes>=4]=np.nan
-                val[1::4,SNPsIndex:SNPsIndex+1][bytes>=8]=1
-                val[1::4,SNPsIndex:SNPsIndex+1][bytes>=12]=byteThree
-                bytes=np.mod(bytes,4)
-                val[0::4,SNPsIndex:SNPsIndex+1]=byteZero
-                val[0::4,SNPsIndex:SNPsIndex+1][bytes>=1]=np.nan
-                val[0::4,SNPsIndex:SNPsIndex+1][bytes>=2]=1
-                val[0::4,SNPsIndex:SNPsIndex+1][bytes>=3]=byteThree
-            val = val[iid_index_out,:] #reorder or trim any extra allocation
-
-
-            #!!LATER this can fail because the trim statement above messes up the order
-            #assert(SnpReader._array_properties_are_ok(val, order, dtype)) #!!
-            self._close_bed()
+            nbyte = int(np.ceil(0.25*iid_count_in))
+            val = np.empty((iid_count_out, sid_count_out), order=order, dtype=dtype)
+            iid_index = slice(0,iid_count_in) if iid_index_or_none is None else np.asarray(iid_index_out,dtype=np.intp)
+            block_size = max(1, Bed._python_block_values // max(1, nbyte*4)) # decode this many SNPs at a time
+            for start in range(0, sid_count_out, block_size):
+                sid_block = sid_index_out[start:start+block_size]
+                Bed._decode_bytes(self._packed_rows(sid_block), self.count_A1, iid_index, val[:,start:start+len(sid_block)])
 
         return val
 
@@ -0,0 +1,128 @@
+import numpy as np
+import logging
+from .snpreader import SnpReader
+from .bed import Bed
+from pysnptools.pstreader import PstReader
+from pysnptools.pstreader import PstData
+from pysnptools.pstreader._subset import _PstSubset
+
+class PackedSnpData(SnpReader):
+    """A :class:`.SnpReader` for holding SNP values in-memory in PLINK's 2-bit '.bed' encoding (four genotypes per byte), along with related iid and sid information.
+    It uses one quarter of the memory of a :class:`.SnpData` with dtype int8 (and one thirty-second of one with dtype float64).
+    It is usually created by calling the :meth:`.Bed.read_packed` method. It can also be constructed.
+
+    Values are decoded only when :meth:`.SnpReader.read` is called. Subsetting with brackets (for example, packedsnpdata[:,::2]) returns
+    another :class:`.PackedSnpData` without decoding any values.
+
+    See :class:`.SnpReader` for details and examples.
+
+    **Constructor:**
+        :Parameters: * **iid** (an array of strings) -- The :attr:`.SnpReader.iid` information
+                     * **sid** (an array of strings) -- The :attr:`.SnpReader.sid` information
+                     * **packed** (a 2-D array of numpy.uint8) -- The SNP values, one row per sid, in '.bed' format. Each row has ceil(iid_count/4) bytes.
+                     * **count_A1** (*bool*) -- Tells if the encoding counts the number of A1 alleles (the PLINK standard) or the number of A2 alleles.
+                     * **pos** (optional, an array of strings) -- The :attr:`.SnpReader.pos` information
+                     * **name** (optional, string) -- Information to be display about the origin of this data
+
+        :Example:
+
+        >>> from pysnptools.snpreader import Bed
+        >>> packedsnpdata = Bed('../examples/toydata',count_A1=False).read_packed()
+        >>> print(packedsnpdata.packed.shape) # one row of bytes per sid
+        (10000, 125)
+        >>> snpdata = packedsnpdata[:5,::2].read() # slice without decoding, then decode just the subset
+        >>> print(snpdata.val.shape)
+        (5, 5000)
+
+    **Methods beyond** :class:`.SnpReader`
+    """
+    def __init__(self, iid, sid, packed, count_A1, pos=None, name=None):
+        super(PackedSnpData, self).__init__()
+
+        self._row = PstData._fixup_input(iid,empty_creator=lambda ignore:np.empty([0,2],dtype=str))
+        self._col = PstData._fixup_input(sid,empty_creator=lambda ignore:np.empty([0],dtype=str))
+        self._row_property = PstData._fixup_input(None,count=len(self._row),empty_creator=lambda count:np.empty([count,0],dtype=str))
+        self._col_property = PstData._fixup_input(pos,count=len(self._col),empty_creator=lambda count:np.array([[np.nan, np.nan, np.nan]]*count))
+        self._assert_iid_sid_pos()
+
+        nbyte = int(np.ceil(0.25*len(self._row)))
+        self.packed = np.ascontiguousarray(packed, dtype=np.uint8).reshape(len(self._col), nbyte)
+        """The 2-D NumPy array of numpy.uint8 that holds the SNP values in '.bed' format, one row per sid.
+        """
+        self.count_A1 = count_A1
+        self._name = name or ""
+
+    def __repr__(self):
+        return "{0}({1})".format(self.__class__.__name__,self._name)
+
+    def copyinputs(self, copier):
+        pass #The data is in memory, so there are no input files to copy
+
+    @property
+    def row(self):
+        """*same as* :attr:`iid`
+        """
+        return self._row
+
+    @property
+    def col(self):
+        """*same as* :attr:`sid`
+        """
+        return self._col
+
+    @property
+    def col_property(self):
+        """*same as* :attr:`pos`
+        """
+        return self._col_property
+
+    def _packed_rows(self, sid_index):
+        return self.packed[sid_index,:]
+
+    def _packed_for(self, count_A1):
+        '''
+        Returns the packed bytes encoded for the given count_A1.
+        '''
+        if count_A1 == self.count_A1:
+            return self.packed
+        return Bed._swap_homozygous_codes(self.packed)
+
+    def __getitem__(self, iid_indexer_and_sid_indexer):
+        iid_indexer, sid_indexer = iid_indexer_and_sid_indexer
+        iid_indexer = PstReader._make_sparray_or_slice(iid_indexer)
+        sid_indexer = PstReader._make_sparray_or_slice(sid_indexer)
+        iid_index = np.arange(self.iid_count)[iid_indexer]
+        packed = self.packed[sid_indexer,:]
+
+        if not PstReader._is_all_slice(iid_indexer):
+            packed = Bed._repack(packed, iid_index)
+
+        name = "{0}[{1},{2}]".format(self._name,_PstSubset.static_nice_string(self,iid_indexer),_PstSubset.static_nice_string(self,sid_indexer))
+        return PackedSnpData(iid=self.iid[iid_index], sid=self.sid[sid_indexer], packed=packed, count_A1=self.count_A1, pos=self.pos[sid_indexer], name=name)
+
+    def _read(self, iid_index_or_none, sid_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None, standardize=None):
+        #See Bed._read for 'standardize'
+        assert standardize is None or (not force_python_only and dtype in (np.float64, np.float32)), "Only the C++ reader can standardize float values as they are decoded"
+        if order=='A':
+            order='F'
+
+        iid_index_out = iid_index_or_none if iid_index_or_none is not None else list(range(self.iid_count))
+        sid_index_out = sid_index_or_none if sid_index_or_none is not None else list(range(self.sid_count))
+
+        if not force_python_only:
+            return Bed._read_bed_bytes(self.packed, self.iid_count, self.sid_count, self.count_A1, iid_index_out, sid_index_out, order, dtype, num_threads, **(standardize or {}))
+
+        nbyte = self.packed.shape[1]
+        val = np.empty((len(iid_index_out), len(sid_index_out)), order=order, dtype=dtype)
+        iid_index = slice(0,self.iid_count) if iid_index_or_none is None else np.asarray(iid_index_out,dtype=np.intp)
+        block_size = max(1, Bed._python_block_values // max(1, nbyte*4)) # decode this many SNPs at a time
+        for start in range(0, len(sid_index_out), block_size):
+            sid_block = sid_index_out[start:start+block_size]
+            Bed._decode_bytes(self.packed[sid_block,:], self.count_A1, iid_index, val[:,start:start+len(sid_block)])
+        return val
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    import doctest
+    doctest.testmod()
@@ -19,7 +19,7 @@ class SnpData(PstData,SnpReader):
     **Constructor:**
         :Parameters: * **iid** (an array of strings) -- The :attr:`.SnpReader.iid` information
                      * **sid** (an array of strings) -- The :attr:`.SnpReader.sid` information
-                     * **val** (a 2-D array of floats) -- The SNP values
+                     * **val** (a 2-D array of floats, or of numpy.int8 with -127 for missing) -- The SNP values
                      * **pos** (optional, an array of strings) -- The :attr:`.SnpReader.pos` information
                      * **name** (optional, string) -- Information to be display about the origin of this data
                      * **copyinputs_function** (optional, function) -- *Used internally by optional clustering code*
@@ -68,7 +68,7 @@ class SnpData(PstData,SnpReader):
         self._assert_iid_sid_pos()
         self._name = name or parent_string or ""
         self._std_string_list = []
-    """The 2D NumPy array of floats that represents the values of the SNPs.
+    """The 2D NumPy array of floats (or int8, with -127 for missing) that represents the values of the SNPs.
 
     >>> from pysnptools.snpreader import Bed
     >>> snpdata = Bed('tests/datasets/all_chr.maf0.001.N300',count_A1=False)[:5,:].read() #read data for first 5 iids
@@ -88,7 +88,7 @@ class SnpData(PstData,SnpReader):
         return trained_standardizer
 
     #LATER should there be a single warning if Unit() finds and imputes NaNs?
-    def standardize(self, standardizer=Unit(), block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, standardizer=Unit(), block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         """Does in-place standardization of the in-memory
         SNP data. By default, it applies 'Unit' standardization, that is: the values for each SNP will have mean zero and standard deviation 1.0.
         NaN values are then filled with zero, the mean (consequently, if there are NaN values, the final standard deviation will not be zero.
@@ -109,6 +109,10 @@ class SnpData(PstData,SnpReader):
         :param force_python_only: optional -- If true, will use pure Python instead of faster C++ libraries.
         :type force_python_only: bool
 
+        :param num_threads: optional -- The number of threads with which to standardize. Defaults to all available processors.
+            Can also be set with the 'PST_NUM_THREADS' environment variable.
+        :type num_threads: None or int
+
         :rtype: :class:`.SnpData` (standardizes in place, but for convenience, returns 'self')
 
         >>> from pysnptools.snpreader import Bed
@@ -127,13 +131,13 @@ class SnpData(PstData,SnpReader):
         0.229415733871
         """
         self._std_string_list.append(str(standardizer))
-        _, trained = standardizer.standardize(self, return_trained=True, force_python_only=force_python_only)
+        _, trained = standardizer.standardize(self, return_trained=True, force_python_only=force_python_only, num_threads=num_threads)
         if return_trained:
             return self, trained
         else:
             return self
 
-    def _read_kernel(train, standardizer, block_size=None, order='A', dtype=np.float64, force_python_only=False, view_ok=False, return_trained=False):
+    def _read_kernel(train, standardizer, block_size=None, order='A', dtype=np.float64, force_python_only=False, view_ok=False, return_trained=False, num_threads=None, num_workers=1):
         '''
         The method creates a kernel for the in-memory SNP data. It handles these cases
                 * No standardization is needed & everything is in memory  OR uses the FROM-DISK method
@@ -146,10 +150,10 @@ class SnpData(PstData,SnpReader):
             ts = time.time()
             #is_worth_logging = train.val.shape[0] * train.val.shape[1] * test.val.shape[0] > 1e9
             #if is_worth_logging: logging.info("  _read_kernel about to multiply train{0} x test{1}".format(train.val.shape,test.val.shape))
-            if order == 'F': #numpy's 'dot' always returns 'C' order
-                K = (train.val.dot(train.val.T)).T
-            else:
-                K = train.val.dot(train.val.T)
+            #Fill in one triangle with a symmetric rank-k update and then mirror it
+            K = np.zeros([train.iid_count,train.iid_count],dtype=dtype,order='F' if order=='F' else 'C')
+            SnpReader._syrk(K, train.val)
+            SnpReader._mirror_upper(K)
             assert PstReader._array_properties_are_ok(K,order,dtype), "internal error: K is not of the expected order or dtype"
             #if is_worth_logging: logging.info("  _read_kernel took %.2f seconds" % (time.time()-ts))
             if return_trained:
@@ -157,7 +161,7 @@ class SnpData(PstData,SnpReader):
             else:
                 return K
         else: #Do things the more general SnpReader way.
-            return SnpReader._read_kernel(train, standardizer, block_size=block_size, order=order, dtype=dtype, force_python_only=force_python_only,view_ok=view_ok, return_trained=return_trained)
+            return SnpReader._read_kernel(train, standardizer, block_size=block_size, order=order, dtype=dtype, force_python_only=force_python_only,view_ok=view_ok, return_trained=return_trained, num_threads=num_threads, num_workers=num_workers)
 
     def __repr__(self):
         if self._name == "":
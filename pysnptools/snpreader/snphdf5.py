@@ -30,7 +30,7 @@ class SnpHdf5(PstHdf5,SnpReader):
         super(SnpHdf5, self).__init__(*args, **kwargs)
 
     @staticmethod
-    def write(filename, snpdata, hdf5_dtype=None, sid_major=True):
+    def write(filename, snpdata, hdf5_dtype=None, sid_major=True, chunks=None, compression=None, shuffle=True):
         """Writes a :class:`SnpData` to SnpHdf5 format.
 
         :param filename: the name of the file to create
@@ -41,11 +41,18 @@ class SnpHdf5(PstHdf5,SnpReader):
         :type hdf5_dtype: string
         :param col_major: Tells if vals should be stored on disk in sid_major (default) or iid_major format.
         :type col_major: bool
+        :param chunks: optional -- How to divide the vals into chunks on disk. None (the default) lets h5py pick. An (iid_count, sid_count) tuple gives the
+            size of each chunk. 'col_block' gives chunks of about one megabyte, each holding all the iids of a block of SNPs. See :meth:`.PstHdf5.write`.
+        :type chunks: None, tuple of two ints, or 'col_block'
+        :param compression: optional -- None (the default), 'gzip', or 'lzf'.
+        :type compression: string
+        :param shuffle: optional -- If True (the default), use HDF5's byte-shuffle filter (which makes the vals chunked). See :meth:`.PstHdf5.write`.
+        :type shuffle: bool
 
         >>> from pysnptools.snpreader import SnpHdf5, Bed
         >>> import pysnptools.util as pstutil
         """
-        PstHdf5.write(filename,snpdata,hdf5_dtype=hdf5_dtype,col_major=sid_major)
+        PstHdf5.write(filename,snpdata,hdf5_dtype=hdf5_dtype,col_major=sid_major,chunks=chunks,compression=compression,shuffle=shuffle)
 
 class Hdf5(SnpHdf5):
     #!! warnings.warn("class 'Hdf5' is deprecated. Use the standard class 'SnpHdf5' instead", DeprecationWarning)
@@ -55,6 +55,7 @@ class SnpReader(PstReader):
         *Class*                   *Format*            *Random Access*        *Suffixes*         *Write* method?
         :class:`.SnpData`         in-memory floats    Yes                    *n/a*              *n/a*
         :class:`.Bed`             binary, 0,1,2       Yes (by sid)           .bed/.bim/.fam     Yes
+        :class:`.PackedSnpData`   in-memory 2-bit     Yes                    *n/a*              *n/a*
         :class:`.Pheno`           text, floats        No                     .txt,.phe          Yes
         :class:`.Dat`             text, floats        No                     .dat/.map/.fam     Yes
         :class:`.Ped`             text, 0,1,2         No                     .ped/.map          Yes
@@ -259,11 +260,11 @@ class SnpReader(PstReader):
         return self._row_property
 
 
-    def _read(self, iid_index_or_none, sid_index_or_none, order, dtype, force_python_only, view_ok):
+    def _read(self, iid_index_or_none, sid_index_or_none, order, dtype, force_python_only, view_ok, num_threads=None):
         raise NotImplementedError
 
     #!!check that views always return contiguous memory by default
-    def read(self, order='F', dtype=np.float64, force_python_only=False, view_ok=False):
+    def read(self, order='F', dtype=np.float64, force_python_only=False, view_ok=False, num_threads=None):
         """Reads the SNP values and returns a :class:`.SnpData` (with :attr:`.SnpData.val` property containing a new ndarray of the SNP values).
 
         :param order: {'F' (default), 'C', 'A'}, optional -- Specify the order of the ndarray. If order is 'F' (default),
@@ -273,7 +274,8 @@ class SnpReader(PstReader):
             ndarray may be in any order (either C-, Fortran-contiguous).
         :type order: string or None
 
-        :param dtype: {scipy.float64 (default), scipy.float32}, optional -- The data-type for the :attr:`.SnpData.val` ndarray.
+        :param dtype: {scipy.float64 (default), scipy.float32, numpy.int8}, optional -- The data-type for the :attr:`.SnpData.val` ndarray.
+            Use numpy.int8 (supported by :class:`.Bed` and :class:`.SnpData`) to save memory. With int8, missing values are -127 rather than NaN.
         :type dtype: data-type
 
         :param force_python_only: optional -- If False (default), may use outside library code. If True, requests that the read
@@ -289,6 +291,11 @@ class SnpReader(PstReader):
             share memory and so it may ignore your suggestion and allocate a new ndarray anyway.
         :type view_ok: bool
 
+        :param num_threads: optional -- The number of threads with which to read (and decode) the SNP values. If None (default),
+            uses the 'PST_NUM_THREADS' environment variable, if set, and otherwise all the processors. Readers that can't work in parallel
+            (and reads done with force_python_only) ignore it.
+        :type num_threads: int or None
+
         :rtype: :class:`.SnpData`
 
         Calling the method again causes the SNP values to be re-read and creates a new in-memory :class:`.SnpData` with a new ndarray of SNP values.
@@ -301,7 +308,7 @@ class SnpReader(PstReader):
         >>> snp_on_disk = Bed('tests/datasets/all_chr.maf0.001.N300.bed',count_A1=False) # Specify SNP data on disk
         >>> snpdata1 = snp_on_disk.read() # Read all the SNP data returning a SnpData instance
         """
-        val = self._read(None, None, order, dtype, force_python_only, view_ok)
+        val = self._read(None, None, order, dtype, force_python_only, view_ok, num_threads)
         from .snpdata import SnpData
         ret = SnpData(self.iid,self.sid,val,pos=self.pos,name=str(self))
         return ret
@@ -343,7 +350,44 @@ class SnpReader(PstReader):
         iid_indexer, snp_indexer = iid_indexer_and_snp_indexer
         return _SnpSubset(self, iid_indexer, snp_indexer)
 
-    def read_kernel(self, standardizer=None, block_size=None, order='A', dtype=np.float64, force_python_only=False, view_ok=False):
+    def filter(self, maf_min=None, missing_max=None, block_size=None, num_threads=None, index_file=None):
+        """Returns a :class:`.SnpReader` of only those SNPs that pass the given filters. Like subsetting with brackets, this doesn't read any SNP values.
+        Then, the first time that the result's sids or values are needed, the statistics of all the SNPs are found in one pass (a block of SNPs at a time)
+        and the passing sids are remembered. Later reads (and :meth:`read_kernel` calls) read only the passing SNPs. For Bed files, the statistics come
+        from counting genotypes (see :meth:`.Bed.genotype_counts`), so no SNP values are decoded.
+
+        :param maf_min: optional -- Keep only SNPs whose minor allele frequency (over the non-missing values) is at least this.
+        :type maf_min: float or None
+
+        :param missing_max: optional -- Keep only SNPs whose fraction of missing values is at most this.
+        :type missing_max: float or None
+
+        :param block_size: optional -- The number of sids to read into memory at a time. The default (None) picks a number based on the iid_count.
+        :type block_size: int or None
+
+        :param num_threads: optional -- The number of threads with which to read SNP values. See :meth:`read`.
+        :type num_threads: int or None
+
+        :param index_file: optional -- For a :class:`.Bed` (or a subset of its sids), the name of a genotype-count sidecar file (see :meth:`.Bed.genotype_counts`).
+            If the file is current, the counts are loaded from it, so no genotypes are read. Otherwise, they are counted once and saved to it.
+        :type index_file: string or None
+
+        :rtype: :class:`.SnpReader`
+
+        :Example:
+
+        >>> from pysnptools.snpreader import Bed
+        >>> snp_on_disk = Bed('../examples/toydata',count_A1=False)
+        >>> common = snp_on_disk.filter(maf_min=0.1) # Nothing is read yet
+        >>> print(common.sid_count) # The SNPs are counted (once) when first needed
+        8900
+        >>> print(common[:,:100].read().val.shape)
+        (500, 100)
+        """
+        from pysnptools.snpreader._subset import _SnpFilter
+        return _SnpFilter(self, maf_min, missing_max, block_size, num_threads, index_file)
+
+    def read_kernel(self, standardizer=None, block_size=None, order='A', dtype=np.float64, force_python_only=False, view_ok=False, num_threads=None, num_workers=1):
         """Returns a :class:`KernelData` such that the :meth:`KernelData.val` property will be a ndarray of the standardized SNP values multiplied with their transposed selves.
 
         :param standardizer: -- (required) Specify standardization to be applied before the matrix multiply. Any :class:`.Standardizer` may be used. Some choices include :class:`Standardizer.Identity`
@@ -353,6 +397,13 @@ class SnpReader(PstReader):
         :param block_size: optional -- Default of None (meaning to load all). Suggested number of sids to read into memory at a time.
         :type block_size: int or None
 
+        :param num_threads: optional -- The number of threads with which to read SNP values. See :meth:`read`.
+        :type num_threads: int or None
+
+        :param num_workers: optional -- When reading in blocks, the number of threads that multiply blocks, each into its own partial kernel. The partial kernels are summed at the end,
+            so each extra worker needs another iid_count x iid_count array. Defaults to 1. In all cases, the next block is read and standardized while the current one is multiplied.
+        :type num_workers: int
+
         :rtype: class:`KernelData`
 
         Calling the method again causes the SNP values to be re-read and allocates a new class:`KernelData`.
@@ -371,10 +422,105 @@ class SnpReader(PstReader):
         assert standardizer is not None, "'standardizer' must be provided"
 
         from pysnptools.kernelreader import SnpKernel
-        snpkernel = SnpKernel(self,standardizer=standardizer,block_size=block_size)
-        kerneldata = snpkernel.read(order, dtype, force_python_only, view_ok)
+        snpkernel = SnpKernel(self,standardizer=standardizer,block_size=block_size,num_workers=num_workers)
+        kerneldata = snpkernel.read(order, dtype, force_python_only, view_ok, num_threads)
         return kerneldata
 
+    def read_loco_kernels(self, standardizer=None, by=None, block_size=None, order='A', dtype=np.float64, force_python_only=False, num_threads=None, num_workers=1, temp_dir=None):
+        """Yields, for each chromosome, a :class:`KernelData` of all the other chromosomes' SNPs (that is, a leave-one-chromosome-out, or LOCO, kernel).
+
+        The SNP data is read only once. Each chromosome's SNPs are read (as with :meth:`read_kernel`) into a partial kernel. Then, chromosome by chromosome,
+        the LOCO kernel is the total of the partial kernels minus the chromosome's own partial kernel. All the SNP data is read before the first kernel is yielded.
+
+        By default, the partial kernels are kept in memory until their LOCO kernels are yielded, so this needs memory for (chromosome count + 1) iid_count x iid_count
+        arrays. Each yielded kernel's memory is given over to the caller, so writing each to disk (for example, with :meth:`.KernelNpz.write` or :meth:`.KernelHdf5.write`)
+        and then dropping it frees that memory. With 'temp_dir', each partial kernel is instead saved to a temporary file as soon as it is computed, so only
+        the total and the kernel being yielded are kept in memory. The temporary files are removed as their kernels are yielded (or when the generator is closed).
+
+        :param standardizer: -- (required) Specify standardization to be applied to each chromosome's SNPs before the matrix multiply. See :meth:`read_kernel`.
+        :type standardizer: :class:`.Standardizer`
+
+        :param by: optional -- A value for each sid telling its chromosome. Defaults to the chromosome column of :attr:`pos`, that is, pos[:,0]. It may not contain NaN.
+        :type by: ndarray
+
+        :param block_size: optional -- Default of None (meaning to load all of a chromosome at once). Suggested number of sids to read into memory at a time.
+        :type block_size: int or None
+
+        :param num_threads: optional -- The number of threads with which to read SNP values. See :meth:`read`.
+        :type num_threads: int or None
+
+        :param num_workers: optional -- When reading in blocks, the number of threads that multiply blocks. See :meth:`read_kernel`.
+        :type num_workers: int
+
+        :param temp_dir: optional -- A directory in which to save the partial kernels, rather than keeping them in memory. Defaults to None (keep them in memory).
+        :type temp_dir: string or None
+
+        :rtype: a generator of (chromosome, :class:`KernelData`) pairs, in sorted chromosome order
+
+        :Example:
+
+        >>> from pysnptools.snpreader import Bed
+        >>> from pysnptools.standardizer import Unit
+        >>> snp_on_disk = Bed('../examples/toydata.5chrom',count_A1=False) # Specify SNP data on disk
+        >>> for chrom, kerneldata in snp_on_disk.read_loco_kernels(Unit()):
+        ...     print("{0}: {1}".format(int(chrom), kerneldata.iid_count))
+        1: 500
+        2: 500
+        3: 500
+        4: 500
+        5: 500
+        """
+        assert standardizer is not None, "'standardizer' must be provided"
+        from pysnptools.kernelreader import KernelData
+
+        by = self.pos[:,0] if by is None else np.asarray(by)
+        assert len(by) == self.sid_count, "Expect 'by' to have a value for each sid"
+        assert not pd.isnull(by).any(), "Expect 'by' to have no NaN values. (To include such SNPs, give them a chromosome value with 'by'.)"
+        chrom_list = np.unique(by)
+
+        if temp_dir is not None:
+            import tempfile
+            pstutil.create_directory_if_necessary(temp_dir, isfile=False)
+
+        t0 = time.time()
+        partial_list = [] # each partial kernel, or, with temp_dir, the name of the file that holds it
+        total = None
+        try:
+            for chrom in chrom_list:
+                sid_index = np.flatnonzero(by == chrom)
+                logging.info("reading {0} SNPs on chromosome {1}".format(len(sid_index),chrom))
+                partial = self[:,sid_index]._read_kernel(standardizer,block_size=block_size,order=order,dtype=dtype,force_python_only=force_python_only,num_threads=num_threads,num_workers=num_workers)
+                if total is None:
+                    total = partial.copy()
+                else:
+                    total += partial
+                if temp_dir is None:
+                    partial_list.append(partial)
+                else:
+                    handle, partial_file = tempfile.mkstemp(suffix=".npy", dir=temp_dir)
+                    partial_list.append(partial_file)
+                    with os.fdopen(handle,"wb") as fp:
+                        np.save(fp, partial)
+                    del partial
+            if total is None:
+                total = np.zeros([self.iid_count,self.iid_count],dtype=dtype,order='C' if order=='A' else order)
+            logging.info("%.2f seconds to create partial kernels for %s chromosomes" % (time.time()-t0, len(chrom_list)))
+
+            for index, chrom in enumerate(chrom_list):
+                if temp_dir is None:
+                    loco = partial_list[index]
+                else:
+                    loco = np.load(partial_list[index])
+                    os.remove(partial_list[index])
+                partial_list[index] = None #So that the memory can be freed once the caller is done with it
+                np.subtract(total, loco, out=loco)
+                yield chrom, KernelData(iid=self.iid, val=loco, name="{0} without chromosome {1}".format(self,chrom))
+        finally:
+            if temp_dir is not None: #remove any partial kernel files not yet yielded
+                for partial_file in partial_list:
+                    if partial_file is not None and os.path.exists(partial_file):
+                        os.remove(partial_file)
+
     def kernel(self, standardizer, allowlowrank=False, block_size=10000, blocksize=None):
         """ .. Warning:: Deprecated. Use :meth:`read_kernel` instead.
 
@@ -407,20 +553,25 @@ class SnpReader(PstReader):
         return self._read_kernel(standardizer, block_size=block_size)
 
     @staticmethod
-    def _as_snpdata(snpreader, standardizer, force_python_only, dtype):
+    def _as_snpdata(snpreader, standardizer, force_python_only, dtype, num_threads=None):
         '''
         Like 'read' except (1) won't read if already a snpdata and (2) returns the standardizer
         '''
         from pysnptools.snpreader import SnpData
         if isinstance(snpreader,SnpData) and snpreader.val.dtype==dtype and isinstance(standardizer,stdizer.Identity):
             return snpreader, stdizer.Identity()
-        else:
-            return snpreader.read(order='A',dtype=dtype).standardize(standardizer,return_trained=True,force_python_only=force_python_only)
-
-    def _read_kernel(self, standardizer, block_size=None, order='A', dtype=np.float64, force_python_only=False, view_ok=False, return_trained=False):
+        if type(standardizer) in (stdizer.Unit, stdizer.Beta) and dtype in (np.float64, np.float32) and not force_python_only:
+            #Bed files (and PackedSnpData) standardize each SNP as it is decoded, in one pass
+            from pysnptools.snpreader.bed import Bed
+            result = Bed._read_standardized(snpreader, standardizer, dtype, num_threads)
+            if result is not None:
+                return result
+        return snpreader.read(order='A',dtype=dtype,num_threads=num_threads).standardize(standardizer,return_trained=True,force_python_only=force_python_only,num_threads=num_threads)
+
+    def _read_kernel(self, standardizer, block_size=None, order='A', dtype=np.float64, force_python_only=False, view_ok=False, return_trained=False, num_threads=None, num_workers=1):
         #Do all-at-once (not in blocks) if 1. No block size is given or 2. The #ofSNPs < Min(block_size,iid_count)
         if block_size is None or (self.sid_count <= block_size or self.sid_count <= self.iid_count):
-            train_data,trained_standardizer  = SnpReader._as_snpdata(self,standardizer=standardizer,dtype=dtype,force_python_only=force_python_only)
+            train_data,trained_standardizer  = SnpReader._as_snpdata(self,standardizer=standardizer,dtype=dtype,force_python_only=force_python_only,num_threads=num_threads)
             kernel = train_data._read_kernel(stdizer.Identity(), order=order,dtype=dtype,force_python_only=force_python_only,view_ok=False)
             if return_trained:
                 return kernel, trained_standardizer
@@ -437,17 +588,16 @@ class SnpReader(PstReader):
 
             logging.info("reading {0} SNPs in blocks of {1} and adding up kernels (for {2} individuals)".format(self.sid_count, block_size, self.iid_count))
 
-            ct = 0
-            ts = time.time()
-
-            for start in range(0, self.sid_count, block_size):
-                ct += block_size
-                train_data,trained_standardizer = SnpReader._as_snpdata(self[:,start:start+block_size],standardizer=standardizer,dtype=dtype,force_python_only=force_python_only)
-                trained_standardizer_list.append(trained_standardizer)
-                K += train_data._read_kernel(stdizer.Identity(),block_size=None,order=order,dtype=dtype,force_python_only=force_python_only,view_ok=False)
-                if ct % block_size==0:
+            def block_sequence():
+                ts = time.time()
+                for start in range(0, self.sid_count, block_size):
+                    train_data,trained_standardizer = SnpReader._as_snpdata(self[:,start:start+block_size],standardizer=standardizer,dtype=dtype,force_python_only=force_python_only,num_threads=num_threads)
+                    trained_standardizer_list.append(trained_standardizer)
+                    yield train_data.val
                     diff = time.time()-ts
-                    if diff > 1: logging.info("read %s SNPs in %.2f seconds" % (ct, diff))
+                    if diff > 1: logging.info("read %s SNPs in %.2f seconds" % (min(start+block_size,self.sid_count), diff))
+
+            SnpReader._accumulate_kernel(K, block_sequence(), num_workers)
 
             t1 = time.time()
             logging.info("%.2f seconds elapsed" % (t1-t0))
@@ -457,6 +607,124 @@ class SnpReader(PstReader):
             else:
                 return K
 
+    @staticmethod
+    def _accumulate_kernel(K, block_sequence, num_workers=1):
+        '''
+        Adds block.dot(block.T) to K for each (iid x SNP) block from 'block_sequence'.
+        Each block is added with a symmetric rank-k update (see :meth:`_syrk`) and K is made symmetric at the end.
+
+        The blocks are produced on a background thread, so the next block is read and standardized while the current one is multiplied.
+        With num_workers > 1, that many threads multiply blocks, each into its own partial kernel, and the partial kernels are added to K at the end.
+        (Both reading with C++ and multiplying release the GIL, so the threads really do run at the same time.)
+        '''
+        import threading
+        try:
+            import queue
+        except ImportError:
+            import Queue as queue
+
+        num_workers = max(1, num_workers)
+        block_queue = queue.Queue(maxsize=num_workers) # Limits how many blocks are in memory at once
+        done = object()
+        stop = threading.Event()
+        error_list = []
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    block_queue.put(item,timeout=.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for block in block_sequence:
+                    if not put(block):
+                        return
+            except BaseException as e:
+                error_list.append(e)
+                stop.set()
+            finally:
+                for _ in range(num_workers):
+                    put(done)
+
+        partial_list = [K] + [np.zeros_like(K) for _ in range(num_workers-1)]
+
+        def work(partial):
+            try:
+                while not stop.is_set():
+                    try:
+                        block = block_queue.get(timeout=.1)
+                    except queue.Empty:
+                        continue
+                    if block is done:
+                        return
+                    SnpReader._syrk(partial, block)
+            except BaseException as e:
+                error_list.append(e)
+                stop.set()
+
+        producer = threading.Thread(target=produce)
+        producer.daemon = True
+        producer.start()
+        workers = [threading.Thread(target=work,args=(partial,)) for partial in partial_list[1:]]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        work(partial_list[0])
+        for worker in workers:
+            worker.join()
+        producer.join()
+
+        if error_list:
+            raise error_list[0]
+        for partial in partial_list[1:]:
+            K += partial
+        SnpReader._mirror_upper(K)
+        return K
+
+    @staticmethod
+    def _syrk(K, block):
+        '''
+        Adds block.dot(block.T) to the upper triangle of the square array K, in place, using BLAS's symmetric rank-k update (?syrk).
+        This does half the multiplications of block.dot(block.T) and needs no temporary array. The lower triangle of K is left as is,
+        so call :meth:`_mirror_upper` when done. If K isn't float32 or float64, this falls back to a full K += block.dot(block.T).
+        The multiply releases the GIL, so other threads (for example, ones reading or multiplying other blocks) keep running.
+        '''
+        if K.dtype not in (np.float64, np.float32) or K.shape[0] == 0:
+            K += block.dot(block.T)
+            return K
+
+        from pysnptools.snpreader import wrap_matrix_subset
+        syrk = wrap_matrix_subset.syrkDouble if K.dtype == np.float64 else wrap_matrix_subset.syrkSingle
+        #BLAS wants 'F' order. K is symmetric, so when it is 'C' order, we update its transpose (and so its lower triangle).
+        KF = K if K.flags['F_CONTIGUOUS'] else K.T
+        assert KF.flags['F_CONTIGUOUS'], "real assert"
+        block = block if block.dtype == K.dtype else block.astype(K.dtype)
+        if block.flags['F_CONTIGUOUS']:
+            syrk(block, KF, False)
+        elif block.flags['C_CONTIGUOUS']: #A 'C' order block is an 'F' order block.T, so ask for block.T.T.dot(block.T)
+            syrk(block.T, KF, True)
+        else:
+            syrk(np.asfortranarray(block), KF, False)
+        return K
+
+    @staticmethod
+    def _mirror_upper(K, stripe_size=1000):
+        '''
+        Copies the upper triangle of the square array K (as filled in by :meth:`_syrk`) into its lower triangle, in place, a stripe of rows at a time.
+        '''
+        KF = K if K.flags['F_CONTIGUOUS'] else K.T #The triangle :meth:`_syrk` filled in
+        for start in range(0, KF.shape[0], stripe_size):
+            stop = min(start + stripe_size, KF.shape[0])
+            KF[start:stop,:start] = KF[:start,start:stop].T
+            diagonal_block = KF[start:stop,start:stop]
+            lower = np.tril_indices(stop-start,-1)
+            diagonal_block[lower] = diagonal_block.T[lower]
+        return K
+
     def copyinputs(self, copier):
         raise NotImplementedError
 
@@ -490,8 +758,11 @@ class SnpReader(PstReader):
 
 
     @staticmethod
-    def _read_fam(basefilename, remove_suffix):
+    def _read_fam(basefilename, remove_suffix, cache=False):
         famfile = SnpReader._name_of_other_file(basefilename, remove_suffix, "fam")
+        if cache:
+            iid, = SnpReader._read_with_cache(famfile, lambda: (SnpReader._read_fam(basefilename, remove_suffix),), ["iid"])
+            return iid
 
         logging.info("Loading fam file {0}".format(famfile))
         iid = np.loadtxt(famfile, dtype = 'str',usecols=(0,1),comments=None)
@@ -501,19 +772,103 @@ class SnpReader(PstReader):
 
 
     @staticmethod
-    def _read_map_or_bim( basefilename, remove_suffix, add_suffix):
+    def _read_map_or_bim( basefilename, remove_suffix, add_suffix, cache=False, want_sid=True, want_pos=True):
+        '''
+        Returns (sid, pos). If only one of them is wanted, only its columns are parsed and None is returned for the other (unless 'cache' is True, which always gives both).
+        '''
         mapfile = SnpReader._name_of_other_file(basefilename, remove_suffix, add_suffix)
+        if cache:
+            return SnpReader._read_with_cache(mapfile, lambda: SnpReader._read_map_or_bim(basefilename, remove_suffix, add_suffix), ["sid","pos"])
 
         logging.info("Loading {0} file {1}".format(add_suffix, mapfile))
         if os.path.getsize(mapfile) == 0: #If the map/bim file is empty, return empty arrays
             sid = np.array([],dtype='str')
             pos = np.array([[]],dtype=int).reshape(0,3)
-            return sid,pos
         else:
-            fields = pd.read_csv(mapfile,delimiter = '\t',usecols = (0,1,2,3),header=None,index_col=False,comment=None)
-            sid = np.array(fields[1].tolist(),dtype='str')
-            pos = fields.as_matrix([0,2,3])
-            return sid,pos
+            usecols = ([1] if want_sid else []) + ([0,2,3] if want_pos else [])
+            fields = pd.read_csv(mapfile,delimiter = '\t',usecols = usecols,header=None,index_col=False,comment=None)
+            sid = np.array(fields[1].tolist(),dtype='str') if want_sid else None
+            pos = fields.as_matrix([0,2,3]) if want_pos else None
+        return (sid if want_sid else None), (pos if want_pos else None)
+
+    @staticmethod
+    def _count_lines(filename, block_size=1024*1024):
+        '''
+        Counts the non-blank lines of a text file without parsing it. Like the parsers, it treats a line with nothing but whitespace
+        (spaces, tabs, carriage returns, etc.) as blank.
+        '''
+        is_content = np.ones(256,dtype=bool) # byte to whether it is something other than whitespace
+        is_content[[9,10,11,12,13,32]] = False
+        count = 0
+        has_content = False # whether the line in progress has seen a non-whitespace byte
+        with open(filename,"rb") as fp:
+            while True:
+                chunk = fp.read(block_size)
+                if not chunk:
+                    break
+                data = np.frombuffer(chunk,dtype=np.uint8)
+                content_so_far = np.cumsum(is_content[data]) # the number of non-whitespace bytes up to and including each byte
+                content_at_newline = content_so_far[data == 10]
+                if len(content_at_newline) == 0:
+                    has_content = has_content or content_so_far[-1] > 0
+                    continue
+                count += int(has_content or content_at_newline[0] > 0) # the line in progress ends at the first newline
+                count += int((np.diff(content_at_newline) > 0).sum())
+                has_content = content_so_far[-1] > content_at_newline[-1]
+        if has_content: # the last line has no newline
+            count += 1
+        return count
+
+    @staticmethod
+    def _read_with_cache(textfile, parse, name_list, cachefile=None, key=()):
+        '''
+        Returns the arrays that 'parse()' returns for 'textfile', using a binary cache file (by default, next to it: textfile + '.npz').
+        The cache is used only if it records the current size and modification time of 'textfile' (and any extra 'key' values). Otherwise, 'textfile'
+        is parsed and the cache is (re)written. An unreadable cache file is ignored (and rewritten).
+        '''
+        cachefile = cachefile or textfile + ".npz"
+        stat = os.stat(textfile)
+        size_and_mtime = np.array([stat.st_size, stat.st_mtime] + list(key), dtype=np.float64)
+        if os.path.exists(cachefile):
+            try:
+                with np.load(cachefile, allow_pickle=False) as data:
+                    if np.array_equal(data["size_and_mtime"], size_and_mtime):
+                        logging.info("Loading cached {0}".format(cachefile))
+                        return tuple(data[name] for name in name_list)
+            except Exception as e:
+                logging.warn("Ignoring unreadable cache file '{0}' ({1})".format(cachefile, e))
+
+        result = parse()
+        tempfile = "{0}.{1}.npz".format(cachefile, os.getpid()) # write to a temporary file and then rename, so that other processes never see a partial cache file
+        try:
+            np.savez(tempfile, size_and_mtime=size_and_mtime, **dict(zip(name_list, result)))
+            SnpReader._replace_file(tempfile, cachefile)
+        except (IOError, OSError) as e:
+            logging.warn("Could not write cache file '{0}' ({1})".format(cachefile, e))
+        finally:
+            if os.path.exists(tempfile):
+                try:
+                    os.remove(tempfile)
+                except OSError:
+                    pass
+        return result
+
+    @staticmethod
+    def _replace_file(src, dst):
+        '''
+        Renames 'src' to 'dst', replacing any existing 'dst' in one atomic step. Python 2's os.rename already does this on POSIX, but on Windows
+        it won't overwrite, so there the old 'dst' is first removed (which is not atomic).
+        '''
+        if hasattr(os, "replace"): #Python 3.3+
+            os.replace(src, dst)
+        else:
+            try:
+                os.rename(src, dst)
+            except OSError:
+                if not os.path.exists(dst):
+                    raise
+                os.remove(dst)
+                os.rename(src, dst)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ cimport numpy as np
 from libcpp.string cimport string
 from libcpp.vector cimport vector
 from libcpp cimport bool
+from scipy.linalg.cython_blas cimport dsyrk, ssyrk
 
 cdef extern from "./MatrixSubset.h":
 	
@@ -28,6 +29,27 @@ cdef extern from "./MatrixSubset.h":
 	void _matrixSubsetSingleCToSingleFAAA "matrixSubsetSingleCToSingleFAAA"(float* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
 	void _matrixSubsetSingleCToSingleCAAA "matrixSubsetSingleCToSingleCAAA"(float* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
 
+	void _matrixSubsetInt8FToInt8FAAA "matrixSubsetInt8FToInt8FAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetInt8FToInt8CAAA "matrixSubsetInt8FToInt8CAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetInt8FToSingleFAAA "matrixSubsetInt8FToSingleFAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
+	void _matrixSubsetInt8FToSingleCAAA "matrixSubsetInt8FToSingleCAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
+	void _matrixSubsetInt8FToDoubleFAAA "matrixSubsetInt8FToDoubleFAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out)
+	void _matrixSubsetInt8FToDoubleCAAA "matrixSubsetInt8FToDoubleCAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out)
+	void _matrixSubsetInt8CToInt8FAAA "matrixSubsetInt8CToInt8FAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetInt8CToInt8CAAA "matrixSubsetInt8CToInt8CAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetInt8CToSingleFAAA "matrixSubsetInt8CToSingleFAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
+	void _matrixSubsetInt8CToSingleCAAA "matrixSubsetInt8CToSingleCAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
+	void _matrixSubsetInt8CToDoubleFAAA "matrixSubsetInt8CToDoubleFAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out)
+	void _matrixSubsetInt8CToDoubleCAAA "matrixSubsetInt8CToDoubleCAAA"(signed char* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out)
+	void _matrixSubsetDoubleFToInt8FAAA "matrixSubsetDoubleFToInt8FAAA"(double* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetDoubleFToInt8CAAA "matrixSubsetDoubleFToInt8CAAA"(double* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetDoubleCToInt8FAAA "matrixSubsetDoubleCToInt8FAAA"(double* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetDoubleCToInt8CAAA "matrixSubsetDoubleCToInt8CAAA"(double* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetSingleFToInt8FAAA "matrixSubsetSingleFToInt8FAAA"(float* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetSingleFToInt8CAAA "matrixSubsetSingleFToInt8CAAA"(float* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetSingleCToInt8FAAA "matrixSubsetSingleCToInt8FAAA"(float* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+	void _matrixSubsetSingleCToInt8CAAA "matrixSubsetSingleCToInt8CAAA"(float* in_, int input_num_ind, int input_num_snps, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out)
+
 
 def matrixSubsetDoubleFToDoubleFAAA(np.ndarray[np.float64_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
 	cdef vector[size_t] iid_idx_list = iidIdxList
@@ -112,3 +134,137 @@ def matrixSubsetSingleCToSingleCAAA(np.ndarray[np.float32_t, ndim=2] in_, input_
 	cdef vector[int] sid_idx_list = snpIdxList
 	_matrixSubsetSingleCToSingleCAAA(<float*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <float*> out.data)
 	return out
+
+#int8 values use -127 for missing
+def matrixSubsetInt8FToInt8FAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8FToInt8FAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetInt8FToInt8CAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8FToInt8CAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetInt8FToSingleFAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8FToSingleFAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <float*> out.data)
+	return out
+def matrixSubsetInt8FToSingleCAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8FToSingleCAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <float*> out.data)
+	return out
+def matrixSubsetInt8FToDoubleFAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8FToDoubleFAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <double*> out.data)
+	return out
+def matrixSubsetInt8FToDoubleCAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8FToDoubleCAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <double*> out.data)
+	return out
+def matrixSubsetInt8CToInt8FAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8CToInt8FAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetInt8CToInt8CAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8CToInt8CAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetInt8CToSingleFAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8CToSingleFAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <float*> out.data)
+	return out
+def matrixSubsetInt8CToSingleCAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8CToSingleCAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <float*> out.data)
+	return out
+def matrixSubsetInt8CToDoubleFAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8CToDoubleFAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <double*> out.data)
+	return out
+def matrixSubsetInt8CToDoubleCAAA(np.ndarray[np.int8_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetInt8CToDoubleCAAA(<signed char*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <double*> out.data)
+	return out
+def matrixSubsetDoubleFToInt8FAAA(np.ndarray[np.float64_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetDoubleFToInt8FAAA(<double*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetDoubleFToInt8CAAA(np.ndarray[np.float64_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetDoubleFToInt8CAAA(<double*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetDoubleCToInt8FAAA(np.ndarray[np.float64_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetDoubleCToInt8FAAA(<double*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetDoubleCToInt8CAAA(np.ndarray[np.float64_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetDoubleCToInt8CAAA(<double*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetSingleFToInt8FAAA(np.ndarray[np.float32_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetSingleFToInt8FAAA(<float*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetSingleFToInt8CAAA(np.ndarray[np.float32_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetSingleFToInt8CAAA(<float*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetSingleCToInt8FAAA(np.ndarray[np.float32_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetSingleCToInt8FAAA(<float*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+def matrixSubsetSingleCToInt8CAAA(np.ndarray[np.float32_t, ndim=2] in_, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out):
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	_matrixSubsetSingleCToInt8CAAA(<float*> in_.data, input_num_ind, input_num_snps, iid_idx_list, sid_idx_list, <signed char*> out.data)
+	return out
+
+
+# Symmetric rank-k update (BLAS's ?syrk) of the upper triangle of 'F' order square 'c', in place: c += a.dot(a.T) (trans=0) or c += a.T.dot(a) (trans=1).
+# 'a' must be in 'F' order. Unlike scipy.linalg.blas's syrk, these release the GIL while multiplying.
+def syrkDouble(np.ndarray[np.float64_t, ndim=2, mode="fortran"] a, np.ndarray[np.float64_t, ndim=2, mode="fortran"] c, bool trans):
+	cdef int n = c.shape[0]
+	cdef int k = a.shape[0] if trans else a.shape[1]
+	cdef int lda = max(1, a.shape[0])
+	cdef int ldc = max(1, n)
+	cdef double alpha = 1.0
+	cdef double beta = 1.0
+	cdef char uplo = b'U'
+	cdef char trans_char = b'T' if trans else b'N'
+	if n == 0 or k == 0:
+		return c
+	with nogil:
+		dsyrk(&uplo, &trans_char, &n, &k, &alpha, <double*> a.data, &lda, &beta, <double*> c.data, &ldc)
+	return c
+def syrkSingle(np.ndarray[np.float32_t, ndim=2, mode="fortran"] a, np.ndarray[np.float32_t, ndim=2, mode="fortran"] c, bool trans):
+	cdef int n = c.shape[0]
+	cdef int k = a.shape[0] if trans else a.shape[1]
+	cdef int lda = max(1, a.shape[0])
+	cdef int ldc = max(1, n)
+	cdef float alpha = 1.0
+	cdef float beta = 1.0
+	cdef char uplo = b'U'
+	cdef char trans_char = b'T' if trans else b'N'
+	if n == 0 or k == 0:
+		return c
+	with nogil:
+		ssyrk(&uplo, &trans_char, &n, &k, &alpha, <float*> a.data, &lda, &beta, <float*> c.data, &ldc)
+	return c
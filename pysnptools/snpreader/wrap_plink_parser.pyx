@@ -8,10 +8,23 @@ from libcpp cimport bool
 
 cdef extern from "./CPlinkBedFile.h":
 
-	void _readPlinkBedFilefloatFAAA "readPlinkBedFilefloatFAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
-	void _readPlinkBedFiledoubleFAAA "readPlinkBedFiledoubleFAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out)
-	void _readPlinkBedFilefloatCAAA "readPlinkBedFilefloatCAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out)
-	void _readPlinkBedFiledoubleCAAA "readPlinkBedFiledoubleCAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out)
+	void _readPlinkBedFilefloatFAAA "readPlinkBedFilefloatFAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out, int num_threads, bool betaNotUnitVariance, float betaA, float betaB, float* stats) nogil
+	void _readPlinkBedFiledoubleFAAA "readPlinkBedFiledoubleFAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out, int num_threads, bool betaNotUnitVariance, double betaA, double betaB, double* stats) nogil
+	void _readPlinkBedFilefloatCAAA "readPlinkBedFilefloatCAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out, int num_threads, bool betaNotUnitVariance, float betaA, float betaB, float* stats) nogil
+	void _readPlinkBedFiledoubleCAAA "readPlinkBedFiledoubleCAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out, int num_threads, bool betaNotUnitVariance, double betaA, double betaB, double* stats) nogil
+
+	void _readPlinkBedBytesfloatFAAA "readPlinkBedBytesfloatFAAA"(unsigned char* bed_bytes, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out, int num_threads, bool betaNotUnitVariance, float betaA, float betaB, float* stats) nogil
+	void _readPlinkBedBytesdoubleFAAA "readPlinkBedBytesdoubleFAAA"(unsigned char* bed_bytes, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out, int num_threads, bool betaNotUnitVariance, double betaA, double betaB, double* stats) nogil
+	void _readPlinkBedBytesfloatCAAA "readPlinkBedBytesfloatCAAA"(unsigned char* bed_bytes, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, float* out, int num_threads, bool betaNotUnitVariance, float betaA, float betaB, float* stats) nogil
+	void _readPlinkBedBytesdoubleCAAA "readPlinkBedBytesdoubleCAAA"(unsigned char* bed_bytes, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, double* out, int num_threads, bool betaNotUnitVariance, double betaA, double betaB, double* stats) nogil
+
+	void _readPlinkBedFileint8FAAA "readPlinkBedFileint8FAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out, int num_threads) nogil
+	void _readPlinkBedFileint8CAAA "readPlinkBedFileint8CAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out, int num_threads) nogil
+	void _readPlinkBedBytesint8FAAA "readPlinkBedBytesint8FAAA"(unsigned char* bed_bytes, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out, int num_threads) nogil
+	void _readPlinkBedBytesint8CAAA "readPlinkBedBytesint8CAAA"(unsigned char* bed_bytes, int input_num_ind, int input_num_snps, bool count_A1, vector[size_t] iid_idx_list, vector[int] sid_idx_list, signed char* out, int num_threads) nogil
+
+	void _writePlinkBedFileint8FAAA "writePlinkBedFileint8FAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, signed char* inx)
+	void _writePlinkBedFileint8CAAA "writePlinkBedFileint8CAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, signed char* inx)
 
 	void _writePlinkBedFilefloatFAAA "writePlinkBedFilefloatFAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, float* inx)
 	void _writePlinkBedFiledoubleFAAA "writePlinkBedFiledoubleFAAA"(string bed_fn, int input_num_ind, int input_num_snps, bool count_A1, double* inx)
@@ -23,131 +36,372 @@ cdef extern from "./CPlinkBedFile.h":
 		float *SNPs,
 		size_t nIndividuals,
 		size_t nSNPs,
+		long long indStride,
+		long long snpStride,
 		const bool betaNotUnitVariance,
 		const float betaA,
 		const float betaB,
 		const bool apply_in_place,
 		const bool use_stats,
-		float *stats
-		)
+		float *stats,
+		int num_threads
+		) nogil
 	void _ImputeAndZeroMeanSNPsdoubleFAAA "ImputeAndZeroMeanSNPsdoubleFAAA"( 
 		double *SNPs,
 		size_t nIndividuals,
 		size_t nSNPs,
+		long long indStride,
+		long long snpStride,
 		const bool betaNotUnitVariance,
 		const double betaA,
 		const double betaB,
 		const bool apply_in_place,
 		const bool use_stats,
-		double *stats
-		)
+		double *stats,
+		int num_threads
+		) nogil
 	void _ImputeAndZeroMeanSNPsfloatCAAA "ImputeAndZeroMeanSNPsfloatCAAA"( 
 		float *SNPs,
 		size_t nIndividuals,
 		size_t nSNPs,
+		long long indStride,
+		long long snpStride,
 		bool betaNotUnitVariance,
 		float betaA,
 		float betaB,
 		const bool apply_in_place,
 		const bool use_stats,
-		float *stats
-		)
+		float *stats,
+		int num_threads
+		) nogil
 
 	void _ImputeAndZeroMeanSNPsdoubleCAAA "ImputeAndZeroMeanSNPsdoubleCAAA"( 
 		double *SNPs,
 		size_t nIndividuals,
 		size_t nSNPs,
+		long long indStride,
+		long long snpStride,
 		const bool betaNotUnitVariance,
 		const double betaA,
 		const double betaB,
 		const bool apply_in_place,
 		const bool use_stats,
-		double *stats
-		)
+		double *stats,
+		int num_threads
+		) nogil
 
 
-def standardizefloatFAAA(np.ndarray[np.float32_t, ndim=2] out, bool betaNotUnitVariance, float betaA, float betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float32_t, ndim=2] stats):
+def standardizefloatFAAA(np.ndarray[np.float32_t, ndim=2] out, bool betaNotUnitVariance, float betaA, float betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float32_t, ndim=2] stats, num_threads=1):
 	
-	num_ind = out.shape[0]
-	num_snps = out.shape[1]
+	cdef size_t num_ind = out.shape[0]
+	cdef size_t num_snps = out.shape[1]
+	cdef float* c_out = <float*> out.data
+	cdef float* c_stats = <float*> stats.data
+	cdef long long ind_stride = out.strides[0] // out.itemsize #out may be a strided view, so give C++ its strides in elements
+	cdef long long snp_stride = out.strides[1] // out.itemsize
+	cdef int c_num_threads = num_threads
 
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
-	_ImputeAndZeroMeanSNPsfloatFAAA(<float*> out.data, num_ind, num_snps, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, <float *> stats.data)
+	with nogil: #SNPs are standardized by (possibly) many C++ threads, so release the GIL while it runs.
+		_ImputeAndZeroMeanSNPsfloatFAAA(c_out, num_ind, num_snps, ind_stride, snp_stride, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, c_stats, c_num_threads)
 
 	return out, stats
 
 
 
-def standardizedoubleFAAA(np.ndarray[np.float64_t, ndim=2] out, bool betaNotUnitVariance, double betaA, double betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float64_t, ndim=2] stats):
+def standardizedoubleFAAA(np.ndarray[np.float64_t, ndim=2] out, bool betaNotUnitVariance, double betaA, double betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float64_t, ndim=2] stats, num_threads=1):
 	
-	num_ind = out.shape[0]
-	num_snps = out.shape[1]
+	cdef size_t num_ind = out.shape[0]
+	cdef size_t num_snps = out.shape[1]
+	cdef double* c_out = <double*> out.data
+	cdef double* c_stats = <double*> stats.data
+	cdef long long ind_stride = out.strides[0] // out.itemsize #out may be a strided view, so give C++ its strides in elements
+	cdef long long snp_stride = out.strides[1] // out.itemsize
+	cdef int c_num_threads = num_threads
 
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
-	_ImputeAndZeroMeanSNPsdoubleFAAA(<double*> out.data, num_ind, num_snps, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, <double *> stats.data)
+	with nogil: #SNPs are standardized by (possibly) many C++ threads, so release the GIL while it runs.
+		_ImputeAndZeroMeanSNPsdoubleFAAA(c_out, num_ind, num_snps, ind_stride, snp_stride, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, c_stats, c_num_threads)
 
 	return out, stats
 
 
 
-def standardizefloatCAAA(np.ndarray[np.float32_t, ndim=2] out, bool betaNotUnitVariance, float betaA, float betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float32_t, ndim=2] stats):
+def standardizefloatCAAA(np.ndarray[np.float32_t, ndim=2] out, bool betaNotUnitVariance, float betaA, float betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float32_t, ndim=2] stats, num_threads=1):
 	
-	num_ind = out.shape[0]
-	num_snps = out.shape[1]
+	cdef size_t num_ind = out.shape[0]
+	cdef size_t num_snps = out.shape[1]
+	cdef float* c_out = <float*> out.data
+	cdef float* c_stats = <float*> stats.data
+	cdef long long ind_stride = out.strides[0] // out.itemsize #out may be a strided view, so give C++ its strides in elements
+	cdef long long snp_stride = out.strides[1] // out.itemsize
+	cdef int c_num_threads = num_threads
 
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
-	_ImputeAndZeroMeanSNPsfloatCAAA(<float*> out.data, num_ind, num_snps, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, <float *> stats.data)
+	with nogil: #SNPs are standardized by (possibly) many C++ threads, so release the GIL while it runs.
+		_ImputeAndZeroMeanSNPsfloatCAAA(c_out, num_ind, num_snps, ind_stride, snp_stride, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, c_stats, c_num_threads)
 
 	return out, stats
 
-def standardizedoubleCAAA(np.ndarray[np.float64_t, ndim=2] out, bool betaNotUnitVariance, double betaA, double betaB,  bool apply_in_place, bool use_stats, np.ndarray[np.float64_t, ndim=2] stats):
+def standardizedoubleCAAA(np.ndarray[np.float64_t, ndim=2] out, bool betaNotUnitVariance, double betaA, double betaB, bool apply_in_place, bool use_stats, np.ndarray[np.float64_t, ndim=2] stats, num_threads=1):
 	
-	num_ind = out.shape[0]
-	num_snps = out.shape[1]
+	cdef size_t num_ind = out.shape[0]
+	cdef size_t num_snps = out.shape[1]
+	cdef double* c_out = <double*> out.data
+	cdef double* c_stats = <double*> stats.data
+	cdef long long ind_stride = out.strides[0] // out.itemsize #out may be a strided view, so give C++ its strides in elements
+	cdef long long snp_stride = out.strides[1] // out.itemsize
+	cdef int c_num_threads = num_threads
 
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
-	_ImputeAndZeroMeanSNPsdoubleCAAA(<double*> out.data, num_ind, num_snps, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, <double *> stats.data)
+	with nogil: #SNPs are standardized by (possibly) many C++ threads, so release the GIL while it runs.
+		_ImputeAndZeroMeanSNPsdoubleCAAA(c_out, num_ind, num_snps, ind_stride, snp_stride, betaNotUnitVariance, betaA, betaB, apply_in_place, use_stats, c_stats, c_num_threads)
 
 	return out, stats
 
 #New 
-def readPlinkBedFile2floatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
-	
+def readPlinkBedFile2floatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out, num_threads=1, np.ndarray[np.float32_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
 	cdef vector[size_t] iid_idx_list = iidIdxList
 	cdef vector[int] sid_idx_list = snpIdxList
+	cdef string c_bed_fn = bed_fn
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef float* c_out = <float*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef float c_betaA = betaA
+	cdef float c_betaB = betaB
+	cdef float* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <float*> stats.data
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFilefloatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <float*> out.data)
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedFilefloatFAAA(c_bed_fn, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
 	return out
 
-def readPlinkBedFile2floatCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
-	
+def readPlinkBedFile2floatCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out, num_threads=1, np.ndarray[np.float32_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
 	cdef vector[size_t] iid_idx_list = iidIdxList
 	cdef vector[int] sid_idx_list = snpIdxList
+	cdef string c_bed_fn = bed_fn
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef float* c_out = <float*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef float c_betaA = betaA
+	cdef float c_betaB = betaB
+	cdef float* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <float*> stats.data
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFilefloatCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <float*> out.data)
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedFilefloatCAAA(c_bed_fn, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
 	return out
 
 
-def readPlinkBedFile2doubleFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
-	
+def readPlinkBedFile2doubleFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out, num_threads=1, np.ndarray[np.float64_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
 	cdef vector[size_t] iid_idx_list = iidIdxList
 	cdef vector[int] sid_idx_list = snpIdxList
+	cdef string c_bed_fn = bed_fn
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef double* c_out = <double*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef double c_betaA = betaA
+	cdef double c_betaB = betaB
+	cdef double* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <double*> stats.data
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFiledoubleFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <double*> out.data)
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedFiledoubleFAAA(c_bed_fn, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
 	return out
 
-def readPlinkBedFile2doubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
-	
+def readPlinkBedFile2doubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out, num_threads=1, np.ndarray[np.float64_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
 	cdef vector[size_t] iid_idx_list = iidIdxList
 	cdef vector[int] sid_idx_list = snpIdxList
+	cdef string c_bed_fn = bed_fn
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef double* c_out = <double*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef double c_betaA = betaA
+	cdef double c_betaB = betaB
+	cdef double* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <double*> stats.data
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFiledoubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <double*> out.data)
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedFiledoubleCAAA(c_bed_fn, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
 	return out
 
+#bed_bytes is not given a buffer type so that read-only memory maps are accepted. It must be a contiguous ndarray of uint8.
+def readPlinkBedBytes2floatFAAA(np.ndarray bed_bytes, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out, num_threads=1, np.ndarray[np.float32_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef unsigned char* c_bed_bytes = <unsigned char*> bed_bytes.data
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef float* c_out = <float*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef float c_betaA = betaA
+	cdef float c_betaB = betaB
+	cdef float* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <float*> stats.data
+	#http://wiki.cython.org/tutorials/NumpyPointerToC
+
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedBytesfloatFAAA(c_bed_bytes, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
+	return out
+
+def readPlinkBedBytes2floatCAAA(np.ndarray bed_bytes, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out, num_threads=1, np.ndarray[np.float32_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef unsigned char* c_bed_bytes = <unsigned char*> bed_bytes.data
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef float* c_out = <float*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef float c_betaA = betaA
+	cdef float c_betaB = betaB
+	cdef float* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <float*> stats.data
+	#http://wiki.cython.org/tutorials/NumpyPointerToC
+
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedBytesfloatCAAA(c_bed_bytes, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
+	return out
+
+def readPlinkBedBytes2doubleFAAA(np.ndarray bed_bytes, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out, num_threads=1, np.ndarray[np.float64_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef unsigned char* c_bed_bytes = <unsigned char*> bed_bytes.data
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef double* c_out = <double*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef double c_betaA = betaA
+	cdef double c_betaB = betaB
+	cdef double* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <double*> stats.data
+	#http://wiki.cython.org/tutorials/NumpyPointerToC
+
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedBytesdoubleFAAA(c_bed_bytes, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
+	return out
+
+def readPlinkBedBytes2doubleCAAA(np.ndarray bed_bytes, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out, num_threads=1, np.ndarray[np.float64_t, ndim=2] stats=None, betaNotUnitVariance=False, betaA=1, betaB=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef unsigned char* c_bed_bytes = <unsigned char*> bed_bytes.data
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef double* c_out = <double*> out.data
+	cdef int c_num_threads = num_threads
+	cdef bool c_betaNotUnitVariance = betaNotUnitVariance
+	cdef double c_betaA = betaA
+	cdef double c_betaB = betaB
+	cdef double* c_stats = NULL
+	if stats is not None: #Also standardize each SNP as it is decoded, putting its mean and stddev in stats
+		c_stats = <double*> stats.data
+	#http://wiki.cython.org/tutorials/NumpyPointerToC
+
+	with nogil: #The decoding is done by (possibly) many C++ threads, so release the GIL while it runs.
+		_readPlinkBedBytesdoubleCAAA(c_bed_bytes, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads, c_betaNotUnitVariance, c_betaA, c_betaB, c_stats)
+	return out
+
+
+#int8 values use -127 for missing
+def readPlinkBedFile2int8FAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out, num_threads=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef string c_bed_fn = bed_fn
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef signed char* c_out = <signed char*> out.data
+	cdef int c_num_threads = num_threads
+
+	with nogil:
+		_readPlinkBedFileint8FAAA(c_bed_fn, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads)
+	return out
+
+#int8 values use -127 for missing
+def readPlinkBedFile2int8CAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out, num_threads=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef string c_bed_fn = bed_fn
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef signed char* c_out = <signed char*> out.data
+	cdef int c_num_threads = num_threads
+
+	with nogil:
+		_readPlinkBedFileint8CAAA(c_bed_fn, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads)
+	return out
+
+#int8 values use -127 for missing
+def readPlinkBedBytes2int8FAAA(np.ndarray bed_bytes, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out, num_threads=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef unsigned char* c_bed_bytes = <unsigned char*> bed_bytes.data
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef signed char* c_out = <signed char*> out.data
+	cdef int c_num_threads = num_threads
+
+	with nogil:
+		_readPlinkBedBytesint8FAAA(c_bed_bytes, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads)
+	return out
+
+#int8 values use -127 for missing
+def readPlinkBedBytes2int8CAAA(np.ndarray bed_bytes, input_num_ind, input_num_snps, count_A1, iidIdxList, snpIdxList, np.ndarray[np.int8_t, ndim=2] out, num_threads=1):
+
+	cdef vector[size_t] iid_idx_list = iidIdxList
+	cdef vector[int] sid_idx_list = snpIdxList
+	cdef unsigned char* c_bed_bytes = <unsigned char*> bed_bytes.data
+	cdef int c_input_num_ind = input_num_ind
+	cdef int c_input_num_snps = input_num_snps
+	cdef bool c_count_A1 = count_A1
+	cdef signed char* c_out = <signed char*> out.data
+	cdef int c_num_threads = num_threads
+
+	with nogil:
+		_readPlinkBedBytesint8CAAA(c_bed_bytes, c_input_num_ind, c_input_num_snps, c_count_A1, iid_idx_list, sid_idx_list, c_out, c_num_threads)
+	return out
 
 def writePlinkBedFile2floatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, np.ndarray[np.float32_t, ndim=2] inx):
 	_writePlinkBedFilefloatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, <float*> inx.data)
@@ -161,6 +415,12 @@ def writePlinkBedFile2doubleFAAA(bed_fn, input_num_ind, input_num_snps, count_A1
 def writePlinkBedFile2doubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, np.ndarray[np.float64_t, ndim=2] inx):
 	_writePlinkBedFiledoubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, <double*> inx.data)
 
+def writePlinkBedFile2int8FAAA(bed_fn, input_num_ind, input_num_snps, count_A1, np.ndarray[np.int8_t, ndim=2] inx):
+	_writePlinkBedFileint8FAAA(bed_fn, input_num_ind, input_num_snps, count_A1, <signed char*> inx.data)
+
+def writePlinkBedFile2int8CAAA(bed_fn, input_num_ind, input_num_snps, count_A1, np.ndarray[np.int8_t, ndim=2] inx):
+	_writePlinkBedFileint8CAAA(bed_fn, input_num_ind, input_num_snps, count_A1, <signed char*> inx.data)
+
 #Old
 def readPlinkBedFilefloatFAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
 	count_A1 = False
@@ -168,7 +428,7 @@ def readPlinkBedFilefloatFAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList,
 	cdef vector[int] sid_idx_list = snpIdxList
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFilefloatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <float*> out.data)
+	_readPlinkBedFilefloatFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <float*> out.data, 1, False, 1, 1, NULL)
 	return out
 
 def readPlinkBedFilefloatCAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float32_t, ndim=2] out):
@@ -177,7 +437,7 @@ def readPlinkBedFilefloatCAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList,
 	cdef vector[int] sid_idx_list = snpIdxList
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFilefloatCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <float*> out.data)
+	_readPlinkBedFilefloatCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <float*> out.data, 1, False, 1, 1, NULL)
 	return out
 
 
@@ -187,7 +447,7 @@ def readPlinkBedFiledoubleFAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList
 	cdef vector[int] sid_idx_list = snpIdxList
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFiledoubleFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <double*> out.data)
+	_readPlinkBedFiledoubleFAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <double*> out.data, 1, False, 1, 1, NULL)
 	return out
 
 def readPlinkBedFiledoubleCAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList, snpIdxList, np.ndarray[np.float64_t, ndim=2] out):
@@ -196,7 +456,7 @@ def readPlinkBedFiledoubleCAAA(bed_fn, input_num_ind, input_num_snps, iidIdxList
 	cdef vector[int] sid_idx_list = snpIdxList
 	#http://wiki.cython.org/tutorials/NumpyPointerToC
 
-	_readPlinkBedFiledoubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <double*> out.data)
+	_readPlinkBedFiledoubleCAAA(bed_fn, input_num_ind, input_num_snps, count_A1, iid_idx_list, sid_idx_list, <double*> out.data, 1, False, 1, 1, NULL)
 	return out
 
 
@@ -29,17 +29,17 @@ class Beta(Standardizer):
     def __repr__(self): 
         return "{0}(a={1},b={2})".format(self.__class__.__name__,self.a,self.b)
 
-    def standardize(self, snpdata, block_size=None, return_trained=False, force_python_only=False): #!!!later why is the 2nd argument called 'snpdata' here, but 'snps' in unit.py?
+    def standardize(self, snpdata, block_size=None, return_trained=False, force_python_only=False, num_threads=None): #!!!later why is the 2nd argument called 'snpdata' here, but 'snps' in unit.py?
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
 
         if hasattr(snpdata,"val"):
-            val = snpdata.val
+            val = self._float_val(snpdata)
         else:
             warnings.warn("standardizing an nparray instead of a SnpData is deprecated", DeprecationWarning)
             val = snpdata
 
-        stats = self._standardize_unit_and_beta(val, is_beta=True, a=self.a, b=self.b, apply_in_place=True, use_stats=False,stats=None,force_python_only=force_python_only)
+        stats = self._standardize_unit_and_beta(val, is_beta=True, a=self.a, b=self.b, apply_in_place=True, use_stats=False,stats=None,force_python_only=force_python_only,num_threads=num_threads)
         if return_trained:
             from pysnptools.standardizer import BetaTrained
             assert hasattr(snpdata,"val"), "return_trained=True must be used with SnpData"
@@ -47,6 +47,11 @@ class Beta(Standardizer):
         else:
             return snpdata
 
+    def train(self, snpreader, block_size=None, iid_block_size=None, num_threads=None, force_python_only=False, index_file=None):
+        from pysnptools.standardizer import BetaTrained
+        sid, stats = Standardizer._train_stats(snpreader, block_size=block_size, iid_block_size=iid_block_size, num_threads=num_threads, index_file=index_file)
+        return BetaTrained(self.a, self.b, sid, stats)
+
     def _merge_trained(self, trained_list):
         from pysnptools.standardizer import BetaTrained
 
@@ -36,6 +36,7 @@ class BetaTrained(Standardizer):
         self.b=b
         self.sid=sid
         self.stats=stats
+        self.sid_to_index = None
 
     def __repr__(self): 
         return "{0}(a={1},b={2},stats={3},sid={4})".format(self.__class__.__name__,self.a,self.b,self.stats,self.sid)
@@ -44,18 +45,24 @@ class BetaTrained(Standardizer):
     def is_constant(self):
         return True        
 
-    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
 
         if hasattr(snps,"val"):
-            val = snps.val
-            assert np.array_equal(self.sid,snps.sid), "sid in training and use must be the same and in the same order"
+            val = self._float_val(snps)
+            if len(self.sid) == len(snps.sid) and np.array_equal(self.sid,snps.sid):
+                stats = self.stats
+            else:
+                if self.sid_to_index is None:
+                    self.sid_to_index = {sid:index for index,sid in enumerate(self.sid)}
+                stats = np.array([self.stats[self.sid_to_index[sid]] for sid in snps.sid])
         else:
             warnings.warn("standardizing an nparray instead of a SnpData is deprecated", DeprecationWarning)
             val = snps
+            stats = self.stats
 
-        self._standardize_unit_and_beta(val, is_beta=True, a=self.a, b=self.b, apply_in_place=True,use_stats=True,stats=self.stats,force_python_only=force_python_only)
+        self._standardize_unit_and_beta(val, is_beta=True, a=self.a, b=self.b, apply_in_place=True,use_stats=True,stats=stats,force_python_only=force_python_only,num_threads=num_threads)
         if return_trained:
             return snps, self
         else:
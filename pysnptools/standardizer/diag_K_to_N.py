@@ -59,7 +59,7 @@ class DiagKtoN(Standardizer):
         else:
             return kerneldata
 
-    def standardize(self, input, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, input, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         from pysnptools.kernelreader import KernelData
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
@@ -71,7 +71,7 @@ class DiagKtoN(Standardizer):
     def _standardize_snps(self, snps, return_trained=False, force_python_only=False):
 
         if hasattr(snps,"val"):
-            val = snps.val
+            val = self._float_val(snps)
         else:
             warnings.warn("standardizing an nparray instead of a SnpData is deprecated", DeprecationWarning)
             val = snps
@@ -111,7 +111,7 @@ class DiagKtoNTrained(Standardizer):
         super(DiagKtoNTrained, self).__init__()
         self.factor = factor
 
-    def standardize(self, input, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, input, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
 
@@ -128,7 +128,7 @@ class DiagKtoNTrained(Standardizer):
     def _standardize_snps(self, snps, return_trained=False, force_python_only=False):
     
         if hasattr(snps,"val"):
-            val = snps.val
+            val = self._float_val(snps)
         else:
             warnings.warn("standardizing an nparray instead of a SnpData is deprecated", DeprecationWarning)
             val = snps
@@ -51,7 +51,7 @@ class Standardizer(object):
     def __init__(self):
         super(Standardizer, self).__init__()
 
-    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         '''
         Applies standardization, in place, to :class:`.SnpData` (or a NumPy array). For convenience also returns the :class:`.SnpData` (or a NumPy array).
 
@@ -68,6 +68,10 @@ class Standardizer(object):
             be done without outside library code.
         :type force_python_only: bool
 
+        :param num_threads: optional -- The number of threads with which to standardize (SNPs are independent, so are split across threads).
+            Defaults to all available processors. Can also be set with the 'PST_NUM_THREADS' environment variable.
+        :type num_threads: None or int
+
         :rtype: :class:`.SnpData` (or a NumPy array), (optional) constant :class:`.Standardizer`
 
         '''
@@ -75,45 +79,165 @@ class Standardizer(object):
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
         raise NotImplementedError("subclass {0} needs to implement method '.standardize'".format(self.__class__.__name__))
 
+    def train(self, snpreader, block_size=None, iid_block_size=None, num_threads=None, force_python_only=False, index_file=None):
+        """
+        Reads SNP values, a block at a time, and returns a constant standardizer trained on them. The SNP values are not themselves standardized.
+
+        For :class:`.Unit` and :class:`.Beta`, the mean and standard deviation of each sid are found in a single pass with mergeable accumulators, so no more than one block
+        (of at most **iid_block_size** iids by **block_size** sids) is in memory at a time, and sample-sharded data (a list of SnpReaders, one per group of iids) can be trained on as a whole.
+        The result is the same as that of :meth:`standardize` with **return_trained** True, up to floating point rounding.
+        Other standardizers are trained on each block of sids in turn (reading all iids at once).
+
+        :param snpreader: The SNP data to train on, or a list of SnpReaders with the same sids but different iids.
+        :type snpreader: :class:`.SnpReader` or a list of :class:`.SnpReader`
+
+        :param block_size: optional -- Default of None (meaning to load all). The number of sids to read at a time.
+        :type block_size: int or None
+
+        :param iid_block_size: optional -- Default of None (meaning to load all). The number of iids to read at a time.
+        :type iid_block_size: int or None
+
+        :param num_threads: optional -- The number of threads with which to read SNP values. See :meth:`.SnpReader.read`.
+        :type num_threads: int or None
+
+        :param force_python_only: optional -- If False (default), may use outside library code. If True, requests that the read
+            be done without outside library code.
+        :type force_python_only: bool
+
+        :param index_file: optional -- For :class:`.Unit` and :class:`.Beta` training on a :class:`.Bed` (or a subset of its sids), the name of a genotype-count sidecar file
+            (see :meth:`.Bed.genotype_counts`). If the file is current, the counts are loaded from it, so no genotypes are read. Otherwise, they are counted once and saved to it.
+            Other standardizers ignore it.
+        :type index_file: string or None
+
+        :rtype: constant :class:`.Standardizer`
+
+        >>> from pysnptools.standardizer import Unit
+        >>> from pysnptools.snpreader import Bed
+        >>> snp_on_disk = Bed('../examples/toydata',count_A1=False)
+        >>> trained = Unit().train([snp_on_disk[:250,:],snp_on_disk[250:,:]],block_size=1000,iid_block_size=100) #two shards of iids, read 100 iids and 1000 sids at a time
+        >>> print(trained.stats.shape)
+        (10000, 2)
+        """
+        if self.is_constant:
+            return self
+        snpreader_list = snpreader if isinstance(snpreader,(list,tuple)) else [snpreader]
+        assert len(snpreader_list) == 1, "Standardizer '{0}' can only be trained on a single SnpReader".format(self)
+        snpreader = snpreader_list[0]
+
+        block_size = block_size or max(1,snpreader.sid_count)
+        trained_list = []
+        for start in range(0, snpreader.sid_count, block_size):
+            snpdata = snpreader[:,start:start+block_size].read(order='A',num_threads=num_threads)
+            _, trained = self.standardize(snpdata,return_trained=True,force_python_only=force_python_only,num_threads=num_threads)
+            trained_list.append(trained)
+        if len(trained_list) == 1:
+            return trained_list[0]
+        return self._merge_trained(trained_list)
+
+    @staticmethod
+    def _train_stats(snpreader, block_size, iid_block_size, num_threads, index_file=None):
+        '''
+        Returns the sid and (mean,stddev) stats of a SnpReader (or list of SnpReaders with the same sids), reading
+        at most an iid_block_size x block_size block at a time. Bed files (and PackedSnpData) are not decoded. Instead, their
+        genotypes are counted from their 2-bit codes (or, with an index_file, loaded). See :meth:`_stats_blocks`.
+        '''
+        snpreader_list = snpreader if isinstance(snpreader,(list,tuple)) else [snpreader]
+        sid = snpreader_list[0].sid
+        stats = np.empty([len(sid),2],dtype=np.float64)
+        for start, accumulator in Standardizer._stats_blocks(snpreader_list, block_size, iid_block_size, num_threads, index_file):
+            stats[start:start+len(accumulator.count),:] = accumulator.stats()
+        return sid, stats
+
+    @staticmethod
+    def _stats_blocks(snpreader_list, block_size, iid_block_size, num_threads, index_file=None):
+        '''
+        For each block of (at most block_size) sids, yields the start of the block and a _SnpStats of the block's values over the iids of all the SnpReaders.
+        With an index_file (see :meth:`.Bed.genotype_counts`), the single SnpReader must be a Bed (or a subset of its sids). Its genotype counts are then loaded
+        from the index_file if it is current, or else counted once and saved to it.
+        '''
+        from pysnptools.snpreader.bed import Bed
+        sid = snpreader_list[0].sid
+        for other in snpreader_list[1:]:
+            assert np.array_equal(sid,other.sid), "Expect all the SnpReaders to have the same sids"
+
+        value_counts = None
+        if index_file is not None:
+            assert len(snpreader_list) == 1, "An index_file can be used with only one SnpReader"
+            packed_source = Bed._packed_source(snpreader_list[0])
+            assert packed_source is not None and isinstance(packed_source[0],Bed) and packed_source[1] is None, "An index_file holds the counts of all the iids of a Bed, so expect a Bed or a subset of its sids"
+            source, _, sid_index_or_none = packed_source
+            value_counts = source.genotype_counts(index_file=index_file)
+            if sid_index_or_none is not None:
+                value_counts = value_counts[sid_index_or_none]
+
+        sid_count = len(sid)
+        block_size = block_size or max(1,sid_count)
+        for start in range(0, sid_count, block_size):
+            accumulator = _SnpStats(min(block_size,sid_count-start))
+            if value_counts is not None:
+                accumulator.add_counts(value_counts[start:start+block_size])
+                yield start, accumulator
+                continue
+            for reader in snpreader_list:
+                packed_source = Bed._packed_source(reader)
+                if packed_source is not None:
+                    source, iid_index_or_none, sid_index_or_none = packed_source
+                    sid_block = (np.arange(source.sid_count) if sid_index_or_none is None else np.asarray(sid_index_or_none))[start:start+block_size]
+                    code_counts = Bed._code_counts(source._packed_rows(sid_block), iid_index_or_none, source.iid_count)
+                    accumulator.add_counts(Bed._value_counts(code_counts, source.count_A1))
+                    continue
+                step = iid_block_size or max(1,reader.iid_count)
+                for iid_start in range(0, reader.iid_count, step):
+                    val = reader[iid_start:iid_start+step,start:start+block_size].read(order='A',num_threads=num_threads).val
+                    accumulator.add(val)
+            yield start, accumulator
+
+    @staticmethod
+    def _float_val(snpdata, dtype=np.float64):
+        '''
+        Returns snpdata.val, ready to be standardized in place. If the values are int8 (where missing is -127), they are first converted
+        to a new float ndarray (with missing as NaN) that replaces snpdata.val.
+        '''
+        if snpdata.val.dtype == np.int8:
+            from pysnptools.util import _astype
+            snpdata.val = _astype(snpdata.val, dtype, order="F" if snpdata.val.flags["F_CONTIGUOUS"] else "C")
+        return snpdata.val
+
     @staticmethod
     #changes snps in place
-    def _standardize_unit_and_beta(snps, is_beta, a, b, apply_in_place, use_stats, stats, force_python_only=False):
+    def _standardize_unit_and_beta(snps, is_beta, a, b, apply_in_place, use_stats, stats, force_python_only=False, num_threads=None):
         from pysnptools.snpreader import wrap_plink_parser
+        from pysnptools.util import _get_num_threads
+
+        #The C++ code works on any (aligned) strided view, so views and subsets are standardized in place without copies.
+        #It walks memory along whichever axis is closer together: down the individuals ('F') or across the SNPs ('C').
+        if snps.flags["F_CONTIGUOUS"]:
+            order = "F"
+        elif snps.flags["C_CONTIGUOUS"]:
+            order = "C"
+        else:
+            order = "F" if abs(snps.strides[0]) <= abs(snps.strides[1]) else "C"
 
-        assert snps.flags["C_CONTIGUOUS"] or snps.flags["F_CONTIGUOUS"], "Expect snps to be order 'C' or order 'F'"
-
-        #Make sure stats is the same type as snps. Because we might be creating a new array, we return it
+        #Make sure stats is the same type as snps and laid out as the C++ code expects. Because we might be creating a new array, we return it
         if stats is None:
-            stats = np.empty([snps.shape[1],2],dtype=snps.dtype,order="F" if snps.flags["F_CONTIGUOUS"] else "C")
-        elif not (
-             stats.dtype == snps.dtype   #stats must have the same dtype as snps
-             and (stats.flags["OWNDATA"]) # stats must own its data
-             and (snps.flags["C_CONTIGUOUS"] and stats.flags["C_CONTIGUOUS"]) or (snps.flags["F_CONTIGUOUS"] and stats.flags["F_CONTIGUOUS"]) #stats must have the same order as snps
-             ):
-            stats = np.array(stats,dtype=snps.dtype,order="F" if snps.flags["F_CONTIGUOUS"] else "C")
+            stats = np.empty([snps.shape[1],2],dtype=snps.dtype,order=order)
+        elif not (stats.dtype == snps.dtype and stats.flags["OWNDATA"] and stats.flags[order+"_CONTIGUOUS"]):
+            stats = np.array(stats,dtype=snps.dtype,order=order)
         assert stats.shape == (snps.shape[1],2), "stats must have size [sid_count,2]"
 
         if not force_python_only:
-            if snps.dtype == np.float64:
-                if snps.flags['F_CONTIGUOUS'] and (snps.flags["OWNDATA"] or snps.base.nbytes == snps.nbytes): #!!create a method called is_single_segment
-                    wrap_plink_parser.standardizedoubleFAAA(snps,is_beta,a,b,apply_in_place,use_stats,stats)
-                    return stats
-                elif snps.flags['C_CONTIGUOUS']  and (snps.flags["OWNDATA"] or snps.base.nbytes == snps.nbytes):
-                    wrap_plink_parser.standardizedoubleCAAA(snps,is_beta,a,b,apply_in_place,use_stats,stats)
-                    return stats
-                else:
-                    logging.info("Array is not contiguous, so will standardize with python only instead of C++")
-            elif snps.dtype == np.float32:
-                if snps.flags['F_CONTIGUOUS'] and (snps.flags["OWNDATA"] or snps.base.nbytes == snps.nbytes):
-                    wrap_plink_parser.standardizefloatFAAA(snps,is_beta,a,b,apply_in_place,use_stats,stats)
-                    return stats
-                elif snps.flags['C_CONTIGUOUS'] and (snps.flags["OWNDATA"] or snps.base.nbytes == snps.nbytes):
-                    wrap_plink_parser.standardizefloatCAAA(snps,is_beta,a,b,apply_in_place,use_stats,stats)
-                    return stats
-                else:
-                    logging.info("Array is not contiguous, so will standardize with python only instead of C++")
-            else:
+            num_threads = _get_num_threads(num_threads)
+            if snps.dtype not in [np.float64, np.float32]:
                 logging.info("Array type is not float64 or float32, so will standardize with python only instead of C++")
+            elif not snps.flags["ALIGNED"] or any(stride % snps.itemsize != 0 for stride in snps.strides):
+                logging.info("Array is not aligned, so will standardize with python only instead of C++")
+            else:
+                standardize = {(np.float64,"F"): wrap_plink_parser.standardizedoubleFAAA,
+                               (np.float64,"C"): wrap_plink_parser.standardizedoubleCAAA,
+                               (np.float32,"F"): wrap_plink_parser.standardizefloatFAAA,
+                               (np.float32,"C"): wrap_plink_parser.standardizefloatCAAA}[snps.dtype.type,order]
+                standardize(snps,is_beta,a,b,apply_in_place,use_stats,stats,num_threads)
+                return stats
 
         import pysnptools.standardizer as stdizer
         if is_beta:
@@ -203,6 +327,53 @@ class Standardizer(object):
     def _merge_trained(self, trained_list):
         raise Exception("Not defined")
 
+class _SnpStats(object):
+    '''
+    Per-sid count, mean, and sum of squared differences from the mean of the non-missing values seen so far. Blocks of iids are
+    added with Chan et al.'s pairwise update of Welford's method, so the result doesn't depend on how the iids were split up.
+    '''
+    def __init__(self, sid_count):
+        self.count = np.zeros(sid_count,dtype=np.int64)
+        self.mean = np.zeros(sid_count,dtype=np.float64)
+        self.m2 = np.zeros(sid_count,dtype=np.float64)
+
+    def add(self, val):
+        is_missing = np.isnan(val)
+        count = (~is_missing).sum(axis=0)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            mean = np.where(count > 0, np.nansum(val,axis=0,dtype=np.float64) / count, 0.0)
+        m2 = np.nansum((val-mean)**2,axis=0,dtype=np.float64)
+        self.merge(count, mean, m2)
+
+    def add_counts(self, value_counts):
+        '''
+        Adds a block of iids given as (sid x 3) counts of values 0, 1, and 2.
+        '''
+        values = np.arange(3,dtype=np.float64)
+        count = value_counts[:,:3].sum(axis=1)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            mean = np.where(count > 0, value_counts[:,:3].dot(values) / count, 0.0)
+        m2 = (value_counts[:,:3] * (values - mean[:,np.newaxis])**2).sum(axis=1)
+        self.merge(count, mean, m2)
+
+    def merge(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(divide='ignore',invalid='ignore'):
+            fraction = np.where(total > 0, count / total.astype(np.float64), 0.0)
+        self.mean += delta * fraction
+        self.m2 += m2 + delta**2 * self.count * fraction
+        self.count = total
+
+    def stats(self):
+        with np.errstate(divide='ignore',invalid='ignore'):
+            mean = np.where(self.count > 0, self.mean, np.nan)
+            std = np.sqrt(self.m2 / self.count)
+        if 0.0 in std:
+            logging.warn("A least one snps has only one value, that is, its standard deviation is zero")
+            std[std == 0.0] = np.inf
+        return np.c_[mean,std]
+
 class _CannotBeTrained(Standardizer):
 
     def __init__(self, name):
@@ -212,7 +383,7 @@ class _CannotBeTrained(Standardizer):
     def __repr__(self): 
         return "{0}({1})".format(self.__class__.__name__,self.name)
 
-    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
         raise Exception("Standardizer '{0}' cannot be trained",self)
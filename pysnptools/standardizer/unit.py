@@ -24,17 +24,17 @@ class Unit(Standardizer):
     def __repr__(self):
         return "{0}()".format(self.__class__.__name__)
 
-    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
 
         if hasattr(snps,"val"):
-            val = snps.val
+            val = self._float_val(snps)
         else:
             warnings.warn("standardizing an nparray instead of a SnpData is deprecated", DeprecationWarning)
             val = snps
 
-        stats = self._standardize_unit_and_beta(val, is_beta=False, a=np.nan, b=np.nan, apply_in_place=True,use_stats=False,stats=None,force_python_only=force_python_only,)
+        stats = self._standardize_unit_and_beta(val, is_beta=False, a=np.nan, b=np.nan, apply_in_place=True,use_stats=False,stats=None,force_python_only=force_python_only,num_threads=num_threads)
 
         if return_trained:
             assert hasattr(snps,"val"), "return_trained=True requires that snps be a SnpData"
@@ -42,6 +42,10 @@ class Unit(Standardizer):
         else:
             return snps
 
+    def train(self, snpreader, block_size=None, iid_block_size=None, num_threads=None, force_python_only=False, index_file=None):
+        sid, stats = Standardizer._train_stats(snpreader, block_size=block_size, iid_block_size=iid_block_size, num_threads=num_threads, index_file=index_file)
+        return UnitTrained(sid, stats)
+
     def _merge_trained(self, trained_list):
         sid = np.concatenate([trained.sid for trained in trained_list])
         stats = np.concatenate([trained.stats for trained in trained_list])
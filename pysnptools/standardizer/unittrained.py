@@ -43,12 +43,12 @@ class UnitTrained(Standardizer):
     def is_constant(self):
         return True        
 
-    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False):
+    def standardize(self, snps, block_size=None, return_trained=False, force_python_only=False, num_threads=None):
         if block_size is not None:
             warnings.warn("block_size is deprecated (and not needed, since standardization is in-place", DeprecationWarning)
 
         if hasattr(snps,"val"):
-            val = snps.val
+            val = self._float_val(snps)
             if len(self.sid) == len(snps.sid) and np.array_equal(self.sid,snps.sid):
                 stats = self.stats
             else:
@@ -60,7 +60,7 @@ class UnitTrained(Standardizer):
             val = snps
             stats = self.stats
 
-        self._standardize_unit_and_beta(val, is_beta=False, a=np.nan, b=np.nan, apply_in_place=True,use_stats=True,stats=stats,force_python_only=force_python_only)
+        self._standardize_unit_and_beta(val, is_beta=False, a=np.nan, b=np.nan, apply_in_place=True,use_stats=True,stats=stats,force_python_only=force_python_only,num_threads=num_threads)
 
         if return_trained:
             return snps, self
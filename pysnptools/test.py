@@ -11,6 +11,7 @@ from pysnptools.snpreader import Pheno
 from pysnptools.snpreader import Ped
 from pysnptools.standardizer import Unit
 from pysnptools.standardizer import Beta
+from pysnptools.standardizer import Identity
 from pysnptools.util import create_directory_if_necessary
 from pysnptools.kernelreader.test import TestLoader as KrTestLoader
 from pysnptools.kernelreader.test import TestDocStrings as KrDocStrings
@@ -115,6 +116,425 @@ class TestLoader(unittest.TestCase):
         snpdata.val = 2 - snpdata.val
         self.c_reader(snpdata)
 
+    def test_mmap_reader_bed(self):
+        snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine='mmap')
+        self.c_reader(snpreader)
+
+    def test_mmap_reader_bed_subsets(self):
+        for count_A1 in [False, True]:
+            file_reader = Bed(self.currentFolder + "/examples/toydata",count_A1=count_A1)
+            mmap_reader = Bed(self.currentFolder + "/examples/toydata",count_A1=count_A1,engine='mmap')
+            for iid_index in [slice(None), [5,2,199,0], slice(None,None,3)]:
+                for sid_index in [[1000,3,3,7,4000], slice(10,-10,70)]:
+                    for order, dtype, force_python_only in [('F',np.float64,False),('C',np.float32,False),('F',np.float32,True)]:
+                        file_val = file_reader[iid_index,sid_index].read(order=order,dtype=dtype,force_python_only=force_python_only).val
+                        mmap_val = mmap_reader[iid_index,sid_index].read(order=order,dtype=dtype,force_python_only=force_python_only).val
+                        assert mmap_val.dtype == dtype
+                        np.testing.assert_array_equal(file_val, mmap_val)
+
+    def test_p_reader_bed_blocks(self):
+        old_block_values = Bed._python_block_values
+        try:
+            Bed._python_block_values = 1000 # force many small blocks
+            for count_A1 in [False, True]:
+                snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=count_A1)[[3,0,499,2,2],[9,8,1000,0,0,4999]+list(range(20,40))]
+                for order in ['F','C']:
+                    for dtype in [np.float64, np.float32]:
+                        expected = snpreader.read(order=order,dtype=dtype)
+                        snpdata = snpreader.read(order=order,dtype=dtype,force_python_only=True)
+                        assert snpdata.val.dtype == dtype and snpdata.val.flags[order+'_CONTIGUOUS']
+                        np.testing.assert_array_equal(expected.val, snpdata.val)
+        finally:
+            Bed._python_block_values = old_block_values
+
+    def test_int8_bed(self):
+        from pysnptools.snpreader import SnpData
+        expected = self.snps.copy()
+        expected[expected!=expected] = -127
+        for engine in ['file','mmap']:
+            snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine=engine)
+            for order in ['F','C']:
+                for force_python_only in [False,True]:
+                    snpdata = snpreader[::3,[5,4,3,1000]].read(order=order,dtype=np.int8,force_python_only=force_python_only)
+                    assert snpdata.val.dtype == np.int8 and snpdata.val.flags[order+'_CONTIGUOUS']
+                    np.testing.assert_array_equal(expected[::3,[5,4,3,1000]], snpdata.val)
+
+        snpdata = Bed(self.currentFolder + "/examples/toydata",count_A1=False).read(dtype=np.int8)
+        #SnpData subsets to and from int8 (-127 and NaN are converted to each other)
+        for force_python_only in [False,True]:
+            for order in ['F','C']:
+                np.testing.assert_array_equal(self.snps[::2,::5], snpdata[::2,::5].read(order=order,force_python_only=force_python_only).val)
+                np.testing.assert_array_equal(expected[::2,::5], SnpData(iid=snpdata.iid,sid=snpdata.sid,val=self.snps)[::2,::5].read(order=order,dtype=np.int8,force_python_only=force_python_only).val)
+
+        #Standardizers turn int8 into float in place
+        for standardizer in [Unit(),Beta(1,25)]:
+            snpdata8 = snpdata[:,:100].read(dtype=np.int8).standardize(standardizer)
+            snpdata64 = snpdata[:,:100].read(dtype=np.float64).standardize(standardizer)
+            assert snpdata8.val.dtype == np.float64
+            np.testing.assert_array_almost_equal(snpdata64.val, snpdata8.val)
+
+        #write int8 to a Bed file
+        output = "tempdir/snpreader/toydata.int8.bed"
+        create_directory_if_necessary(output)
+        for force_python_only in [False,True]:
+            Bed.write(output,snpdata[:,:20].read(dtype=np.int8,order='C'),count_A1=False,force_python_only=force_python_only)
+            np.testing.assert_array_equal(self.snps[:,:20], Bed(output,count_A1=False).read().val)
+
+    def test_bed_consecutive_runs(self):
+        assert Bed._consecutive_runs([5,6,7,2,3,9]) == [(0,3),(3,5),(5,6)]
+        assert Bed._consecutive_runs([]) == []
+        assert Bed._consecutive_runs([4,4]) == [(0,1),(1,2)]
+
+        snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False)
+        sid_index = list(range(0,2000)) + [7,8,9,3,4999] + list(range(3000,3500)) + list(range(3499,3400,-1))
+        expected = self.snps[:,sid_index]
+        for force_python_only in [False, True]:
+            for num_threads in [1, 3]:
+                snpdata = snpreader[:,sid_index].read(force_python_only=force_python_only,num_threads=num_threads)
+                np.testing.assert_array_equal(expected, snpdata.val)
+
+    def test_num_threads_bed(self):
+        for engine in ['file','mmap']:
+            snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine=engine)
+            expected = snpreader[::2,[10,5,5,9000,0]+list(range(100,1100))].read(num_threads=1)
+            for num_threads in [2, 7, None]:
+                for order in ['F','C']:
+                    snpdata = snpreader[::2,[10,5,5,9000,0]+list(range(100,1100))].read(order=order,num_threads=num_threads)
+                    np.testing.assert_array_equal(expected.val, snpdata.val)
+            self.c_reader(snpreader.read(num_threads=3))
+
+    def test_packed_snpdata(self):
+        from pysnptools.snpreader import PackedSnpData
+        for engine in ['file','mmap']:
+            packedsnpdata = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine=engine).read_packed()
+            assert packedsnpdata.packed.dtype == np.uint8 and packedsnpdata.packed.shape == (self.snps.shape[1], int(np.ceil(self.snps.shape[0]/4.0)))
+            self.c_reader(packedsnpdata.read())
+
+        #slicing never decodes, but must decode to the same values (including for iid subsets, which are repacked)
+        for iid_index, sid_index in [(slice(None),[5,4,3,1000]), (slice(None,None,3),slice(None,None,7)), ([7,2,2,0,498],[10,9000]), (4,slice(None))]:
+            subset = packedsnpdata[iid_index,sid_index]
+            assert isinstance(subset, PackedSnpData)
+            expected = self.snps[np.arange(self.snps.shape[0])[iid_index],:][...,sid_index].reshape(subset.iid_count,subset.sid_count)
+            for force_python_only in [False,True]:
+                for dtype in [np.float64,np.float32]:
+                    np.testing.assert_array_equal(expected, subset.read(dtype=dtype,force_python_only=force_python_only).val)
+            np.testing.assert_array_equal(expected[::2,::-1], subset[::2,::-1].read().val)
+
+        #write it back out with a byte copy (swapping the homozygous codes when count_A1 changes)
+        output = "tempdir/snpreader/toydata.packed.bed"
+        create_directory_if_necessary(output)
+        for count_A1 in [False,True]:
+            Bed.write(output,packedsnpdata[::2,:100],count_A1=count_A1)
+            np.testing.assert_array_equal(self.snps[::2,:100], Bed(output,count_A1=count_A1).read().val)
+            np.testing.assert_array_equal(Bed(output,count_A1=count_A1).read_packed().packed, packedsnpdata[::2,:100]._packed_for(count_A1))
+
+    def test_kernel_of_bed_subsets(self):
+        from pysnptools.snpreader import SnpData
+        snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False)
+        assert Bed._packed_source(snpreader[::2,:][:,5:]) is not None and Bed._packed_source(snpreader.read()) is None
+        for standardizer in [Unit(),Beta(1,25)]:
+            for subset in [snpreader[:,::20], snpreader[[3,0,0,499],1000:1500], snpreader.read_packed()[::3,:500]]:
+                for block_size in [None,333]:
+                    for dtype in [np.float64,np.float32]:
+                        kernel, trained = subset._read_kernel(standardizer,block_size=block_size,dtype=dtype,return_trained=True)
+                        snpdata, expected_trained = subset.read(dtype=dtype).standardize(standardizer,return_trained=True)
+                        expected = SnpData(iid=snpdata.iid,sid=snpdata.sid,val=snpdata.val)._read_kernel(Identity(),dtype=dtype)
+                        assert kernel.dtype == dtype
+                        np.testing.assert_allclose(expected, kernel, rtol=0, atol=(1e-5 if dtype==np.float32 else 1e-10)*np.abs(expected).max())
+                        np.testing.assert_allclose(expected_trained.stats, trained.stats, rtol=1e-5)
+                        np.testing.assert_array_equal(expected_trained.sid, trained.sid)
+            self.assertEqual(snpreader.read_kernel(standardizer,order='F').val.flags['F_CONTIGUOUS'], True)
+
+    def test_write_subset_bed(self):
+        output = "tempdir/snpreader/toydata.subset.bed"
+        create_directory_if_necessary(output)
+        for engine in ['file','mmap']:
+            snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine=engine)
+            for subset in [snpreader[:,:500], snpreader[:,[5,4,3,1000]], snpreader[::-3,::70][:,5:], snpreader[[7,2,2,0,498],10:20], snpreader.read_packed()[:-1,[10,9000]]]:
+                for count_A1 in [None,False,True]:
+                    Bed.write_subset(output,subset,count_A1=count_A1)
+                    result = Bed(output,count_A1=False if count_A1 is None else count_A1)
+                    np.testing.assert_array_equal(subset.iid, result.iid)
+                    np.testing.assert_array_equal(subset.sid, result.sid)
+                    np.testing.assert_array_equal(subset.read().val, result.read().val)
+        with self.assertRaises(Exception):
+            Bed.write_subset(output,snpreader.read())
+
+    def test_write_bed_from_reader(self):
+        from pysnptools.snpreader import SnpNpz
+        snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False)[::2,:300]
+        npz_file = "tempdir/snpreader/toydata.write.snp.npz"
+        create_directory_if_necessary(npz_file)
+        SnpNpz.write(npz_file,snpreader.read())
+        output = "tempdir/snpreader/toydata.fromreader.bed"
+        for reader in [snpreader, SnpNpz(npz_file)]:
+            for block_size in [None,1,7,1000]:
+                for count_A1 in [False,True]:
+                    Bed.write(output,reader,count_A1=count_A1,block_size=block_size)
+                    np.testing.assert_array_equal(snpreader.read().val, Bed(output,count_A1=count_A1).read().val)
+                    np.testing.assert_array_equal(snpreader.sid, Bed(output,count_A1=count_A1).sid)
+        snpdata = snpreader.read(dtype=np.int8)
+        Bed.write(output,snpdata,count_A1=False,block_size=100)
+        np.testing.assert_array_equal(snpreader.read().val, Bed(output,count_A1=False).read().val)
+        snpdata.val[3,200] = 5
+        with self.assertRaises(Exception):
+            Bed.write(output,snpdata,count_A1=False,block_size=100)
+
+    def test_bed_metadata_cache(self):
+        import shutil, time
+        output = "tempdir/snpreader/toydata.cache"
+        create_directory_if_necessary(output)
+        for suffix in ["bed","bim","fam"]:
+            shutil.copyfile(self.currentFolder + "/examples/toydata." + suffix, output + "." + suffix)
+            if os.path.exists(output + "." + suffix + ".npz"):
+                os.remove(output + "." + suffix + ".npz")
+        expected = Bed(self.currentFolder + "/examples/toydata",count_A1=False)
+
+        for i in range(2): #The first time creates the cache files, the second time uses them
+            snpreader = Bed(output,count_A1=False,metadata_cache=True)
+            np.testing.assert_array_equal(expected.iid, snpreader.iid)
+            assert os.path.exists(output + ".fam.npz") and (i > 0 or not os.path.exists(output + ".bim.npz")) #only parse what is needed
+            np.testing.assert_array_equal(expected.sid, snpreader.sid)
+            np.testing.assert_array_equal(expected.pos, snpreader.pos)
+            np.testing.assert_array_equal(expected[:,::100].read().val, snpreader[:,::100].read().val)
+
+        #Changing the .bim file makes the cache out-of-date
+        with open(output + ".bim","a") as bim:
+            bim.write("1\textra_snp\t0\t0\tA\tC\n")
+        snpreader = Bed(output,count_A1=False,metadata_cache=True,skip_format_check=True)
+        assert snpreader.sid_count == expected.sid_count + 1 and snpreader.sid[-1] == "extra_snp"
+        assert Bed(output,count_A1=False,metadata_cache=True).sid_count == expected.sid_count + 1
+        assert not [f for f in os.listdir(os.path.dirname(output)) if f.startswith("toydata.cache.bim.npz.")] #the temporary file was renamed over the old cache
+
+        #Replacing a file overwrites an existing one
+        from pysnptools.snpreader import SnpReader
+        for content in [b"first", b"second"]:
+            with open(output + ".tmp","wb") as fp:
+                fp.write(content)
+            SnpReader._replace_file(output + ".tmp", output + ".replaced")
+            assert not os.path.exists(output + ".tmp")
+            with open(output + ".replaced","rb") as fp:
+                assert fp.read() == content
+
+    def test_bed_lazy_metadata(self):
+        expected = Bed(self.currentFolder + "/examples/toydata",count_A1=False)
+        expected_val = expected[:,::100].read().val
+        expected_pos = expected.pos
+        for engine in ['file','mmap']:
+            snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine=engine)
+            assert snpreader.iid_count == 500 and snpreader.sid_count == 10000
+            assert not hasattr(snpreader,"_row") and not hasattr(snpreader,"_col") and not hasattr(snpreader,"_col_property") #counting parses nothing
+            np.testing.assert_array_equal(expected.sid, snpreader.sid)
+            assert not hasattr(snpreader,"_row") and hasattr(snpreader,"_col_property") #sid and pos were parsed together, in one pass
+            np.testing.assert_array_equal(expected_pos, snpreader.pos)
+            sid_only = Bed(self.currentFolder + "/examples/toydata",count_A1=False,engine=engine)
+            sid_only._read_bim(want_pos=False)
+            assert hasattr(sid_only,"_col") and not hasattr(sid_only,"_col_property") #a caller that needs only one column can say so
+            np.testing.assert_array_equal(expected_pos, sid_only.pos)
+            np.testing.assert_array_equal(expected.sid, sid_only.sid)
+            np.testing.assert_array_equal(expected.iid, snpreader.iid)
+            np.testing.assert_array_equal(expected_val, snpreader[:,::100].read().val)
+
+        output = "tempdir/snpreader/lines.txt"
+        create_directory_if_necessary(output)
+        for text, count in [(b"",0), (b"a",1), (b"a\nb\n",2), (b"\n\na\n\n\nb\n\n",2), (b"a\r\nb\r\n\r\n",2), (b"a\r\n\r\nb",2), (b"a\n  \n",1), (b" \t\n a b\n\t \r\n cd ",2)]:
+            with open(output,"wb") as fp:
+                fp.write(text)
+            for block_size in [1024*1024, 1, 2, 3]: #small blocks split lines across blocks
+                assert Bed._count_lines(output,block_size=block_size) == count
+
+        import shutil
+        output = "tempdir/snpreader/whitespace_line"
+        for suffix in ["bed","bim","fam"]:
+            shutil.copyfile(self.currentFolder + "/examples/toydata." + suffix, output + "." + suffix)
+        with open(output + ".fam","ab") as fp:
+            fp.write(b"   \n")
+        assert Bed(output,count_A1=False).iid_count == 500 and len(Bed(output,count_A1=False).iid) == 500
+
+    def test_read_kernel_workers(self):
+        from pysnptools.snpreader import SnpReader
+        snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False)[:100,:2000]
+        expected = snpreader.read_kernel(Unit()).val
+        for reader in [snpreader, snpreader.read()]: #A Bed decodes and standardizes in one C++ pass, a SnpData standardizes after reading
+            for num_workers in [1,3]:
+                for order in ['F','C']:
+                    kerneldata = reader.read_kernel(Unit(),block_size=150,num_workers=num_workers,order=order)
+                    np.testing.assert_array_almost_equal(expected, kerneldata.val)
+
+        #Errors while producing blocks are raised, rather than hanging
+        def block_sequence():
+            yield np.ones((3,2))
+            raise Exception("block error")
+        for num_workers in [1,3]:
+            with self.assertRaises(Exception):
+                SnpReader._accumulate_kernel(np.zeros((3,3)), block_sequence(), num_workers)
+        K = SnpReader._accumulate_kernel(np.zeros((3,3)), (np.ones((3,2)) for i in range(5)), 2)
+        np.testing.assert_array_equal(np.ones((3,3))*10, K)
+
+    def test_kernel_syrk(self):
+        from pysnptools.snpreader import SnpReader
+        np.random.seed(0)
+        for dtype in [np.float64,np.float32,np.int32]:
+            for K_order in ['F','C']:
+                for block_order in ['F','C']:
+                    block = np.array(np.random.randint(-3,4,size=(1100,40)),dtype=dtype,order=block_order) #more rows than one mirror stripe
+                    K = np.zeros((1100,1100),dtype=dtype,order=K_order)
+                    SnpReader._syrk(K,block)
+                    SnpReader._syrk(K,block[:,::3])
+                    SnpReader._syrk(K,block[:,:0]) #no SNPs
+                    SnpReader._mirror_upper(K)
+                    expected = block.dot(block.T) + block[:,::3].dot(block[:,::3].T)
+                    np.testing.assert_array_almost_equal(expected, K)
+                    assert K.flags[K_order+'_CONTIGUOUS']
+
+        snpdata = Bed(self.currentFolder + "/examples/toydata",count_A1=False)[:,:200].read().standardize()
+        for order in ['F','C','A']:
+            kerneldata = snpdata.read_kernel(Identity(),order=order)
+            np.testing.assert_array_almost_equal(snpdata.val.dot(snpdata.val.T), kerneldata.val)
+
+    def test_syrk_releases_gil(self):
+        import threading
+        from pysnptools.snpreader import SnpReader
+        np.random.seed(0)
+        block = np.random.normal(size=(2000,3000))
+        K = np.zeros((2000,2000))
+        spin_time_list = []
+        stop = threading.Event()
+        def spin(): #a pure Python thread, which can run only while no other thread holds the GIL
+            while not stop.is_set():
+                spin_time_list.append(time.time())
+        spinner = threading.Thread(target=spin)
+        spinner.daemon = True
+        spinner.start()
+        time.sleep(.1)
+        start = time.time()
+        SnpReader._syrk(K,block)
+        stop_time = time.time()
+        stop.set()
+        spinner.join()
+        during = [t for t in spin_time_list if start <= t <= stop_time]
+        longest_gap = np.diff([start] + during + [stop_time]).max()
+        assert longest_gap < .5 * (stop_time-start), "The spinning thread stalled for {0:.2f} of {1:.2f} seconds, so _syrk seems to hold the GIL".format(longest_gap,stop_time-start)
+
+    def test_read_loco_kernels(self):
+        snpreader = Bed(self.currentFolder + "/examples/toydata.5chrom",count_A1=False)[:,::3]
+        chrom_list = []
+        for chrom, kerneldata in snpreader.read_loco_kernels(Unit(),block_size=400):
+            chrom_list.append(chrom)
+            expected = snpreader[:,snpreader.pos[:,0]!=chrom].read_kernel(Unit())
+            np.testing.assert_array_equal(expected.iid, kerneldata.iid)
+            np.testing.assert_array_almost_equal(expected.val, kerneldata.val)
+        assert chrom_list == [1,2,3,4,5]
+
+        #'by' can be any grouping of the sids
+        by = np.arange(snpreader.sid_count) % 2
+        loco_list = [kerneldata for _, kerneldata in snpreader.read_loco_kernels(Unit(),by=by)]
+        np.testing.assert_array_almost_equal(snpreader[:,1::2].read_kernel(Unit()).val, loco_list[0].val)
+        np.testing.assert_array_almost_equal(snpreader[:,0::2].read_kernel(Unit()).val, loco_list[1].val)
+
+        #With temp_dir, the partial kernels wait on disk, and their files are removed once yielded (or when the generator is closed)
+        temp_dir = "tempdir/snpreader/loco_partials"
+        for chrom_count_to_read in [5,2]:
+            loco_kernels = snpreader.read_loco_kernels(Unit(),block_size=400,temp_dir=temp_dir)
+            for index, (chrom, kerneldata) in enumerate(loco_kernels):
+                assert len(os.listdir(temp_dir)) == 5-chrom
+                np.testing.assert_array_almost_equal(snpreader[:,snpreader.pos[:,0]!=chrom].read_kernel(Unit()).val, kerneldata.val)
+                if index+1 == chrom_count_to_read:
+                    break
+            loco_kernels.close()
+            assert len(os.listdir(temp_dir)) == 0
+
+        #NaN chromosomes are not grouped by np.unique, so they are an error
+        by = snpreader.pos[:,0].astype(float)
+        by[:10] = np.nan
+        with self.assertRaises(AssertionError):
+            list(snpreader.read_loco_kernels(Unit(),by=by))
+
+    def test_standardizer_train(self):
+        snpreader = Bed(self.currentFolder + "/../tests/datasets/all_chr.maf0.001.N300",count_A1=False)
+        for standardizer in [Unit(),Beta(1,25)]:
+            _, expected = snpreader.read().standardize(standardizer,return_trained=True)
+            for shards in [snpreader,[snpreader[:100,:],snpreader[100:,:]]]:
+                trained = standardizer.train(shards,block_size=333,iid_block_size=37)
+                assert type(trained) == type(expected) and np.array_equal(expected.sid, trained.sid)
+                np.testing.assert_array_almost_equal(expected.stats, trained.stats)
+
+        #Other standardizers train block by block
+        from pysnptools.standardizer import DiagKtoN
+        trained = Identity().train(snpreader,block_size=100)
+        assert isinstance(trained,Identity)
+        trained = DiagKtoN().train(snpreader)
+        np.testing.assert_array_almost_equal(DiagKtoN().standardize(snpreader.read(),return_trained=True)[1].factor, trained.factor)
+
+    def test_genotype_counts(self):
+        import shutil
+        for count_A1 in [False,True]:
+            for engine in ['file','mmap']:
+                snpreader = Bed(self.currentFolder + "/../tests/datasets/all_chr.maf0.001.N300",count_A1=count_A1,engine=engine)
+                for iid_index in [None, [5,3,299,0,0], slice(None,None,7)]:
+                    val = snpreader.read().val if iid_index is None else snpreader.read().val[iid_index,:]
+                    expected = np.c_[(val==0).sum(axis=0),(val==1).sum(axis=0),(val==2).sum(axis=0),np.isnan(val).sum(axis=0)]
+                    np.testing.assert_array_equal(expected, snpreader.genotype_counts(iid_index=iid_index,block_size=333))
+
+        #Counts are kept in the index file until the .bed file changes
+        output = "tempdir/snpreader/genotype_counts"
+        create_directory_if_necessary(output+".bed")
+        for ext in ["bed","bim","fam"]:
+            shutil.copyfile(self.currentFolder + "/../tests/datasets/all_chr.maf0.001.N300."+ext, output+"."+ext)
+        snpreader = Bed(output,count_A1=False)
+        expected = snpreader.genotype_counts()
+        np.testing.assert_array_equal(expected, snpreader.genotype_counts(index_file=output+".counts"))
+        np.testing.assert_array_equal(expected, snpreader.genotype_counts(index_file=output+".counts"))
+        np.testing.assert_array_equal(expected[:,[2,1,0,3]], Bed(output,count_A1=True).genotype_counts(index_file=output+".counts"))
+        Bed.write(output, snpreader[::2,:].read(), count_A1=False)
+        np.testing.assert_array_equal(Bed(output,count_A1=False).genotype_counts(), Bed(output,count_A1=False).genotype_counts(index_file=output+".counts"))
+
+        #A partly-written (or otherwise unreadable) index file is ignored and rewritten
+        with open(output+".counts","r+b") as fp:
+            fp.truncate(100)
+        np.testing.assert_array_equal(Bed(output,count_A1=False).genotype_counts(), Bed(output,count_A1=False).genotype_counts(index_file=output+".counts"))
+        np.testing.assert_array_equal(Bed(output,count_A1=False).genotype_counts(), Bed(output,count_A1=False).genotype_counts(index_file=output+".counts"))
+        assert not [f for f in os.listdir(os.path.dirname(output)) if f.startswith("genotype_counts.counts.")] #each rewrite renamed its temporary file over the old index
+
+        #Unit training counts genotypes instead of decoding them
+        subset = Bed(output,count_A1=False)[::3,10:500]
+        np.testing.assert_array_almost_equal(Unit().train(subset.read()).stats, Unit().train(subset).stats)
+
+        #With a current index file, training and filtering read no genotypes at all
+        def no_reads(sid_index):
+            raise Exception("Expect no genotypes to be read")
+        for standardizer in [Unit(),Beta(1,25)]:
+            bed = Bed(output,count_A1=False)
+            bed._run_once()
+            bed._packed_rows = no_reads
+            for snpreader in [bed, bed[:,10:500:2]]:
+                np.testing.assert_array_almost_equal(standardizer.train(snpreader.read()).stats, standardizer.train(snpreader,block_size=100,index_file=output+".counts").stats)
+        filtered = bed.filter(maf_min=.2,index_file=output+".counts")
+        np.testing.assert_array_equal(Bed(output,count_A1=False).filter(maf_min=.2).sid, filtered.sid)
+        with self.assertRaises(AssertionError): #the index file holds the counts of all iids
+            Unit().train(bed[::2,:],index_file=output+".counts")
+
+    def test_filter(self):
+        from pysnptools.snpreader import SnpData
+        bed = Bed(self.currentFolder + "/../tests/datasets/all_chr.maf0.001.N300",count_A1=False)
+        for snpreader in [bed, bed[::2,100:], bed.read()[::2,100:]]:
+            val = snpreader.read().val
+            freq = np.nanmean(val,axis=0)/2.0
+            maf = np.minimum(freq,1.0-freq)
+            missing = np.isnan(val).mean(axis=0)
+            for maf_min, missing_max in [(0.05,None),(None,0.0),(0.2,0.01),(None,None)]:
+                keep = np.ones(val.shape[1],dtype=bool)
+                if maf_min is not None:
+                    keep &= maf >= maf_min
+                if missing_max is not None:
+                    keep &= missing <= missing_max
+                filtered = snpreader.filter(maf_min=maf_min,missing_max=missing_max,block_size=333)
+                assert filtered.iid_count == snpreader.iid_count and not filtered._ran_once # the SNPs are not filtered until their sids or values are needed
+                np.testing.assert_array_equal(snpreader.sid[keep], filtered.sid)
+                np.testing.assert_array_equal(val[:,keep], filtered.read().val)
+                np.testing.assert_array_equal(val[3:9,keep][:,::5], filtered[3:9,::5].read().val)
+                np.testing.assert_array_almost_equal(snpreader[:,keep].read_kernel(Unit()).val, filtered.read_kernel(Unit()).val)
+
     def test_scalar_index(self):
         snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False)
         arr=np.int64(1)
@@ -280,6 +700,53 @@ class TestLoader(unittest.TestCase):
         snpreader = Bed(self.currentFolder + "/examples/toydata",count_A1=False)
         self.standardize(snpreader)
 
+    def test_standardize_threads(self):
+        from pysnptools.snpreader import SnpData
+        snpdata = Bed(self.currentFolder + "/examples/toydata",count_A1=False)[:,:1000].read()
+        snpdata.val[3:7,5:9] = np.nan
+        snpdata.val[:,11] = 1 #no variation
+        for dtype in [np.float64,np.float32]:
+            for standardizer in [Unit(),Beta(1,25)]:
+                expected, trained = SnpData(iid=snpdata.iid,sid=snpdata.sid,val=np.array(snpdata.val,dtype=dtype)).standardize(standardizer,return_trained=True,force_python_only=True)
+                for order in ['F','C']:
+                    for num_threads in [1,4]:
+                        for standardizer2 in [standardizer,trained]:
+                            val = np.array(snpdata.val,dtype=dtype,order=order)
+                            standardizer2.standardize(SnpData(iid=snpdata.iid,sid=snpdata.sid,val=val),num_threads=num_threads)
+                            np.testing.assert_allclose(expected.val, val, rtol=1e-4 if dtype==np.float32 else 1e-10, atol=1e-5 if dtype==np.float32 else 1e-10)
+
+    def test_standardize_views(self):
+        from pysnptools.snpreader import SnpData
+        snpdata = Bed(self.currentFolder + "/examples/toydata",count_A1=False)[:,:1000].read()
+        snpdata.val[3:7,5:9] = np.nan
+        snpdata.val[:,12] = 1 #no variation
+        for dtype in [np.float64,np.float32]:
+            for order in ['F','C']:
+                for standardizer in [Unit(),Beta(1,25)]:
+                    for iid_index, sid_index in [(slice(None,None,2),slice(None)),(slice(None),slice(3,None,4)),(slice(400,10,-3),slice(None,None,-2))]:
+                        val = np.array(snpdata.val,dtype=dtype,order=order)
+                        view = SnpData(iid=snpdata.iid[iid_index],sid=snpdata.sid[sid_index],val=val[iid_index,sid_index]) #val is a strided view, not a copy
+                        expected = SnpData(iid=view.iid,sid=view.sid,val=np.array(view.val)).standardize(standardizer,force_python_only=True)
+                        view.standardize(standardizer) #standardizes the values of 'val' in place
+                        np.testing.assert_allclose(expected.val, val[iid_index,sid_index], rtol=1e-4 if dtype==np.float32 else 1e-10, atol=1e-5 if dtype==np.float32 else 1e-10)
+                    data = SnpData(iid=snpdata.iid,sid=snpdata.sid,val=np.array(snpdata.val,dtype=dtype,order=order))
+                    expected = data.read().standardize(standardizer,force_python_only=True)
+                    data.read(order="A",dtype=dtype,view_ok=True).standardize(standardizer) #standardizes the values of 'data' in place
+                    np.testing.assert_allclose(expected.val, data.val, rtol=1e-4 if dtype==np.float32 else 1e-10, atol=1e-5 if dtype==np.float32 else 1e-10)
+
+    def test_read_standardized(self):
+        from pysnptools.snpreader import SnpReader
+        for count_A1 in [False,True]:
+            bed = Bed(self.currentFolder + "/examples/toydata",count_A1=count_A1)
+            for snpreader in [bed, Bed(self.currentFolder + "/examples/toydata",count_A1=count_A1,engine='mmap')[::2,-10::-3], bed.read_packed()[[5,3,1,0],:], bed[:,[4,1000,3,3]]]:
+                for dtype in [np.float64,np.float32]:
+                    for standardizer in [Unit(),Beta(1,25)]:
+                        expected, expected_trained = snpreader.read(dtype=dtype).standardize(standardizer,return_trained=True,force_python_only=True)
+                        snpdata, trained = SnpReader._as_snpdata(snpreader,standardizer,force_python_only=False,dtype=dtype)
+                        assert snpdata.val.dtype == dtype and type(trained) == type(expected_trained) and np.array_equal(snpdata.sid,snpreader.sid)
+                        np.testing.assert_allclose(expected.val, snpdata.val, rtol=1e-4 if dtype==np.float32 else 1e-10, atol=1e-5 if dtype==np.float32 else 1e-10)
+                        np.testing.assert_allclose(expected_trained.stats, trained.stats, rtol=1e-4 if dtype==np.float32 else 1e-10)
+
     def test_standardize_hdf5(self):
         snpreader = SnpHdf5(self.currentFolder + "/examples/toydata.iidmajor.snp.hdf5")
         self.standardize(snpreader)
@@ -682,6 +1149,14 @@ class TestDocStrings(unittest.TestCase):
         os.chdir(old_dir)
         assert result.failed == 0, "failed doc test: " + __file__
 
+    def test_packedsnpdata(self):
+        import pysnptools.snpreader.packedsnpdata
+        old_dir = os.getcwd()
+        os.chdir(os.path.dirname(os.path.realpath(__file__))+"/snpreader")
+        result = doctest.testmod(pysnptools.snpreader.packedsnpdata)
+        os.chdir(old_dir)
+        assert result.failed == 0, "failed doc test: " + __file__
+
     def test_snpnpz(self):
         import pysnptools.snpreader.snpdata
         old_dir = os.getcwd()
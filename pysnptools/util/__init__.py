@@ -129,10 +129,10 @@ def _reindex_snpkernel(snpkernel, iididx, is_test=False):
     if not is_test:
         new_reader = snpkernel.snpreader[iididx,:]
         reference = new_reader
-        result = SnpKernel(new_reader,snpkernel.standardizer,block_size=snpkernel.block_size)
+        result = SnpKernel(new_reader,snpkernel.standardizer,block_size=snpkernel.block_size,num_workers=snpkernel.num_workers)
     else:
         new_reader = snpkernel.test[iididx,:]
-        result = SnpKernel(snpkernel.snpreader,snpkernel.standardizer,block_size=snpkernel.block_size)
+        result = SnpKernel(snpkernel.snpreader,snpkernel.standardizer,block_size=snpkernel.block_size,num_workers=snpkernel.num_workers)
     return result
 
 def _reindex_identitykernel(identitykernel, iididx, is_test=False):
@@ -195,6 +195,21 @@ def intersect_ids(idslist):
     return indarr
 
 
+_int8_missing = -127 # int8 has no NaN, so int8 SNP values use this value for missing
+
+_sub_matrix_type_name = {np.dtype(np.float64):'Double', np.dtype(np.float32):'Single', np.dtype(np.int8):'Int8'}
+
+def _astype(val, dtype, order):
+    '''
+    Like ndarray.astype(dtype,order,copy=True) except that int8's missing value (-127) and NaN are converted to each other.
+    '''
+    result = val.astype(dtype, order, copy=True)
+    if val.dtype == np.int8 and result.dtype != np.int8:
+        result[val == _int8_missing] = np.nan
+    elif val.dtype != np.int8 and result.dtype == np.int8:
+        result[val != val] = _int8_missing
+    return result
+
 def sub_matrix(val, row_index_list, col_index_list, order='A', dtype=sp.float64):
     """
     Efficiently creates a sub-matrix from a 2-D ndarray.
@@ -210,12 +225,13 @@ def sub_matrix(val, row_index_list, col_index_list, order='A', dtype=sp.float64)
         If order is 'F', then the array will be in F-contiguous order (second index varies the fastest).
         If order is 'A', then sub-matrix may be in any order F or C.
     :type order: string or None
-    :param dtype: {scipy.float64 (default), scipy.float32}, optional -- The data-type for sub-matrix created.
+    :param dtype: {scipy.float64 (default), scipy.float32, numpy.int8}, optional -- The data-type for sub-matrix created.
+        When converting between int8 and a float type, -127 (int8's missing value) and NaN are converted to each other.
     :type dtype: data-type
 
     :rtype: ndarray
 
-    Note: Behind the scenes, for performance, this function selects and then calls one of 16 C++ helper functions.
+    Note: Behind the scenes, for performance, this function selects and then calls one of 36 C++ helper functions.
     """
     from pysnptools.snpreader import wrap_matrix_subset
 
@@ -226,6 +242,8 @@ def sub_matrix(val, row_index_list, col_index_list, order='A', dtype=sp.float64)
             effective_order = 'C'
     else:
         effective_order = order
+    if effective_order not in ['F','C']:
+        raise Exception("order '{0}' not known, only 'F' and 'C'".format(effective_order));
 
     sub_val = sp.empty((len(row_index_list), len(col_index_list)),dtype=dtype,order=effective_order)
 
@@ -234,73 +252,19 @@ def sub_matrix(val, row_index_list, col_index_list, order='A', dtype=sp.float64)
     iid_count, sid_count = val.shape
 
     if val.flags['F_CONTIGUOUS']:
-        if val.dtype ==  sp.float64:
-            if dtype == sp.float64:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetDoubleFToDoubleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetDoubleFToDoubleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("order '{0}' not known, only 'F' and 'C'".format(effective_order));
-            elif dtype == sp.float32:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetDoubleFToSingleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetDoubleFToSingleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("dtype '{0}' not known, only float64 and float32".format(dtype))
-        elif val.dtype ==  sp.float32:
-            if dtype == sp.float64:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetSingleFToDoubleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetSingleFToDoubleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("order '{0}' not known, only 'F' and 'C'".format(effective_order));
-            elif dtype == sp.float32:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetSingleFToSingleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetSingleFToSingleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("dtype '{0}' not known, only float64 and float32".format(dtype))
-        else:
-            raise Exception("input dtype '{0}' not known, only float64 and float32".format(val.dtype))
+        input_order = 'F'
     elif val.flags['C_CONTIGUOUS']:
-        if val.dtype ==  sp.float64:
-            if dtype == sp.float64:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetDoubleCToDoubleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetDoubleCToDoubleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("order '{0}' not known, only 'F' and 'C'".format(effective_order));
-            elif dtype == sp.float32:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetDoubleCToSingleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetDoubleCToSingleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("dtype '{0}' not known, only float64 and float32".format(dtype))
-        elif val.dtype ==  sp.float32:
-            if dtype == sp.float64:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetSingleCToDoubleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetSingleCToDoubleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("order '{0}' not known, only 'F' and 'C'".format(effective_order));
-            elif dtype == sp.float32:
-                if effective_order=="F":
-                    wrap_matrix_subset.matrixSubsetSingleCToSingleFAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                elif effective_order=="C":
-                    wrap_matrix_subset.matrixSubsetSingleCToSingleCAAA(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
-                else:
-                    raise Exception("dtype '{0}' not known, only float64 and float32".format(dtype))
-        else:
-            raise Exception("input dtype '{0}' not known, only float64 and float32".format(val.dtype))
+        input_order = 'C'
     else:
         raise Exception("input order must be 'F' or 'C'");
+    if val.dtype not in _sub_matrix_type_name:
+        raise Exception("input dtype '{0}' not known, only float64, float32, and int8".format(val.dtype))
+    if sub_val.dtype not in _sub_matrix_type_name:
+        raise Exception("dtype '{0}' not known, only float64, float32, and int8".format(dtype))
+
+    #For example, matrixSubsetDoubleFToSingleCAAA
+    function_name = "matrixSubset{0}{1}To{2}{3}AAA".format(_sub_matrix_type_name[val.dtype],input_order,_sub_matrix_type_name[sub_val.dtype],effective_order)
+    getattr(wrap_matrix_subset,function_name)(val, iid_count, sid_count, row_index_list, col_index_list, sub_val)
 
 
     logging.debug("Back from cython matrixSubset")
@@ -328,6 +292,19 @@ def create_directory_if_necessary(name, isfile=True):
             if not os.path.isdir(directory_name):
                 raise Exception("not valid path: '{0}'. (Working directory is '{1}'".format(directory_name,os.getcwd()))
 
+def _get_num_threads(num_threads=None):
+    '''
+    Returns the number of threads to use. If num_threads is None, uses the 'PST_NUM_THREADS' environment variable (if set) and
+    otherwise the number of processors.
+    '''
+    if num_threads is not None:
+        return max(int(num_threads),1)
+    import os
+    if 'PST_NUM_THREADS' in os.environ:
+        return max(int(os.environ['PST_NUM_THREADS']),1)
+    import multiprocessing
+    return multiprocessing.cpu_count()
+
 def weighted_mean(ys, weights):
     '''
     :param ys: The ndarray of values
@@ -52,6 +52,18 @@ elif "win" in platform.system().lower():
 else:
     macros = [("_UNIX", "1")]
 
+# The Bed reader decodes SNPs on many threads with OpenMP. Apple's default compiler doesn't support OpenMP, so there the
+# code is built single-threaded (the '#pragma omp' lines are ignored).
+if platform.system() == "Darwin":
+    openmp_compile_args = []
+    openmp_link_args = []
+elif "win" in platform.system().lower():
+    openmp_compile_args = ["/openmp"]
+    openmp_link_args = []
+else:
+    openmp_compile_args = ["-fopenmp"]
+    openmp_link_args = ["-fopenmp"]
+
 #see http://stackoverflow.com/questions/4505747/how-should-i-structure-a-python-package-that-contains-cython-code
 if use_cython:
     ext_modules = [
@@ -63,6 +75,8 @@ if use_cython:
                 "pysnptools/snpreader/CPlinkBedFile.cpp"
             ],
             include_dirs=[numpy.get_include()],
+            extra_compile_args=openmp_compile_args,
+            extra_link_args=openmp_link_args,
             define_macros=macros),
         Extension(
             name="pysnptools.snpreader.wrap_matrix_subset",
@@ -85,6 +99,8 @@ else:
                 "pysnptools/snpreader/CPlinkBedFile.cpp"
             ],
             include_dirs=[numpy.get_include()],
+            extra_compile_args=openmp_compile_args,
+            extra_link_args=openmp_link_args,
             define_macros=macros),
         Extension(
             name="pysnptools.snpreader.wrap_matrix_subset",
@@ -127,7 +143,7 @@ def setup_package():
 
     needs_pytest = {'pytest', 'test', 'ptr'}.intersection(sys.argv)
     pytest_runner = ['pytest-runner>=2.9'] if needs_pytest else []
-    setup_requires = ["cython", "numpy"] + pytest_runner
+    setup_requires = ["cython", "numpy", "scipy>=0.16"] + pytest_runner # scipy for scipy.linalg.cython_blas
     tests_require = ['pytest']
 
     metadata = dict(
@@ -155,7 +171,7 @@ def setup_package():
                 "tests/datasets/all_chr.maf0.001.covariates.N300.txt"
             ]
         },
-        install_requires=['scipy>=0.15.1', 'numpy>=1.9.2', 'pandas>=0.16.2'],
+        install_requires=['scipy>=0.16', 'numpy>=1.9.2', 'pandas>=0.16.2'],
         setup_requires=setup_requires,
         tests_require=tests_require,
         cmdclass=cmdclass,